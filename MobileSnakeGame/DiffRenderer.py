@@ -0,0 +1,92 @@
+'''
+    Renderers that redraw only what changed since the previous frame.
+
+    DiffRenderer keeps the last frame in a bytearray (one byte per cell) and
+    each tick redraws only the cells that can have changed: the new head(s),
+    the cell the tail left and the old and new food. Each changed cell is
+    written with an ANSI cursor move, and the whole frame goes out in one
+    stream.write. The first frame, a board resize, or a snake that moved or
+    shrank in ways it cannot follow (render skipped for many ticks) draws
+    the full board instead.
+
+    HeadlessRenderer draws nothing, for servers, tests and benchmarks.
+    Both take the same render(board, snake, food) call as Renderer.
+'''
+import sys
+
+
+class HeadlessRenderer:
+    def render(self, board, snake, food):
+        pass
+
+
+class DiffRenderer:
+    MAX_MOVES = 8   # head moves between two frames that are still diffed
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.frame = None
+        self.width = self.height = 0
+        self.head = self.tail = self.food = None
+        self.length = 0
+
+    def _occupied(self, snake):
+        # The snake's occupancy grid when it has one, else its body
+        return getattr(snake, "grid", snake.body)
+
+    def render(self, board, snake, food):
+        parts = None
+        if self.frame is not None and (board.width, board.height) == (self.width, self.height):
+            parts = self._diff(snake, food)
+        if parts is None:
+            parts = self._full(board, snake, food)
+        self.head, self.tail, self.length, self.food = snake.body[0], snake.body[-1], len(snake.body), food
+        if parts:
+            self.stream.write("".join(parts))
+            self.stream.flush()
+
+    def _full(self, board, snake, food):
+        self.width, self.height = width, height = board.width, board.height
+        self.frame = frame = bytearray(b"." * (width * height))
+        for x, y in snake.body:
+            if 0 <= x < width and 0 <= y < height:
+                frame[y * width + x] = ord("S")
+        if food is not None and 0 <= food[0] < width and 0 <= food[1] < height:
+            frame[food[1] * width + food[0]] = ord("F")
+        rows = "\n".join(frame[y * width:(y + 1) * width].decode() for y in range(height))
+        border = "=" * width
+        return ["\x1b[H\x1b[2J", border, "\n", rows, "\n", border, "\n"]
+
+    def _diff(self, snake, food):
+        """ANSI writes for the changed cells, or None when a full redraw is needed"""
+        body = snake.body
+        moves = 0
+        while moves < len(body) and body[moves] != self.head:
+            moves += 1
+            if moves > self.MAX_MOVES:
+                return None
+        if moves == len(body) and self.length != 1:
+            return None   # the old head is gone, and with it what the old body was
+        removed = moves - (len(body) - self.length)
+        if removed not in (0, 1):
+            return None
+        dirty = [body[i] for i in range(moves)] + [self.food, food]
+        if removed:
+            dirty.append(self.tail)
+
+        occupied, frame, width = self._occupied(snake), self.frame, self.width
+        parts = []
+        for pos in dirty:
+            if pos is None:
+                continue
+            x, y = pos
+            if not (0 <= x < width and 0 <= y < self.height):
+                continue
+            cell = "F" if pos == food else "S" if pos in occupied else "."
+            index = y * width + x
+            if frame[index] != ord(cell):
+                frame[index] = ord(cell)
+                parts.append(f"\x1b[{y + 2};{x + 1}H{cell}")   # row 1 is the top border
+        if parts:
+            parts.append(f"\x1b[{self.height + 3};1H")           # park the cursor below the board
+        return parts
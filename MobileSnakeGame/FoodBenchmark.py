@@ -0,0 +1,48 @@
+'''
+    Benchmark: food spawns/sec as the snake fills the board, for
+      RandomFoodStrategy over the snake's deque (rejection sampling with an
+                        O(length) membership test; 100x100 only)
+      RandomFoodStrategy over an OccupancyGrid (O(1) test, but still about
+                        1 / (1 - fill) samples per spawn)
+      FreeCellFoodStrategy over a FreeCellGrid (one pick from the free cells)
+
+    python -m MobileSnakeGame.FoodBenchmark
+'''
+from collections import deque
+import time
+
+from MobileSnakeGame.MobileSnakeGame import FreeCellFoodStrategy, RandomFoodStrategy
+from MobileSnakeGame.Occupancy import FreeCellGrid, OccupancyGrid
+
+
+def spawns_per_second(strategy, width, body, budget=0.5):
+    spawns, start = 0, time.perf_counter()
+    while time.perf_counter() - start < budget:
+        for _ in range(10):
+            strategy.generate_food(width, width, body)
+        spawns += 10
+    return spawns / (time.perf_counter() - start)
+
+
+def filled(grid, cells, width):
+    for k in range(cells):
+        grid.add((k % width, k // width))
+    return grid
+
+
+def main():
+    print(f"{'board':>11} {'fill':>8} {'random+deque':>13} {'random+grid':>12} {'free cells':>12}   spawns/s")
+    for width in (100, 1_000):
+        total = width * width
+        for fill in (0.5, 0.9, 0.99, 0.9999):
+            occupied = int(total * fill)
+            cells = [(k % width, k // width) for k in range(occupied)]
+            on_deque = spawns_per_second(RandomFoodStrategy(), width, deque(cells), 0.2) if width <= 100 else None
+            on_grid = spawns_per_second(RandomFoodStrategy(), width, filled(OccupancyGrid(width, width), occupied, width))
+            free = spawns_per_second(FreeCellFoodStrategy(), width, filled(FreeCellGrid(width, width), occupied, width))
+            on_deque = f"{on_deque:>13,.0f}" if on_deque else f"{'-':>13}"
+            print(f"{f'{width}x{width}':>11} {fill:>8.2%} {on_deque} {on_grid:>12,.0f} {free:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
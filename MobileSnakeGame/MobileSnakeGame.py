@@ -2,6 +2,11 @@ from abc import ABC, abstractmethod
 from collections import deque
 import random
 
+try:  # run as a script from this directory
+    from Occupancy import FreeCellGrid, OccupancyGrid
+except ImportError:
+    from MobileSnakeGame.Occupancy import FreeCellGrid, OccupancyGrid
+
 # --- Interfaces ---
 
 # Abstract interface for food generation strategy
@@ -21,13 +26,20 @@ class RandomFoodStrategy(IFoodStrategy):
             if (x, y) not in snake_body:
                 return (x, y)
 
+# Concrete strategy picking a random free cell in O(1); snake_body must be a FreeCellGrid
+class FreeCellFoodStrategy(IFoodStrategy):
+    def generate_food(self, board_width, board_height, snake_body):
+        return snake_body.random_free_cell()
+
 # --- Core Game Entities ---
 
 # Snake class manages the snake's body, movement, and direction
 class Snake:
-    def __init__(self, start_pos=(0, 0)):
+    def __init__(self, start_pos=(0, 0), grid=None):
         self.body = deque([start_pos])  # Deque used for fast head/tail operations
-        self.snake_set = set([start_pos])  # For quick lookup
+        # Segments per cell for O(1) lookups; without a board size every cell is counted in a dict
+        self.grid = grid if grid is not None else OccupancyGrid()
+        self.grid.add(start_pos)
         self.direction = (1, 0)         # Initially moving right
 
     # Moves the snake in the current direction; grows if `grow=True`
@@ -36,10 +48,10 @@ class Snake:
         dx, dy = self.direction
         new_head = (head_x + dx, head_y + dy)
         self.body.appendleft(new_head)  # Add new head
-        self.snake_set.add(new_head)
+        self.grid.add(new_head)
         if not grow:
             tail = self.body.pop()  # Remove tail if not growing
-            self.snake_set.remove(tail)
+            self.grid.remove(tail)
 
     def set_direction(self, direction):
         self.direction = direction
@@ -49,7 +61,7 @@ class Snake:
 
     def hits_itself(self):
         # Head is already added, so if it's seen more than once, it's a self-hit
-        return self.body[0] in self.snake_set and self.body.count(self.body[0]) > 1
+        return self.grid.count(self.body[0]) > 1
 
 # Board class stores board dimensions and provides boundary check
 class Board:
@@ -90,14 +102,15 @@ class InputHandler:
 # --- Game Engine ---
 
 class SnakeGameEngine:
-    def __init__(self, board_width=10, board_height=10):
+    def __init__(self, board_width=10, board_height=10, renderer=None):
         self.board = Board(board_width, board_height)
-        self.snake = Snake()
-        self.food_spawner = FoodSpawner(RandomFoodStrategy())
-        self.food = self.food_spawner.spawn_food(board_width, board_height, self.snake.body)
+        self.snake = Snake(grid=FreeCellGrid(board_width, board_height))
+        self.food_spawner = FoodSpawner(FreeCellFoodStrategy())
+        self.food = self.food_spawner.spawn_food(board_width, board_height, self.snake.grid)
         self.input_handler = InputHandler()
         self.input_handler.register_callback(self.handle_input)
         self.running = True  # Game is active
+        self.renderer = renderer  # e.g. DiffRenderer or HeadlessRenderer; None prints the whole board
 
     # Update the snake’s direction
     def handle_input(self, direction):
@@ -111,7 +124,7 @@ class SnakeGameEngine:
             for x in range(self.board.width):
                 if (x, y) == self.food:
                     row += 'F'  # Food
-                elif (x, y) in self.snake.body:
+                elif (x, y) in self.snake.grid:
                     row += 'S'  # Snake segment
                 else:
                     row += '.'  # Empty cell
@@ -142,12 +155,15 @@ class SnakeGameEngine:
         if head == self.food:
             print("Food eaten")
             self.snake.move(grow=True)  # Move again with growth
-            self.food = self.food_spawner.spawn_food(self.board.width, self.board.height, self.snake.body)
+            self.food = self.food_spawner.spawn_food(self.board.width, self.board.height, self.snake.grid)
             if self.food is None:
                 self.running = False  # Game ends if snake fills the board
                 return
 
-        self.print_board()
+        if self.renderer is not None:
+            self.renderer.render(self.board, self.snake, self.food)
+        else:
+            self.print_board()
 
     # Start the game loop for `steps` number of updates
     def start_game(self, steps=10):
@@ -0,0 +1,271 @@
+import io
+import random
+import re
+import unittest
+from unittest.mock import patch
+from MobileSnakeGame.DiffRenderer import DiffRenderer, HeadlessRenderer
+from MobileSnakeGame.Occupancy import FreeCellGrid, OccupancyGrid
+from MobileSnakeGame.MobileSnakeGame import (
+    Snake, FreeCellFoodStrategy, RandomFoodStrategy, SnakeGameEngine
+)
+from MobileSnakeGame import SnakeGame
+
+try:
+    import numpy as np
+    from MobileSnakeGame.VectorEnv import BODY, EMPTY, FOOD, HEAD, VectorSnakeEnv
+except ImportError:  # the vectorised environment needs NumPy
+    np = None
+
+
+def grown_snake(snake_class, length, width=10):
+    snake = snake_class((2, 2), grid=OccupancyGrid(width, width))
+    for _ in range(length - 1):
+        snake.move(grow=True)
+    return snake
+
+
+class TestOccupancyGrid(unittest.TestCase):
+
+    def test_counts_cells(self):
+        grid = OccupancyGrid(3, 2)
+        grid.add((2, 1))
+        grid.add((2, 1))
+        grid.add((0, 0))
+        self.assertEqual((grid.count((2, 1)), len(grid)), (2, 3))
+        grid.remove((2, 1))
+        self.assertIn((2, 1), grid)
+        grid.remove((2, 1))
+        self.assertNotIn((2, 1), grid)
+        self.assertEqual(grid.cells[0], 1)
+
+    def test_cells_off_the_board(self):
+        grid = OccupancyGrid(3, 3)
+        grid.add((-1, 0))
+        grid.add((3, 1))
+        self.assertIn((-1, 0), grid)
+        self.assertNotIn((0, 0), grid)
+        grid.remove((-1, 0))
+        self.assertEqual(grid.outside, {(3, 1): 1})
+
+    def test_grid_without_size(self):
+        grid = OccupancyGrid()
+        grid.add((5, 5))
+        self.assertEqual(grid.count((5, 5)), 1)
+
+
+class TestSelfCollision(unittest.TestCase):
+
+    def turn_back(self, snake):
+        for direction in [(0, 1), (-1, 0), (0, -1)]:  # down, left, up
+            snake.set_direction(direction)
+            snake.move()
+
+    def test_following_the_tail_is_not_a_hit(self):
+        for snake_class in (Snake, SnakeGame.Snake):
+            snake = grown_snake(snake_class, 4)
+            self.turn_back(snake)
+            self.assertEqual(snake.grid.count(snake.get_head()), 1)
+            self.assertEqual(len(snake.grid), 4)
+
+    def test_hits_itself(self):
+        snake = grown_snake(Snake, 5)
+        self.turn_back(snake)
+        self.assertTrue(snake.hits_itself())
+
+    def test_engines_stop_on_self_collision(self):
+        for engine_class in (SnakeGameEngine, SnakeGame.SnakeGameEngine):
+            engine = engine_class(10, 10)
+            engine.snake = grown_snake(type(engine.snake), 5)
+            engine.food = (9, 9)
+            with patch('builtins.print'):
+                for direction in [(0, 1), (-1, 0), (0, -1)]:
+                    engine.input_handler.on_input(direction)
+                    engine.update()
+            self.assertFalse(engine.running)
+
+    def test_food_avoids_grid_cells(self):
+        grid = OccupancyGrid(2, 2)
+        for cell in [(0, 0), (1, 0), (0, 1)]:
+            grid.add(cell)
+        self.assertEqual(RandomFoodStrategy().generate_food(2, 2, grid), (1, 1))
+
+
+class TestFreeCellGrid(unittest.TestCase):
+
+    def assert_free_cells_match(self, grid):
+        free = set(grid.free[:grid.free_count])
+        self.assertEqual(free, {i for i, count in enumerate(grid.cells) if count == 0})
+        self.assertTrue(all(grid.free[grid.slot[cell]] == cell for cell in range(len(grid.cells))))
+
+    def test_stays_in_sync_with_adds_and_removes(self):
+        rng = random.Random(4)
+        grid = FreeCellGrid(5, 4)
+        placed = []
+        for _ in range(500):
+            if placed and rng.random() < 0.45:
+                grid.remove(placed.pop(rng.randrange(len(placed))))
+            else:
+                pos = (rng.randrange(-1, 6), rng.randrange(4))
+                grid.add(pos)
+                placed.append(pos)
+            self.assert_free_cells_match(grid)
+
+    def test_random_free_cell(self):
+        grid = FreeCellGrid(3, 3)
+        for k in range(8):
+            grid.add((k % 3, k // 3))
+        self.assertEqual(FreeCellFoodStrategy().generate_food(3, 3, grid), (2, 2))
+        grid.add((2, 2))
+        self.assertIsNone(grid.random_free_cell())
+
+    def test_engine_spawns_food_off_the_snake(self):
+        engine = SnakeGameEngine(4, 1)
+        engine.snake = Snake((0, 0), grid=FreeCellGrid(4, 1))
+        for _ in range(2):
+            engine.snake.move(grow=True)
+        self.assertEqual(engine.food_spawner.spawn_food(4, 1, engine.snake.grid), (3, 0))
+        engine.snake.move(grow=True)
+        with patch('builtins.print'):
+            self.assertIsNone(engine.food_spawner.spawn_food(4, 1, engine.snake.grid))
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def apply_ansi(screen, text, cursor=(1, 1)):
+    """Plays the renderer's output onto `screen` ({(row, col): char}); returns the cursor"""
+    row, col = cursor
+    for token in re.findall(r"\x1b\[H\x1b\[2J|\x1b\[\d+;\d+H|\n|.", text):
+        if token.startswith("\x1b[H"):
+            screen.clear()
+            row, col = 1, 1
+        elif token.startswith("\x1b["):
+            row, col = map(int, token[2:-1].split(";"))
+        elif token == "\n":
+            row, col = row + 1, 1
+        else:
+            screen[(row, col)] = token
+            col += 1
+    return row, col
+
+
+class TestDiffRenderer(unittest.TestCase):
+
+    def test_screen_matches_game_state(self):
+        random.seed(6)
+        stream = CountingStream()
+        engine = SnakeGame.SnakeGameEngine(8, 8, renderer=DiffRenderer(stream))
+        screen, cursor, seen = {}, (1, 1), 0
+        route = ([(1, 0)] * 6 + [(0, 1)] * 6 + [(-1, 0)] * 6 + [(0, -1)] * 6) * 4
+        with patch('builtins.print'):
+            for frame, direction in enumerate(route, start=1):
+                engine.input_handler.on_input(direction)
+                engine.update()
+                if not engine.running:
+                    break
+                output = stream.getvalue()
+                cursor, seen = apply_ansi(screen, output[seen:], cursor), len(output)
+                self.assertLessEqual(stream.writes, frame)
+                for y in range(8):
+                    for x in range(8):
+                        expected = "F" if (x, y) == engine.food else "S" if (x, y) in engine.snake.body else "."
+                        self.assertEqual(screen[(y + 2, x + 1)], expected)
+        self.assertGreater(len(engine.snake.body), 1)
+
+    def test_only_changed_cells_are_written(self):
+        stream = io.StringIO()
+        renderer = DiffRenderer(stream)
+        snake = Snake((0, 0), grid=OccupancyGrid(50, 50))
+        board = SnakeGame.Board(50, 50)
+        renderer.render(board, snake, (10, 10))
+        full = len(stream.getvalue())
+        snake.move()
+        renderer.render(board, snake, (10, 10))
+        self.assertEqual(stream.getvalue()[full:], "\x1b[2;2HS\x1b[2;1H.\x1b[53;1H")
+
+    def test_headless_engine_draws_nothing(self):
+        engine = SnakeGameEngine(5, 5, renderer=HeadlessRenderer())
+        engine.food = (4, 4)   # not in the way: eating would print "Food eaten"
+        with patch.object(engine, 'print_board') as print_board, patch('builtins.print') as mock_print:
+            engine.update()
+        print_board.assert_not_called()
+        mock_print.assert_not_called()
+
+
+RIGHT, DOWN, LEFT, UP = range(4)
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestVectorSnakeEnv(unittest.TestCase):
+
+    def put_food(self, env, cells):
+        env.flat[env.rows, env.food] = EMPTY
+        env._put_food(env.rows, np.array(cells))
+
+    def test_reset(self):
+        env = VectorSnakeEnv(3, 6, 4, seed=1)
+        grid = env.reset()
+        self.assertEqual(grid.shape, (3, 4, 6))
+        self.assertTrue((grid[:, 2, 3] == HEAD).all())
+        self.assertTrue(((grid == FOOD).sum(axis=(1, 2)) == 1).all())
+
+    def test_eat_then_hit_itself(self):
+        env = VectorSnakeEnv(1, 10, 10, seed=1)
+        env.reset()
+        for _ in range(4):   # grow to 5 cells along row 5
+            self.put_food(env, [env.bodies[0, env.heads[0]] + 1])
+            _, rewards, dones, _ = env.step([RIGHT])
+            self.assertEqual((rewards[0], dones[0]), (1.0, False))
+        self.put_food(env, [0])
+        self.assertEqual(env.lengths[0], 5)
+        self.assertEqual(env.grid[0, 5, 5:10].tolist(), [BODY] * 4 + [HEAD])
+        for action in (DOWN, LEFT):
+            env.step([action])
+        _, rewards, dones, info = env.step([UP])
+        self.assertEqual((rewards[0], dones[0], info["lengths"][0]), (-1.0, True, 5))
+        self.assertEqual(env.lengths[0], 1)   # reset for the next episode
+
+    def test_following_the_tail_and_walls(self):
+        env = VectorSnakeEnv(2, 3, 3, seed=1)
+        env.reset()
+        self.put_food(env, [5, 8])
+        env.step([RIGHT, DOWN])
+        self.assertEqual(env.lengths.tolist(), [2, 1])
+        self.put_food(env, [8, 0])
+        # A 2-cell snake may step into the cell its tail leaves
+        _, rewards, dones, _ = env.step([LEFT, LEFT])
+        self.assertEqual(dones.tolist(), [False, False])
+        _, rewards, dones, _ = env.step([UP, DOWN])
+        self.assertEqual(dones.tolist(), [False, True])   # the second one left the board
+        self.assertEqual(rewards.tolist(), [0.0, -1.0])
+
+    def test_filling_the_board_wins(self):
+        env = VectorSnakeEnv(1, 2, 1, seed=1)
+        env.reset()
+        self.assertEqual(env.food[0], 0)
+        _, rewards, dones, info = env.step([LEFT])
+        self.assertTrue(dones[0] and info["won"][0])
+
+    def test_random_play_keeps_state_consistent(self):
+        env = VectorSnakeEnv(64, 6, 5, max_steps=40, seed=2)
+        env.reset()
+        for _ in range(300):
+            env.step(env.rng.integers(0, 4, 64))
+            occupied = ((env.grid == BODY) | (env.grid == HEAD)).sum(axis=(1, 2))
+            self.assertEqual(occupied.tolist(), env.lengths.tolist())
+            self.assertTrue(((env.grid == HEAD).sum(axis=(1, 2)) == 1).all())
+            self.assertTrue((env.flat[env.rows, env.food] == FOOD).all())
+            for n in range(64):
+                body = [env.bodies[n, (env.heads[n] - i) % env.cells] for i in range(env.lengths[n])]
+                self.assertTrue((env.flat[n, body] != EMPTY).all())
+        self.assertTrue((env.episode_steps < 40).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+'''
+    Occupancy grid for the snake's body: how many segments sit on each cell.
+
+    On-board cells are counted in a bytearray indexed by y * width + x (one
+    byte per cell, 1 MB for a 1000x1000 board); cells off the board, where
+    a head can briefly be before the boundary check ends the game, go in a
+    small counted dict. The snake adds its new head and removes its old tail
+    here as it moves, so "is this cell occupied" and "did the head land on
+    another segment" are O(1) whatever the snake's length.
+
+    Supports `in` and len(), so it can be handed to food strategies in place
+    of the snake's body.
+
+    FreeCellGrid also keeps the free on-board cells in an array: free[:free_count]
+    holds them in no particular order and slot[cell] is each cell's position
+    in that array. A cell that becomes occupied is swapped with the last free
+    one and the free part shrinks by one; a cell that empties is swapped back
+    in. Picking a uniformly random free cell is then one randrange at any
+    fill level.
+'''
+from array import array
+import random
+
+
+class OccupancyGrid:
+    def __init__(self, width=0, height=0):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height)
+        self.outside = {}
+        self.size = 0   # segments, counting each overlap
+
+    def _index(self, pos):
+        x, y = pos
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return None
+
+    def add(self, pos):
+        index = self._index(pos)
+        if index is None:
+            self.outside[pos] = self.outside.get(pos, 0) + 1
+        else:
+            self.cells[index] += 1
+        self.size += 1
+
+    def remove(self, pos):
+        index = self._index(pos)
+        if index is None:
+            if self.outside[pos] == 1:
+                del self.outside[pos]
+            else:
+                self.outside[pos] -= 1
+        else:
+            self.cells[index] -= 1
+        self.size -= 1
+
+    def count(self, pos):
+        index = self._index(pos)
+        return self.outside.get(pos, 0) if index is None else self.cells[index]
+
+    def __contains__(self, pos):
+        return self.count(pos) > 0
+
+    def __len__(self):
+        return self.size
+
+
+class FreeCellGrid(OccupancyGrid):
+    def __init__(self, width, height):
+        super().__init__(width, height)
+        self.free = array("i", range(width * height))
+        self.slot = array("i", range(width * height))
+        self.free_count = width * height
+
+    def _swap(self, cell, position):
+        # Exchanges `cell` with the cell at `position` of the free array
+        other = self.free[position]
+        old = self.slot[cell]
+        self.free[old], self.free[position] = other, cell
+        self.slot[other], self.slot[cell] = old, position
+
+    def add(self, pos):
+        index = self._index(pos)
+        if index is not None and self.cells[index] == 0:
+            self.free_count -= 1
+            self._swap(index, self.free_count)
+        super().add(pos)
+
+    def remove(self, pos):
+        super().remove(pos)
+        index = self._index(pos)
+        if index is not None and self.cells[index] == 0:
+            self._swap(index, self.free_count)
+            self.free_count += 1
+
+    def random_free_cell(self, rng=random):
+        """A uniformly random unoccupied (x, y), or None if the board is full"""
+        if self.free_count == 0:
+            return None
+        y, x = divmod(self.free[rng.randrange(self.free_count)], self.width)
+        return x, y
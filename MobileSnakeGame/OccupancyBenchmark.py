@@ -0,0 +1,70 @@
+'''
+    Benchmark: ticks/sec of moving a long snake and checking self-collision,
+    with the old per-tick scans of the body (`head in list(body)[1:]` from
+    SnakeGame, `body.count(head)` from MobileSnakeGame) against the
+    OccupancyGrid count now kept by Snake. The snake starts laid out
+    boustrophedon-style along the board and keeps following that path.
+
+    python -m MobileSnakeGame.OccupancyBenchmark
+'''
+from collections import deque
+import time
+
+from MobileSnakeGame.MobileSnakeGame import Snake
+from MobileSnakeGame.Occupancy import OccupancyGrid
+
+
+def path_cell(k, width):
+    y, x = divmod(k, width)
+    return (x if y % 2 == 0 else width - 1 - x, y)
+
+
+def build_body(length, width):
+    return [path_cell(k, width) for k in range(length - 1, -1, -1)]   # head first
+
+
+def scan_ticks_per_second(length, width, ticks, check):
+    body = deque(build_body(length, width))
+    start = time.perf_counter()
+    for k in range(length, length + ticks):
+        head = path_cell(k, width)
+        body.appendleft(head)
+        body.pop()
+        if check(body, head):
+            raise AssertionError("unexpected collision")
+    return ticks / (time.perf_counter() - start)
+
+
+def grid_ticks_per_second(length, width, ticks):
+    snake = Snake(path_cell(0, width), grid=OccupancyGrid(width, width))
+    for k in range(1, length):
+        head_x, head_y = snake.get_head()
+        x, y = path_cell(k, width)
+        snake.set_direction((x - head_x, y - head_y))
+        snake.move(grow=True)
+    start = time.perf_counter()
+    for k in range(length, length + ticks):
+        head_x, head_y = snake.get_head()
+        x, y = path_cell(k, width)
+        snake.set_direction((x - head_x, y - head_y))
+        snake.move()
+        if snake.hits_itself():
+            raise AssertionError("unexpected collision")
+    return ticks / (time.perf_counter() - start)
+
+
+def main():
+    checks = {
+        "list(body)[1:]": lambda body, head: head in list(body)[1:],
+        "body.count": lambda body, head: body.count(head) > 1,
+    }
+    print(f"{'board':>11} {'snake':>8} {'list(body)[1:]':>15} {'body.count':>12} {'grid':>12}   ticks/s")
+    for width, length in ((100, 1_000), (1_000, 10_000), (1_000, 100_000)):
+        ticks = max(200, 2_000_000 // length)
+        rates = [scan_ticks_per_second(length, width, ticks, check) for check in checks.values()]
+        grid = grid_ticks_per_second(length, width, 100_000)
+        print(f"{f'{width}x{width}':>11} {length:>8,} {rates[0]:>15,.0f} {rates[1]:>12,.0f} {grid:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+'''
+    Benchmark: frames/sec of the full-board Renderer, DiffRenderer and
+    HeadlessRenderer while a 1,000-segment snake crawls along the board,
+    eating every 50 ticks and starting over
+    from the first cell when it reaches the last. Output goes to an in-memory stream, so only
+    building the frame is measured; bytes/frame shows what a terminal or
+    socket would receive.
+
+    python -m MobileSnakeGame.RenderBenchmark
+'''
+from contextlib import redirect_stdout
+import io
+import time
+
+from MobileSnakeGame.DiffRenderer import DiffRenderer, HeadlessRenderer
+from MobileSnakeGame.Occupancy import OccupancyGrid
+from MobileSnakeGame.OccupancyBenchmark import path_cell
+from MobileSnakeGame.SnakeGame import Board, Renderer, Snake
+
+
+def frames_per_second(renderer, width, length=1_000, budget=1.0):
+    board = Board(width, width)
+    snake = Snake(path_cell(0, width), grid=OccupancyGrid(width, width))
+    for k in range(1, length):
+        snake.body.appendleft(path_cell(k, width))
+        snake.grid.add(snake.body[0])
+    stream = renderer.stream = io.StringIO()
+    frames, k, start = 0, length, time.perf_counter()
+    while time.perf_counter() - start < budget:
+        head_x, head_y = snake.get_head()
+        x, y = path_cell(k % (width * width), width)   # wraps back to the first cell
+        snake.set_direction((x - head_x, y - head_y))
+        snake.move(grow=k % 50 == 0)
+        food = path_cell((k + 25) % (width * width), width)
+        renderer.render(board, snake, food)
+        frames, k = frames + 1, k + 1
+    elapsed = time.perf_counter() - start
+    return frames / elapsed, len(stream.getvalue()) / frames
+
+
+class _StreamRenderer(Renderer):
+    # Renderer prints; send its output to `stream` like the others
+    stream = None
+
+    def render(self, board, snake, food):
+        with redirect_stdout(self.stream):
+            super().render(board, snake, food)
+
+
+def main():
+    print(f"{'board':>11} {'renderer':>10} {'frames/s':>12} {'bytes/frame':>13}")
+    for width in (100, 300, 1_000):
+        for name, renderer in (("full", _StreamRenderer()), ("diff", DiffRenderer()), ("headless", HeadlessRenderer())):
+            rate, size = frames_per_second(renderer, width)
+            print(f"{f'{width}x{width}':>11} {name:>10} {rate:>12,.1f} {size:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,11 @@ from abc import ABC, abstractmethod
 from collections import deque
 import random
 
+try:  # run as a script from this directory
+    from Occupancy import FreeCellGrid, OccupancyGrid
+except ImportError:
+    from MobileSnakeGame.Occupancy import FreeCellGrid, OccupancyGrid
+
 # --- Interfaces ---
 
 class IFoodStrategy(ABC):
@@ -18,11 +23,18 @@ class RandomFoodStrategy(IFoodStrategy):
             if (x, y) not in snake_body:
                 return (x, y)
 
+class FreeCellFoodStrategy(IFoodStrategy):
+    # snake_body must be a FreeCellGrid; O(1) at any fill level
+    def generate_food(self, board_width, board_height, snake_body):
+        return snake_body.random_free_cell()
+
 # --- Core Game Entities ---
 
 class Snake:
-    def __init__(self, start_pos=(0, 0)):
+    def __init__(self, start_pos=(0, 0), grid=None):
         self.body = deque([start_pos])
+        self.grid = grid if grid is not None else OccupancyGrid()  # segments per cell
+        self.grid.add(start_pos)
         self.direction = (1, 0)  # moving right initially
 
     def move(self, grow=False):
@@ -30,8 +42,9 @@ class Snake:
         dx, dy = self.direction
         new_head = (head_x + dx, head_y + dy)
         self.body.appendleft(new_head)
+        self.grid.add(new_head)
         if not grow:
-            self.body.pop()
+            self.grid.remove(self.body.pop())
 
     def set_direction(self, direction):
         self.direction = direction
@@ -82,7 +95,7 @@ class Renderer:
             for x in range(board.width):
                 if (x, y) == food:
                     row += 'F'
-                elif (x, y) in snake.body:
+                elif (x, y) in snake.grid:
                     row += 'S'
                 else:
                     row += '.'
@@ -103,13 +116,13 @@ class InputHandler:
 # --- Game Engine ---
 
 class SnakeGameEngine:
-    def __init__(self, board_width=10, board_height=10):
+    def __init__(self, board_width=10, board_height=10, renderer=None):
         self.board = Board(board_width, board_height)
-        self.snake = Snake()
-        self.food_spawner = FoodSpawner(RandomFoodStrategy())
-        self.food = self.food_spawner.spawn_food(board_width, board_height, self.snake.body)
+        self.snake = Snake(grid=FreeCellGrid(board_width, board_height))
+        self.food_spawner = FoodSpawner(FreeCellFoodStrategy())
+        self.food = self.food_spawner.spawn_food(board_width, board_height, self.snake.grid)
         self.logger = GameLogger()
-        self.renderer = Renderer()
+        self.renderer = renderer if renderer is not None else Renderer()  # e.g. DiffRenderer, HeadlessRenderer
         self.input_handler = InputHandler()
         self.input_handler.register_callback(self.handle_input)
         self.running = True
@@ -133,8 +146,8 @@ class SnakeGameEngine:
         self.snake.move()
         head = self.snake.get_head()
 
-        # Snake hits itself
-        if head in list(self.snake.body)[1:]:
+        # Snake hits itself: the head's cell holds another segment
+        if self.snake.grid.count(head) > 1:
             self.logger.log_event("Snake hit itself. Game Over!")
             self.running = False
             return
@@ -149,7 +162,7 @@ class SnakeGameEngine:
         if head == self.food:
             self.logger.log_event("Food eaten")
             self.snake.move(grow=True)
-            self.food = self.food_spawner.spawn_food(self.board.width, self.board.height, self.snake.body)
+            self.food = self.food_spawner.spawn_food(self.board.width, self.board.height, self.snake.grid)
             if self.food is None:
                 self.logger.log_event("Snake filled the board. You win!")
                 self.running = False
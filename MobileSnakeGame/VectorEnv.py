@@ -0,0 +1,132 @@
+'''
+    Headless, vectorised snake environment for training and evaluating bots.
+
+    VectorSnakeEnv steps N independent games at once:
+      grid    (N, H, W) int8 board: EMPTY, BODY, HEAD or FOOD per cell
+      bodies  (N, H*W) ring buffers of flat cell indices (y * W + x); the head
+              is bodies[n, heads[n]] and the tail `lengths[n] - 1` slots back
+      food    (N,) flat cell index of each game's food
+    Every step moves all snakes with a few array operations: walls and
+    self-collision come from the grid, the tails of snakes that did not eat
+    are cleared before the collision check (moving into the cell the tail
+    leaves is allowed), and games that ate get new food in one batch.
+
+    Rules follow SnakeGameEngine, except that eating grows the snake by one
+    cell in place of moving it a second time. reset()/step(actions) follow
+    the gym vector-env convention: finished games are reset inside step(),
+    so the returned grid always holds N running games. The grid is updated
+    in place; copy it to keep an observation.
+'''
+import numpy as np
+
+EMPTY, BODY, HEAD, FOOD = 0, 1, 2, 3
+DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]   # actions: right, down, left, up
+
+
+class VectorSnakeEnv:
+    FOOD_TRIES = 8   # rounds of rejection sampling before falling back to listing free cells
+
+    def __init__(self, num_envs, width=10, height=10, max_steps=None, seed=None):
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.max_steps = max_steps   # per episode, None for no limit
+        self.rng = np.random.default_rng(seed)
+        self.grid = np.zeros((num_envs, height, width), dtype=np.int8)
+        self.flat = self.grid.reshape(num_envs, self.cells)   # view of the same memory
+        self.bodies = np.zeros((num_envs, self.cells), dtype=np.int32)
+        self.heads = np.zeros(num_envs, dtype=np.int64)
+        self.lengths = np.zeros(num_envs, dtype=np.int64)
+        self.food = np.zeros(num_envs, dtype=np.int64)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.dx = np.array([dx for dx, _ in DIRECTIONS])
+        self.dy = np.array([dy for _, dy in DIRECTIONS])
+        self.rows = np.arange(num_envs)
+
+    def reset(self, indices=None) -> np.ndarray:
+        """Starts new games (all, or the given ones): length 1 in the middle of the board"""
+        indices = self.rows if indices is None else np.asarray(indices)
+        start = (self.height // 2) * self.width + self.width // 2
+        self.flat[indices] = EMPTY
+        self.flat[indices, start] = HEAD
+        self.bodies[indices, 0] = start
+        self.heads[indices] = 0
+        self.lengths[indices] = 1
+        self.episode_steps[indices] = 0
+        self._spawn_food(indices)
+        return self.grid
+
+    def _spawn_food(self, indices):
+        cells = np.full(len(indices), -1, dtype=np.int64)
+        pending = np.arange(len(indices))
+        for _ in range(self.FOOD_TRIES):
+            if len(pending) == 0:
+                break
+            candidates = self.rng.integers(0, self.cells, len(pending))
+            free = self.flat[indices[pending], candidates] == EMPTY
+            cells[pending[free]] = candidates[free]
+            pending = pending[~free]
+        for i in pending.tolist():   # nearly full boards: pick among the free cells directly
+            free = np.flatnonzero(self.flat[indices[i]] == EMPTY)
+            cells[i] = self.rng.choice(free) if len(free) else -1
+        self._put_food(indices, cells)
+
+    def _put_food(self, indices, cells):
+        placed = cells >= 0
+        self.flat[indices[placed], cells[placed]] = FOOD
+        self.food[indices] = cells
+
+    def step(self, actions):
+        """
+        :param actions: (N,) ints indexing DIRECTIONS
+        :return: grid, rewards (+1 food, -1 death), dones, info
+        """
+        actions = np.asarray(actions)
+        rows, width = self.rows, self.width
+        head_cells = self.bodies[rows, self.heads]
+        x = head_cells % width + self.dx[actions]
+        y = head_cells // width + self.dy[actions]
+        out = (x < 0) | (x >= width) | (y < 0) | (y >= self.height)
+        target = np.where(out, 0, y * width + x)
+        ate = ~out & (target == self.food)
+
+        movers = rows[~out & ~ate]
+        tails = self.bodies[movers, (self.heads[movers] - self.lengths[movers] + 1) % self.cells]
+        self.flat[movers, tails] = EMPTY
+        hit = ~out & ((self.flat[rows, target] == BODY) | (self.flat[rows, target] == HEAD))
+        dead = out | hit
+
+        alive = rows[~dead]
+        necks = rows[~dead & (ate | (self.lengths > 1))]   # a lone head that moved on left nothing behind
+        self.flat[necks, head_cells[necks]] = BODY
+        self.flat[alive, target[alive]] = HEAD
+        self.heads[alive] = (self.heads[alive] + 1) % self.cells
+        self.bodies[alive, self.heads[alive]] = target[alive]
+        self.lengths[ate] += 1
+        self.episode_steps += 1
+
+        won = ate & (self.lengths == self.cells)
+        dones = dead | won
+        if self.max_steps is not None:
+            dones |= self.episode_steps >= self.max_steps
+        rewards = ate.astype(np.float32) - dead.astype(np.float32)
+        info = {"ate": ate, "won": won, "lengths": self.lengths.copy(), "episode_steps": self.episode_steps.copy()}
+
+        respawn = rows[ate & ~dones]
+        if len(respawn):
+            self._spawn_food(respawn)
+        finished = rows[dones]
+        if len(finished):
+            self.reset(finished)
+        return self.grid, rewards, dones, info
+
+
+if __name__ == "__main__":
+    env = VectorSnakeEnv(4, width=6, height=6, seed=3)
+    env.reset()
+    total = np.zeros(4)
+    for _ in range(100):
+        _, rewards, dones, info = env.step(env.rng.integers(0, 4, 4))
+        total += rewards
+    print(f"rewards per game {total}, current lengths {env.lengths}")
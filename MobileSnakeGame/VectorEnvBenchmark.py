@@ -0,0 +1,56 @@
+'''
+    Benchmark: environment steps/sec with random actions for
+      SnakeGameEngine   one game per update() call (HeadlessRenderer, log
+                        output to an in-memory buffer, a new game on death)
+      VectorSnakeEnv    N games per step() call, for growing N
+    on 10x10 and 32x32 boards.
+
+    python -m MobileSnakeGame.VectorEnvBenchmark
+'''
+from contextlib import redirect_stdout
+import io
+import random
+import time
+
+import numpy as np
+
+from MobileSnakeGame.DiffRenderer import HeadlessRenderer
+from MobileSnakeGame.SnakeGame import SnakeGameEngine
+from MobileSnakeGame.VectorEnv import DIRECTIONS, VectorSnakeEnv
+
+
+def engine_steps_per_second(size, budget=1.0):
+    steps, start = 0, time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        engine = SnakeGameEngine(size, size, renderer=HeadlessRenderer())
+        while time.perf_counter() - start < budget:
+            engine.input_handler.on_input(random.choice(DIRECTIONS))
+            engine.update()
+            if not engine.running:
+                engine = SnakeGameEngine(size, size, renderer=HeadlessRenderer())
+            steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+def vector_steps_per_second(num_envs, size, budget=1.0):
+    env = VectorSnakeEnv(num_envs, size, size, seed=1)
+    env.reset()
+    actions = np.random.default_rng(2).integers(0, 4, (64, num_envs))
+    steps, start = 0, time.perf_counter()
+    while time.perf_counter() - start < budget:
+        env.step(actions[steps % 64])
+        steps += 1
+    return steps * num_envs / (time.perf_counter() - start)
+
+
+def main():
+    for size in (10, 32):
+        baseline = engine_steps_per_second(size)
+        print(f"{size}x{size}  SnakeGameEngine           {baseline:>12,.0f} steps/s")
+        for num_envs in (1, 64, 1_024, 8_192, 65_536):
+            rate = vector_steps_per_second(num_envs, size)
+            print(f"{size}x{size}  VectorSnakeEnv N={num_envs:<7,} {rate:>12,.0f} steps/s  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
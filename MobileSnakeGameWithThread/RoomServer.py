@@ -0,0 +1,298 @@
+'''
+    Multi-room snake server: one asyncio event loop drives every room.
+
+    Each room is a SnakeGameEngine over its own MockGameServer, with a
+    DeltaEncoder so that sync_state leaves a compact binary message in
+    server.state every tick. No room has a thread of its own:
+      TimerWheel   rooms are filed under the wheel tick they are next due;
+                   a room updating every `period` wheel ticks is staggered by
+                   its id, so the load spreads evenly over the slots
+      RoomServer   every `tick_rate` seconds (fixed deadlines, as in
+                   FixedTimestepLoop) updates all rooms due on that tick in
+                   one batch, then flushes each connection once with
+                   everything it was sent on that tick
+
+    A room whose snake fills the board starts a new game.
+
+    Connections talk over a local (unix) socket:
+      client -> server  COMMAND: op (SUBSCRIBE, UNSUBSCRIBE, INPUT), room id, dx, dy;
+                        an INPUT that is not one of the four unit moves is ignored
+      server -> client  FRAME: room id, message length, then a StateSync message
+    A connection whose unsent bytes are over `max_buffer` does not get new
+    frames; it counts them in `dropped`, and once it has drained the rooms
+    it missed send a keyframe, from which its StateReconstructor resyncs.
+    A new subscriber gets a keyframe the same way.
+
+    RoomClient is the matching client: it subscribes, sends inputs and
+    keeps a StateReconstructor per room.
+'''
+import asyncio
+from collections import deque
+import struct
+
+from MobileSnakeGameWithThread.SnakeGameWithThreads import MockGameServer, SnakeGameEngine
+from MobileSnakeGameWithThread.StateSync import DeltaEncoder, StateReconstructor
+
+SUBSCRIBE, UNSUBSCRIBE, INPUT = 1, 2, 3
+COMMAND = struct.Struct("<BIbb")
+DIRECTIONS = frozenset({(1, 0), (0, 1), (-1, 0), (0, -1)})   # the only moves INPUT accepts
+FRAME = struct.Struct("<II")
+
+
+class _Silent:
+    # The engine's Renderer and GameLogger print; rooms run headless
+    def render(self, board, snake, food):
+        pass
+
+    def log_event(self, event):
+        pass
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel: an item due on tick t sits in slot t % slots, so
+    scheduling is O(1) and each tick looks at one slot. Items due more
+    than `slots` ticks ahead share the slot and wait their round.
+    """
+    def __init__(self, slots=256):
+        self.slots = [[] for _ in range(slots)]
+        self.now = 0
+
+    def schedule(self, item, delay):
+        due = self.now + max(delay, 1)
+        self.slots[due % len(self.slots)].append((due, item))
+
+    def advance(self):
+        """Moves to the next tick; the items due on it"""
+        self.now += 1
+        index = self.now % len(self.slots)
+        bucket = self.slots[index]
+        due = [item for when, item in bucket if when == self.now]
+        if len(due) < len(bucket):
+            self.slots[index] = [entry for entry in bucket if entry[0] != self.now]
+        else:
+            self.slots[index] = []
+        return due
+
+
+class Room:
+    def __init__(self, room_id, width, height, period, keyframe_interval):
+        self.room_id = room_id
+        self.period = period
+        self.width, self.height = width, height
+        self.server = MockGameServer()
+        self.encoder = DeltaEncoder(width, height, keyframe_interval)
+        self.subscribers = set()
+        self.closed = False
+        self.games = 0
+        self.new_game()
+
+    def new_game(self):
+        """Starts the room over with a fresh snake; subscribers get it as a keyframe"""
+        self.engine = SnakeGameEngine(self.width, self.height, server=self.server, encoder=self.encoder)
+        self.engine.renderer = self.engine.logger = _Silent()
+        self.encoder.request_keyframe()
+        self.games += 1
+
+
+class Connection:
+    def __init__(self, writer, max_buffer):
+        self.writer = writer
+        self.max_buffer = max_buffer
+        self.pending = []
+        self.pending_bytes = 0
+        self.rooms = set()
+        self.missed = set()   # rooms whose frames were dropped, resynced by keyframe
+        self.dropped = 0
+
+    def buffered(self):
+        return self.pending_bytes + self.writer.transport.get_write_buffer_size()
+
+    def send(self, room, frame):
+        if self.buffered() + len(frame) > self.max_buffer:
+            self.dropped += 1
+            self.missed.add(room)
+            return
+        self.pending.append(frame)
+        self.pending_bytes += len(frame)
+
+    def flush(self):
+        if self.pending:
+            self.writer.write(b"".join(self.pending))
+            self.pending.clear()
+            self.pending_bytes = 0
+        if self.missed and self.buffered() < self.max_buffer // 2:
+            for room in self.missed:
+                room.encoder.request_keyframe()
+            self.missed.clear()
+
+
+class RoomServer:
+    def __init__(self, tick_rate=0.05, wheel_slots=256, max_buffer=256 * 1024,
+                 keyframe_interval=100, max_catch_up=5):
+        self.tick_rate = tick_rate
+        self.wheel = TimerWheel(wheel_slots)
+        self.max_buffer = max_buffer
+        self.keyframe_interval = keyframe_interval
+        self.max_catch_up = max_catch_up
+        self.rooms = {}
+        self.connections = set()
+        self.next_room_id = 0
+        self.ticks = 0
+        self.skipped = 0
+        self.room_updates = 0
+        self.tick_latencies = deque(maxlen=100_000)   # seconds from each tick's deadline to its last flush
+        self.running = True
+
+    def create_room(self, width=20, height=20, period=1) -> int:
+        """A new room updating every `period` wheel ticks; returns its id"""
+        room_id = self.next_room_id
+        self.next_room_id += 1
+        room = Room(room_id, width, height, period, self.keyframe_interval)
+        self.rooms[room_id] = room
+        self.wheel.schedule(room, 1 + room_id % period)
+        return room_id
+
+    def remove_room(self, room_id):
+        room = self.rooms.pop(room_id)
+        room.closed = True   # its wheel entry is skipped when it comes due
+        for connection in room.subscribers:
+            connection.rooms.discard(room)
+
+    def tick(self):
+        """Updates every room due on the next wheel tick and flushes the connections"""
+        for room in self.wheel.advance():
+            if room.closed:
+                continue
+            room.engine.update()
+            if not room.engine.running:   # the snake filled the board
+                room.new_game()
+            if room.subscribers:
+                message = room.server.state
+                frame = FRAME.pack(room.room_id, len(message)) + message
+                for connection in room.subscribers:
+                    connection.send(room, frame)
+            self.wheel.schedule(room, room.period)
+            self.room_updates += 1
+        for connection in self.connections:
+            connection.flush()
+        self.ticks += 1
+
+    async def run(self, steps=None):
+        """Ticks every `tick_rate` seconds until stop() (or for `steps` ticks)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        behind = ticks = 0
+        while self.running and (steps is None or ticks < steps):
+            now = loop.time()
+            if now < deadline:
+                await asyncio.sleep(deadline - now)
+                behind = 0
+            else:
+                await asyncio.sleep(0)   # let connections in even when behind
+                if now - deadline >= self.tick_rate:
+                    behind += 1
+                    if behind > self.max_catch_up:
+                        missed = int((now - deadline) / self.tick_rate)
+                        self.skipped += missed
+                        deadline += missed * self.tick_rate
+                        behind = 0
+            self.tick()
+            self.tick_latencies.append(loop.time() - deadline)
+            ticks += 1
+            deadline += self.tick_rate
+
+    def stop(self):
+        self.running = False
+
+    async def handle_connection(self, reader, writer):
+        connection = Connection(writer, self.max_buffer)
+        self.connections.add(connection)
+        try:
+            while True:
+                op, room_id, dx, dy = COMMAND.unpack(await reader.readexactly(COMMAND.size))
+                room = self.rooms.get(room_id)
+                if room is None:
+                    continue
+                if op == SUBSCRIBE:
+                    room.subscribers.add(connection)
+                    connection.rooms.add(room)
+                    room.encoder.request_keyframe()
+                elif op == UNSUBSCRIBE:
+                    room.subscribers.discard(connection)
+                    connection.rooms.discard(room)
+                elif op == INPUT and (dx, dy) in DIRECTIONS:
+                    room.server.add_input((dx, dy))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections.discard(connection)
+            for room in connection.rooms:
+                room.subscribers.discard(connection)
+            writer.close()
+
+    async def serve(self, path):
+        """Starts listening on the unix socket `path`; returns the asyncio server"""
+        return await asyncio.start_unix_server(self.handle_connection, path)
+
+
+class RoomClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.states = {}   # room id -> StateReconstructor
+        self.frames = 0
+
+    @classmethod
+    async def connect(cls, path):
+        return cls(*await asyncio.open_unix_connection(path))
+
+    def subscribe(self, room_id):
+        self.states.setdefault(room_id, StateReconstructor())
+        self.writer.write(COMMAND.pack(SUBSCRIBE, room_id, 0, 0))
+
+    def unsubscribe(self, room_id):
+        self.states.pop(room_id, None)
+        self.writer.write(COMMAND.pack(UNSUBSCRIBE, room_id, 0, 0))
+
+    def send_input(self, room_id, direction):
+        self.writer.write(COMMAND.pack(INPUT, room_id, *direction))
+
+    async def receive(self):
+        """Reads and applies one frame; returns its room id"""
+        room_id, length = FRAME.unpack(await self.reader.readexactly(FRAME.size))
+        message = await self.reader.readexactly(length)
+        self.frames += 1
+        if room_id in self.states:
+            self.states[room_id].apply(message)
+        return room_id
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    async def demo():
+        path = os.path.join(tempfile.mkdtemp(), "rooms.sock")
+        rooms = RoomServer(tick_rate=0.05)
+        for _ in range(100):
+            rooms.create_room(10, 10)
+        server = await rooms.serve(path)
+        runner = asyncio.create_task(rooms.run(steps=40))
+        client = await RoomClient.connect(path)
+        client.subscribe(7)
+        client.send_input(7, (0, 1))
+        for _ in range(20):
+            await client.receive()
+        print(client.states[7].state())
+        await client.close()
+        await runner
+        server.close()
+        await server.wait_closed()
+        print(f"{rooms.ticks} ticks, {rooms.room_updates} room updates")
+
+    asyncio.run(demo())
@@ -0,0 +1,98 @@
+'''
+    Benchmark: load on one RoomServer event loop.
+
+    For each configuration, `rooms` rooms (20x20) tick every `period` wheel
+    ticks of `tick_ms`. `clients` connections over a unix socket each
+    subscribe to `per_client` rooms, read every frame and send a random
+    move to one of their rooms every wheel tick. The clients run on the
+    same loop, so the numbers include the cost of serving them.
+
+    Reported per configuration:
+      ticks/s         wheel ticks run per second (target 1000 / tick_ms)
+      room updates/s  engine updates per second across all rooms
+      latency         p50 / p99 / max of each tick's completion against its deadline
+      frames          frames read by the clients, and frames dropped for full buffers
+
+    python -m MobileSnakeGameWithThread.RoomServerBenchmark [seconds]
+'''
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from MobileSnakeGameWithThread.RoomServer import RoomClient, RoomServer
+
+DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+
+async def load(rooms, period, tick_ms, clients, per_client, seconds):
+    server = RoomServer(tick_rate=tick_ms / 1000)
+    for _ in range(rooms):
+        server.create_room(20, 20, period)
+    path = os.path.join(tempfile.mkdtemp(), "rooms.sock")
+    listener = await server.serve(path)
+    rng = random.Random(1)
+    connected = []
+    for _ in range(clients):
+        client = await RoomClient.connect(path)
+        for room_id in rng.sample(range(rooms), per_client):
+            client.subscribe(room_id)
+        connected.append(client)
+
+    async def read(client):
+        while True:
+            await client.receive()
+
+    async def press_keys():
+        while server.running:
+            for client in connected:
+                client.send_input(rng.choice(list(client.states)), rng.choice(DIRECTIONS))
+            await asyncio.sleep(server.tick_rate)
+
+    readers = [asyncio.create_task(read(client)) for client in connected]
+    keys = asyncio.create_task(press_keys())
+    runner = asyncio.create_task(server.run())
+    await asyncio.sleep(0.5)   # warm up: subscriptions, first keyframes
+    server.tick_latencies.clear()
+    ticks, updates, frames = server.ticks, server.room_updates, sum(c.frames for c in connected)
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    ticks, updates = server.ticks - ticks, server.room_updates - updates
+    frames = sum(c.frames for c in connected) - frames
+    latencies = sorted(server.tick_latencies)
+    server.stop()
+    await runner
+    keys.cancel()
+    for task in readers:
+        task.cancel()
+    dropped = sum(c.dropped for c in server.connections)
+    for client in connected:
+        await client.close()
+    listener.close()
+
+    def ms(q):
+        return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000
+    print(f"{rooms:>7,} rooms  period {period:>2}  tick {tick_ms:>3} ms  {clients:>4} clients x {per_client:>3}  "
+          f"{ticks / elapsed:>7.1f} ticks/s  {updates / elapsed:>9,.0f} room updates/s  "
+          f"latency p50 {ms(0.5):>7.2f} p99 {ms(0.99):>7.2f} max {ms(1.0):>7.2f} ms  "
+          f"{frames / elapsed:>8,.0f} frames/s read  {dropped:,} dropped")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    for rooms, period, tick_ms, clients, per_client in [
+        (1_000, 1, 50, 100, 10),
+        (10_000, 1, 100, 100, 10),
+        (10_000, 10, 10, 100, 10),
+        (10_000, 20, 10, 100, 10),
+        (10_000, 10, 10, 1_000, 10),
+        (10_000, 10, 10, 100, 100),
+    ]:
+        asyncio.run(load(rooms, period, tick_ms, clients, per_client, seconds))
+
+
+if __name__ == "__main__":
+    main()
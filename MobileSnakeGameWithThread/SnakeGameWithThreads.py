@@ -20,14 +20,33 @@ class GameServerInterface(ABC):
     def fetch_remote_moves(self):
         pass
 
+    MAX_MOVES_PER_DRAIN = 1024   # a tick must end even while inputs keep arriving
+
+    def drain_remote_moves(self):
+        # The queued moves, oldest first, up to MAX_MOVES_PER_DRAIN; the rest wait for
+        # the next tick. Servers may override with something cheaper
+        moves = []
+        while len(moves) < self.MAX_MOVES_PER_DRAIN:
+            move = self.fetch_remote_moves()
+            if not move:
+                break
+            moves.append(move)
+        return moves
+
 # --- Strategy Pattern for Food Placement ---
 
 class RandomFoodStrategy(IFoodStrategy):
+    MAX_TRIES = 16   # random picks before falling back to listing the free cells
+
     def generate_food(self, board_width, board_height, snake_body):
-        while True:
+        # A random free cell, or None when the snake fills the board
+        for _ in range(self.MAX_TRIES):
             x, y = random.randint(0, board_width-1), random.randint(0, board_height-1)
             if (x, y) not in snake_body:
                 return (x, y)
+        occupied = set(snake_body)
+        free = [(x, y) for y in range(board_height) for x in range(board_width) if (x, y) not in occupied]
+        return random.choice(free) if free else None
 
 # --- Core Game Entities ---
 
@@ -103,10 +122,51 @@ class InputHandler:
         for cb in self.callbacks:
             cb(direction)
 
+# --- Game Loop ---
+
+class FixedTimestepLoop:
+    """
+    Runs a tick every `tick_rate` seconds against fixed time.monotonic
+    deadlines (start + k * tick_rate), so time spent updating and rendering
+    does not push later ticks back. A tick that starts late is run at once;
+    after more than `max_catch_up` late ticks in a row the loop gives up on
+    the backlog and counts the missed ticks in `skipped`. Later ticks stay
+    on the original start + k * tick_rate grid (the phase is kept).
+    """
+    def __init__(self, tick_rate, max_catch_up=5, clock=time.monotonic, sleep=time.sleep):
+        self.tick_rate = tick_rate
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.sleep = sleep
+        self.ticks = 0
+        self.skipped = 0
+
+    def run(self, tick, steps, running=lambda: True):
+        start = self.clock()
+        deadline = start
+        behind = 0
+        for _ in range(steps):
+            if not running():
+                break
+            now = self.clock()
+            if now < deadline:
+                self.sleep(deadline - now)
+                behind = 0
+            elif now - deadline >= self.tick_rate:
+                behind += 1
+                if behind > self.max_catch_up:
+                    missed = int((now - deadline) / self.tick_rate)
+                    self.skipped += missed
+                    deadline += missed * self.tick_rate
+                    behind = 0
+            tick()
+            self.ticks += 1
+            deadline += self.tick_rate
+
 # --- Game Engine ---
 
 class SnakeGameEngine:
-    def __init__(self, board_width=10, board_height=10, server: GameServerInterface = None):
+    def __init__(self, board_width=10, board_height=10, server: GameServerInterface = None, encoder=None):
         self.board = Board(board_width, board_height)
         self.snake = Snake()
         self.food_spawner = FoodSpawner(RandomFoodStrategy())
@@ -116,6 +176,7 @@ class SnakeGameEngine:
         self.input_handler = InputHandler()
         self.input_handler.register_callback(self.handle_input)
         self.server = server
+        self.encoder = encoder  # e.g. StateSync.DeltaEncoder: sync binary deltas instead of full snapshots
         self.running = True
 
     def handle_input(self, direction):
@@ -123,9 +184,9 @@ class SnakeGameEngine:
 
     def update(self):
         if self.server:
-            remote_direction = self.server.fetch_remote_moves()
-            if remote_direction:
-                self.handle_input(remote_direction)
+            # Apply everything that arrived since the last tick, in order
+            for remote_direction in self.server.drain_remote_moves():
+                self.input_handler.on_input(remote_direction)
 
         self.snake.move()
         head = self.board.wrap_position(self.snake.get_head())
@@ -133,10 +194,17 @@ class SnakeGameEngine:
         if head == self.food:
             self.logger.log_event("Food eaten")
             self.snake.move(grow=True)
+            self.snake.body[0] = self.board.wrap_position(self.snake.get_head())
             self.food = self.food_spawner.spawn_food(self.board.width, self.board.height, self.snake.body)
+            if self.food is None:
+                self.logger.log_event("Board full")
+                self.running = False
 
         if self.server:
-            self.server.sync_state(self.serialize_state())
+            if self.encoder is not None:
+                self.server.sync_state(self.encoder.encode(self.snake.body, self.snake.direction, self.food))
+            else:
+                self.server.sync_state(self.serialize_state())
 
         self.renderer.render(self.board, self.snake, self.food)
 
@@ -148,18 +216,17 @@ class SnakeGameEngine:
             'board_size': (self.board.width, self.board.height)
         }
 
-    def start_game(self, steps=10, tick_rate=1.0):
-        for _ in range(steps):
-            if not self.running:
-                break
-            self.update()
-            time.sleep(tick_rate)
+    def start_game(self, steps=10, tick_rate=1.0, loop: FixedTimestepLoop = None):
+        self.loop = loop if loop is not None else FixedTimestepLoop(tick_rate)
+        self.loop.run(self.update, steps, lambda: self.running)
 
 # --- Example Server Implementation ---
 
 class MockGameServer(GameServerInterface):
     def __init__(self):
         self.state = None
+        # deque.append and deque.popleft are atomic, so any number of input
+        # threads and the game thread share the queue without a lock
         self.input_queue = deque()
         self.lock = threading.Lock()
 
@@ -168,14 +235,24 @@ class MockGameServer(GameServerInterface):
             self.state = game_state
 
     def fetch_remote_moves(self):
-        with self.lock:
-            if self.input_queue:
-                return self.input_queue.popleft()
+        try:
+            return self.input_queue.popleft()
+        except IndexError:
             return None
 
+    def drain_remote_moves(self):
+        # Only what was queued on entry: moves added meanwhile wait for the next tick
+        moves = []
+        popleft = self.input_queue.popleft
+        try:
+            for _ in range(len(self.input_queue)):
+                moves.append(popleft())
+        except IndexError:   # another consumer got there first
+            pass
+        return moves
+
     def add_input(self, direction):
-        with self.lock:
-            self.input_queue.append(direction)
+        self.input_queue.append(direction)
 
 # --- Example Usage ---
 
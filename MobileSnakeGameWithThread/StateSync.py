@@ -0,0 +1,209 @@
+'''
+    Delta state sync for GameServerInterface.sync_state.
+
+    DeltaEncoder turns the engine's state into small binary messages:
+      KEYFRAME  the whole state: board size, direction, food and every body cell
+      DELTA     what changed since the previous message: cells pushed at the
+                head, how many cells were popped from the tail, and the food
+                and direction when they changed
+    Every message carries a sequence number. A keyframe goes out every
+    `keyframe_interval` messages, when one is requested (request_keyframe),
+    and whenever the encoder cannot describe the change as a delta.
+
+    Cells are sent as y * width + x. Everything except the message type byte
+    is an unsigned LEB128 varint, and signed values (the direction) are
+    zigzag-encoded first. A tick where the snake moves one cell costs a few
+    bytes however long the snake is.
+
+    The encoder keeps a mirror of the body as the client will rebuild it,
+    and compares the whole mirror with the real body after every delta, so
+    a change it misreads (a snake that overlaps itself can make the old head
+    show up among the new cells) turns into a keyframe instead of leaving
+    clients out of sync. The comparison is one C-level pass over the body:
+    about 1 ms per tick for a 100k-cell snake, microseconds for normal ones.
+
+    StateReconstructor is the client side. It applies messages in order and
+    ignores deltas after a gap in the sequence until the next keyframe.
+'''
+from collections import deque
+import struct
+
+KEYFRAME, DELTA = 1, 2
+_FOOD_CHANGED, _DIRECTION_CHANGED = 1, 2
+_TYPE = struct.Struct("<B")
+
+
+def _zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if value % 2 == 0 else -(value >> 1) - 1
+
+
+def encode_varint(value, out: bytearray):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, offset):
+    """(value, offset after it)"""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class DeltaEncoder:
+    MAX_PUSHES = 8   # head pushes per message that are still sent as a delta
+
+    def __init__(self, board_width, board_height, keyframe_interval=100):
+        self.width = board_width
+        self.height = board_height
+        self.keyframe_interval = keyframe_interval
+        self.seq = 0
+        self.mirror = None   # the body as clients have rebuilt it
+        self.food = None
+        self.direction = None
+        self.keyframe_requested = False
+
+    def request_keyframe(self):
+        """Makes the next message a keyframe, e.g. for a client that just joined"""
+        self.keyframe_requested = True
+
+    def _cell(self, pos):
+        return pos[1] * self.width + pos[0]
+
+    def _food_code(self, food):
+        return 0 if food is None else self._cell(food) + 1
+
+    def encode(self, body, direction, food) -> bytes:
+        """The message for the engine's current state (body: a deque, as Snake.body); call once per sync"""
+        message = None
+        if self.mirror is not None and self.seq % self.keyframe_interval and not self.keyframe_requested:
+            message = self._delta(body, direction, food)
+        if message is None:
+            message = self._keyframe(body, direction, food)
+        self.seq += 1
+        return bytes(message)
+
+    def _header(self, kind):
+        out = bytearray(_TYPE.pack(kind))
+        encode_varint(self.seq, out)
+        return out
+
+    def _keyframe(self, body, direction, food):
+        out = self._header(KEYFRAME)
+        for value in (self.width, self.height, _zigzag(direction[0]), _zigzag(direction[1]),
+                      self._food_code(food), len(body)):
+            encode_varint(value, out)
+        cell = self._cell
+        for pos in body:
+            encode_varint(cell(pos), out)
+        self.mirror = deque(body)
+        self.keyframe_requested = False
+        self.food, self.direction = food, direction
+        return out
+
+    def _delta(self, body, direction, food):
+        mirror = self.mirror
+        previous_head = mirror[0]
+        pushes = 0
+        while pushes < len(body) and body[pushes] != previous_head:
+            pushes += 1
+            if pushes > self.MAX_PUSHES:
+                return None
+        pops = pushes - (len(body) - len(mirror))
+        if not 0 <= pops <= len(mirror):
+            return None
+        for i in range(pushes - 1, -1, -1):
+            mirror.appendleft(body[i])
+        for _ in range(pops):
+            mirror.pop()
+        if mirror != body:
+            return None   # misread; _keyframe resets the mirror
+
+        flags = (_FOOD_CHANGED if food != self.food else 0) | (_DIRECTION_CHANGED if direction != self.direction else 0)
+        out = self._header(DELTA)
+        out.append(flags)
+        encode_varint(pushes, out)
+        for i in range(pushes - 1, -1, -1):   # oldest push first
+            encode_varint(self._cell(body[i]), out)
+        encode_varint(pops, out)
+        if flags & _FOOD_CHANGED:
+            encode_varint(self._food_code(food), out)
+            self.food = food
+        if flags & _DIRECTION_CHANGED:
+            encode_varint(_zigzag(direction[0]), out)
+            encode_varint(_zigzag(direction[1]), out)
+            self.direction = direction
+        return out
+
+
+class StateReconstructor:
+    def __init__(self):
+        self.body = None
+        self.width = self.height = 0
+        self.direction = None
+        self.food = None
+        self.seq = None
+        self.dropped = 0   # deltas ignored while waiting for a keyframe
+
+    def _pos(self, cell):
+        return cell % self.width, cell // self.width
+
+    def apply(self, message: bytes) -> bool:
+        """Applies one message; False if it was a delta that could not be applied"""
+        kind = message[0]
+        seq, offset = decode_varint(message, 1)
+        if kind == KEYFRAME:
+            values = []
+            for _ in range(6):
+                value, offset = decode_varint(message, offset)
+                values.append(value)
+            self.width, self.height, dx, dy, food, length = values
+            self.direction = (_unzigzag(dx), _unzigzag(dy))
+            self.food = None if food == 0 else self._pos(food - 1)
+            body = deque()
+            for _ in range(length):
+                cell, offset = decode_varint(message, offset)
+                body.append(self._pos(cell))
+            self.body = body
+        elif kind == DELTA:
+            if self.seq is None or seq != self.seq + 1:
+                self.dropped += 1
+                return False
+            flags = message[offset]
+            pushes, offset = decode_varint(message, offset + 1)
+            for _ in range(pushes):
+                cell, offset = decode_varint(message, offset)
+                self.body.appendleft(self._pos(cell))
+            pops, offset = decode_varint(message, offset)
+            for _ in range(pops):
+                self.body.pop()
+            if flags & _FOOD_CHANGED:
+                food, offset = decode_varint(message, offset)
+                self.food = None if food == 0 else self._pos(food - 1)
+            if flags & _DIRECTION_CHANGED:
+                dx, offset = decode_varint(message, offset)
+                dy, offset = decode_varint(message, offset)
+                self.direction = (_unzigzag(dx), _unzigzag(dy))
+        else:
+            raise ValueError(f"Unknown message type {kind}")
+        self.seq = seq
+        return True
+
+    def state(self) -> dict:
+        """The state in SnakeGameEngine.serialize_state's format"""
+        return {
+            'snake': list(self.body),
+            'direction': self.direction,
+            'food': self.food,
+            'board_size': (self.width, self.height)
+        }
@@ -0,0 +1,81 @@
+'''
+    Benchmark: bytes and CPU per tick to sync the game state, for
+      snapshot  serialize_state() sent as JSON every tick (what a real
+                server behind sync_state would put on the wire)
+      delta     DeltaEncoder messages, keyframe every 100 ticks
+    for snakes of growing length. The snake follows a boustrophedon path
+    over the board and eats every 50 ticks, so both encoders see the same
+    head pushes, tail pops and food changes the engine produces.
+    CPU is encoder time only; the client rebuilding the state from the
+    deltas is checked once at the end, outside the timing.
+
+    python -m MobileSnakeGameWithThread.SyncBenchmark [ticks]
+'''
+import json
+import sys
+import time
+
+from MobileSnakeGameWithThread.SnakeGameWithThreads import Board, Snake
+from MobileSnakeGameWithThread.StateSync import DeltaEncoder, StateReconstructor
+
+
+def path_cell(k, width):
+    y, x = divmod(k, width)
+    return (x if y % 2 == 0 else width - 1 - x), y
+
+
+def play(length, ticks, encode):
+    width = 1_000
+    board = Board(width, width)
+    snake = Snake()
+    snake.body.clear()
+    snake.body.extendleft(path_cell(k, width) for k in range(length))
+    step = length
+    food = path_cell(step + 50, width)
+    sent = 0
+    elapsed = 0.0
+    for _ in range(ticks):
+        head = path_cell(step, width)
+        snake.direction = (head[0] - snake.body[0][0], head[1] - snake.body[0][1])
+        snake.move()
+        snake.body[0] = board.wrap_position(snake.get_head())
+        step += 1
+        if head == food:
+            snake.body.appendleft(path_cell(step, width))   # the engine's second move on eating
+            step += 1
+            food = path_cell(step + 50, width)
+        start = time.perf_counter()
+        message = encode(snake, food)
+        elapsed += time.perf_counter() - start
+        sent += len(message)
+    return sent / ticks, elapsed / ticks, snake, food
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    for length in (10, 1_000, 100_000):
+        def snapshot(snake, food):
+            return json.dumps({'snake': list(snake.body), 'direction': snake.direction,
+                               'food': food, 'board_size': (1_000, 1_000)}).encode()
+        full_bytes, full_cpu, _, _ = play(length, ticks, snapshot)
+
+        encoder = DeltaEncoder(1_000, 1_000)
+        messages = []
+
+        def delta(snake, food):
+            message = encoder.encode(snake.body, snake.direction, food)
+            messages.append(message)
+            return message
+        delta_bytes, delta_cpu, snake, food = play(length, ticks, delta)
+        client = StateReconstructor()
+        for message in messages:
+            client.apply(message)
+        assert list(client.body) == list(snake.body) and client.food == food
+
+        print(f"length {length:>7,}  snapshot {full_bytes:>12,.1f} B/tick {full_cpu * 1e6:>10.1f} us/tick   "
+              f"delta {delta_bytes:>10,.1f} B/tick {delta_cpu * 1e6:>8.1f} us/tick   "
+              f"({full_bytes / delta_bytes:,.0f}x fewer bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+'''
+    Benchmark: timing of the game loop over many ticks, for the old
+    `update(); time.sleep(tick_rate)` loop against FixedTimestepLoop.
+    Rendering and logging are switched off, so each tick costs about what
+    update() and a remote input drain cost; an input thread keeps adding
+    moves the whole time.
+
+    Reported per loop:
+      drift   how far the last tick started after its ideal time, start + k * tick
+      jitter  standard deviation of the time between tick starts
+      p99/max lateness of tick starts against the ideal schedule
+
+    python -m MobileSnakeGameWithThread.TickBenchmark [ticks] [tick_ms]
+'''
+from contextlib import redirect_stdout
+import io
+import statistics
+import sys
+import threading
+import time
+
+from MobileSnakeGameWithThread.SnakeGameWithThreads import FixedTimestepLoop, MockGameServer, SnakeGameEngine
+
+
+class _NoRenderer:
+    def render(self, board, snake, food):
+        pass
+
+
+def timed_engine(server, starts):
+    engine = SnakeGameEngine(20, 20, server=server)
+    engine.renderer = _NoRenderer()
+    update = engine.update
+
+    def tick():
+        starts.append(time.monotonic())
+        update()
+    return engine, tick
+
+
+def sleep_loop(tick, steps, tick_rate):
+    for _ in range(steps):
+        tick()
+        time.sleep(tick_rate)
+
+
+def report(name, starts, tick_rate):
+    lateness = sorted(start - (starts[0] + k * tick_rate) for k, start in enumerate(starts))
+    intervals = [b - a for a, b in zip(starts, starts[1:])]
+    drift = starts[-1] - (starts[0] + (len(starts) - 1) * tick_rate)
+    print(f"{name:<18} drift {drift * 1000:>10.1f} ms  jitter {statistics.pstdev(intervals) * 1e6:>8.1f} us  "
+          f"p99 late {lateness[int(len(lateness) * 0.99)] * 1000:>10.3f} ms  max late {lateness[-1] * 1000:>10.3f} ms")
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tick_rate = (float(sys.argv[2]) if len(sys.argv) > 2 else 1.0) / 1000
+    server = MockGameServer()
+    stop = threading.Event()
+
+    def press_keys():
+        directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+        k = 0
+        while not stop.is_set():
+            server.add_input(directions[k % 4])
+            k += 1
+            time.sleep(tick_rate / 3)
+
+    threading.Thread(target=press_keys, daemon=True).start()
+    print(f"{ticks:,} ticks of {tick_rate * 1000:g} ms")
+    with redirect_stdout(io.StringIO()):
+        starts = []
+        engine, tick = timed_engine(server, starts)
+        sleep_loop(tick, ticks, tick_rate)
+    report("sleep(tick_rate)", starts, tick_rate)
+    with redirect_stdout(io.StringIO()):
+        starts = []
+        engine, tick = timed_engine(server, starts)
+        loop = FixedTimestepLoop(tick_rate)
+        loop.run(tick, ticks)
+    report("FixedTimestepLoop", starts, tick_rate)
+    print(f"FixedTimestepLoop skipped {loop.skipped} ticks")
+    stop.set()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,35 @@
+import asyncio
+import os
+import random
+import tempfile
+import threading
 import unittest
 from collections import deque
+from unittest.mock import patch
 from MobileSnakeGameWithThread.SnakeGameWithThreads import (
     Snake, Board, FoodSpawner, RandomFoodStrategy,
-    SnakeGameEngine, MockGameServer
+    SnakeGameEngine, MockGameServer, FixedTimestepLoop, GameServerInterface
 )
+from MobileSnakeGameWithThread.StateSync import (
+    DeltaEncoder, StateReconstructor, KEYFRAME, DELTA, encode_varint, decode_varint
+)
+from MobileSnakeGameWithThread.RoomServer import TimerWheel, RoomServer, RoomClient, Connection, FRAME
+
+FOOD_RANDOM = 'MobileSnakeGameWithThread.SnakeGameWithThreads.random'   # patched for repeatable food
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    sleep = advance   # stands in for time.sleep
+
 
 class TestSnakeGame(unittest.TestCase):
 
@@ -33,6 +59,13 @@ class TestSnakeGame(unittest.TestCase):
         food = spawner.spawn_food(10, 10, snake_body)
         self.assertNotIn(food, snake_body)
 
+    def test_food_on_the_last_free_cell_then_none(self):
+        spawner = FoodSpawner(RandomFoodStrategy())
+        body = deque((x, y) for y in range(3) for x in range(3) if (x, y) != (2, 1))
+        self.assertEqual(spawner.spawn_food(3, 3, body), (2, 1))
+        body.append((2, 1))
+        self.assertIsNone(spawner.spawn_food(3, 3, body))
+
     def test_mock_server_input(self):
         server = MockGameServer()
         server.add_input((0, 1))
@@ -47,5 +80,255 @@ class TestSnakeGame(unittest.TestCase):
         new_head = game.snake.get_head()
         self.assertNotEqual(initial_head, new_head)
 
+    def test_update_applies_every_queued_move(self):
+        server = MockGameServer()
+        game = SnakeGameEngine(board_width=5, board_height=5, server=server)
+        game.food = (4, 4)
+        for direction in [(0, 1), (-1, 0), (0, 1)]:
+            server.add_input(direction)
+        seen = []
+        game.input_handler.register_callback(seen.append)
+        with patch('builtins.print'):
+            game.update()
+        self.assertEqual(seen, [(0, 1), (-1, 0), (0, 1)])
+        self.assertEqual(game.snake.get_head(), (0, 1))
+        self.assertEqual(server.drain_remote_moves(), [])
+
+    def test_drain_while_adding_from_threads(self):
+        server = MockGameServer()
+        drained = []
+
+        def add():
+            for _ in range(20000):
+                server.add_input((1, 0))
+
+        threads = [threading.Thread(target=add) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            drained.extend(server.drain_remote_moves())
+        drained.extend(server.drain_remote_moves())
+        self.assertEqual(len(drained), 80000)
+
+    def test_drain_ends_while_input_keeps_arriving(self):
+        class Flooded(deque):   # an input thread adding a move for every one taken
+            def popleft(self):
+                self.append((0, 1))
+                return super().popleft()
+
+        server = MockGameServer()
+        server.input_queue = Flooded([(1, 0)] * 3)
+        self.assertEqual(server.drain_remote_moves(), [(1, 0)] * 3)
+
+        class EndlessServer(GameServerInterface):
+            def sync_state(self, game_state):
+                pass
+
+            def fetch_remote_moves(self):
+                return (1, 0)
+
+        self.assertEqual(len(EndlessServer().drain_remote_moves()), GameServerInterface.MAX_MOVES_PER_DRAIN)
+
+class TestFixedTimestepLoop(unittest.TestCase):
+
+    def run_loop(self, costs, tick_rate=1.0, max_catch_up=5):
+        clock = FakeClock()
+        loop = FixedTimestepLoop(tick_rate, max_catch_up, clock=clock, sleep=clock.sleep)
+        starts = []
+        costs = iter(costs)
+
+        def tick():
+            starts.append(clock.now)
+            clock.advance(next(costs))
+        loop.run(tick, len(starts) + 100, lambda: len(starts) < 6)
+        return starts, loop
+
+    def test_update_time_does_not_drift(self):
+        starts, loop = self.run_loop([0.3] * 6)
+        self.assertEqual(starts, [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(loop.ticks, 6)
+
+    def test_catches_up_after_a_slow_tick(self):
+        starts, loop = self.run_loop([3.5] + [0.1] * 5)
+        self.assertEqual(starts, [0.0, 3.5, 3.6, 3.7, 4.0, 5.0])
+        self.assertEqual(loop.skipped, 0)
+
+    def test_drops_the_backlog_past_max_catch_up(self):
+        starts, loop = self.run_loop([3.5] + [0.1] * 5, max_catch_up=1)
+        self.assertEqual(loop.skipped, 1)   # the tick due at 2.0; the one due at 3.0 runs at 3.6
+        self.assertEqual(starts[:5], [0.0, 3.5, 3.6, 4.0, 5.0])
+
+    def test_dropping_the_backlog_keeps_the_phase(self):
+        starts, loop = self.run_loop([2.7] + [0.1] * 5, max_catch_up=0)
+        self.assertEqual(loop.skipped, 1)
+        # Back on the whole-second grid, not 2.7 + 1.0
+        self.assertEqual(starts[:4], [0.0, 2.7, 3.0, 4.0])
+
+    def test_start_game_stops_when_not_running(self):
+        game = SnakeGameEngine(board_width=5, board_height=5)
+        clock = FakeClock()
+        game.running = False
+        game.start_game(steps=3, loop=FixedTimestepLoop(1.0, clock=clock, sleep=clock.sleep))
+        self.assertEqual((game.loop.ticks, clock.now), (0, 0.0))
+
+
+class TestStateSync(unittest.TestCase):
+
+    def play(self, ticks, width=6, height=5, keyframe_interval=100, directions=None):
+        server = MockGameServer()
+        encoder = DeltaEncoder(width, height, keyframe_interval)
+        client = StateReconstructor()
+        rng = random.Random(7)
+        messages = []
+        with patch('builtins.print'), patch(FOOD_RANDOM, random.Random(7)):
+            game = SnakeGameEngine(board_width=width, board_height=height, server=server, encoder=encoder)
+            for _ in range(ticks):
+                server.add_input(rng.choice(directions or [(1, 0), (0, 1), (-1, 0), (0, -1)]))
+                game.update()
+                messages.append(server.state)
+                self.assertTrue(client.apply(server.state))
+                self.assertEqual(client.state(), game.serialize_state())
+        return game, messages
+
+    def test_varint_round_trip(self):
+        for value in [0, 1, 127, 128, 300, 2 ** 35]:
+            out = bytearray()
+            encode_varint(value, out)
+            self.assertEqual(decode_varint(out, 0), (value, len(out)))
+        self.assertEqual(len(out), 6)
+
+    def test_client_follows_the_game(self):
+        game, messages = self.play(300)
+        self.assertGreater(len(game.snake.body), 3)   # it ate along the way
+        self.assertEqual(sum(m[0] == KEYFRAME for m in messages), 3)
+        self.assertLess(max(len(m) for m in messages if m[0] == DELTA), 20)
+
+    def test_standing_still_is_resent_as_a_keyframe(self):
+        encoder = DeltaEncoder(5, 5)
+        client = StateReconstructor()
+        client.apply(encoder.encode(deque([(2, 0), (1, 0), (0, 0)]), (1, 0), (4, 4)))
+        body = deque([(2, 0), (2, 0), (1, 0)])   # pushed the head's own cell, popped the tail
+        message = encoder.encode(body, (0, 0), (4, 4))
+        self.assertEqual(message[0], KEYFRAME)
+        client.apply(message)
+        self.assertEqual(client.state()['snake'], list(body))
+
+        # Same head, length and tail, but the middle moved: only the whole body tells
+        encoder = DeltaEncoder(5, 5)
+        client = StateReconstructor()
+        client.apply(encoder.encode(deque([(2, 0), (1, 0), (0, 0), (0, 0)]), (1, 0), (4, 4)))
+        body = deque([(2, 0), (2, 0), (1, 0), (0, 0)])
+        message = encoder.encode(body, (0, 0), (4, 4))
+        self.assertEqual(message[0], KEYFRAME)
+        client.apply(message)
+        self.assertEqual(client.state()['snake'], list(body))
+
+    def test_client_waits_for_a_keyframe_after_a_gap(self):
+        game, messages = self.play(25, keyframe_interval=10)
+        client = StateReconstructor()
+        results = [client.apply(m) for m in messages[:3] + messages[5:]]
+        self.assertEqual(results[3:8], [False] * 5)   # seq 5..9, until the keyframe at seq 10
+        self.assertTrue(all(results[8:]))
+        self.assertEqual(client.dropped, 5)
+        self.assertEqual(client.state(), game.serialize_state())
+
+
+class FakeWriter:
+    # A StreamWriter whose transport reports `backlog` unsent bytes
+    def __init__(self):
+        self.backlog = 0
+        self.written = []
+        self.transport = self
+
+    def get_write_buffer_size(self):
+        return self.backlog
+
+    def write(self, data):
+        self.written.append(data)
+
+
+class TestTimerWheel(unittest.TestCase):
+
+    def test_items_come_due_on_their_tick(self):
+        wheel = TimerWheel(slots=4)
+        wheel.schedule('a', 1)
+        wheel.schedule('b', 3)
+        wheel.schedule('c', 7)   # same slot as 'b', one round later
+        due = [wheel.advance() for _ in range(8)]
+        self.assertEqual(due, [['a'], [], ['b'], [], [], [], ['c'], []])
+
+
+class TestRoomServer(unittest.TestCase):
+
+    def test_rooms_update_every_period(self):
+        rooms = RoomServer()
+        fast = rooms.create_room(5, 5)
+        slow = rooms.create_room(5, 5, period=3)
+        for _ in range(6):
+            rooms.tick()
+        self.assertEqual(rooms.rooms[fast].encoder.seq, 6)
+        self.assertEqual(rooms.rooms[slow].encoder.seq, 2)
+        rooms.remove_room(slow)
+        for _ in range(6):
+            rooms.tick()
+        self.assertEqual(rooms.room_updates, 14)
+
+    def test_full_board_starts_a_new_game(self):
+        rooms = RoomServer()
+        rng = random.Random(5)
+        with patch(FOOD_RANDOM, random.Random(5)):
+            room = rooms.rooms[rooms.create_room(2, 2)]
+            for _ in range(2000):   # used to hang in RandomFoodStrategy once the board was full
+                room.server.add_input(rng.choice([(1, 0), (0, 1), (-1, 0), (0, -1)]))
+                rooms.tick()
+        self.assertEqual(rooms.ticks, 2000)
+        self.assertGreater(room.games, 1)
+
+    def test_full_connection_drops_frames_then_resyncs(self):
+        rooms = RoomServer(max_buffer=1000)
+        room = rooms.rooms[rooms.create_room(5, 5)]
+        writer = FakeWriter()
+        connection = Connection(writer, rooms.max_buffer)
+        rooms.connections.add(connection)
+        room.subscribers.add(connection)
+        rooms.tick()
+        writer.backlog = 1000
+        rooms.tick()
+        rooms.tick()
+        self.assertEqual((connection.dropped, len(writer.written)), (2, 1))
+        writer.backlog = 0
+        rooms.tick()   # still a delta: the keyframe is requested on this flush
+        rooms.tick()
+        self.assertEqual(writer.written[-1][FRAME.size], KEYFRAME)
+
+    def test_subscriber_follows_room_over_socket(self):
+        async def scenario(path):
+            rooms = RoomServer(tick_rate=0.001)
+            for _ in range(10):
+                rooms.create_room(6, 6)
+            server = await rooms.serve(path)
+            client = await RoomClient.connect(path)
+            client.subscribe(3)
+            client.send_input(3, (0, 1))
+            client.send_input(3, (0, 0))    # not a move: ignored
+            client.send_input(3, (5, -7))
+            await client.writer.drain()
+            await asyncio.sleep(0.01)
+            runner = asyncio.create_task(rooms.run(steps=20))
+            for _ in range(20):
+                self.assertEqual(await client.receive(), 3)
+            await runner
+            state = client.states[3].state()
+            await client.close()
+            server.close()
+            await server.wait_closed()
+            return state, rooms.rooms[3].engine.serialize_state()
+
+        with tempfile.TemporaryDirectory() as directory:
+            state, expected = asyncio.run(scenario(os.path.join(directory, "rooms.sock")))
+        self.assertEqual(state, expected)
+        self.assertEqual(state['direction'], (0, 1))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,85 @@
+'''
+    Benchmark: N concurrent waiters queued on one bucket.
+    Reports wall time against the ideal N / rate, how late each grant fired
+    compared with its ideal FIFO slot, and how many scheduler timers were armed
+    (a sleep-per-waiter design would arm N of them).
+
+    python -m RateLimiters.AsyncRateLimiter.AsyncBenchmark [waiters] [rate]
+'''
+import asyncio
+import sys
+import time
+
+from RateLimiters.AsyncRateLimiter.AsyncRateLimiter import (
+    AsyncTokenBucketRateLimiter, AsyncLeakyBucketRateLimiter
+)
+
+
+def free_slots(limiter, bucket):
+    if isinstance(limiter, AsyncLeakyBucketRateLimiter):
+        return max(0.0, limiter.capacity - bucket.level)
+    return bucket.level
+
+
+async def run(limiter, waiters, rate):
+    loop = asyncio.get_running_loop()
+    lateness = [0.0] * waiters
+    timers = 0
+    original_arm = limiter._arm
+
+    def counting_arm(bucket, loop_, now):
+        nonlocal timers
+        timers += 1
+        original_arm(bucket, loop_, now)
+
+    limiter._arm = counting_arm
+    t0 = level0 = 0.0
+
+    async def request(i):
+        nonlocal t0, level0
+        if i == 0:
+            # The queue forms here; from now on every slot goes to a waiter
+            t0 = loop.time()
+            bucket = limiter._bucket("client", t0)
+            limiter._refill(bucket, t0)
+            level0 = free_slots(limiter, bucket)
+        await limiter.acquire("client")
+        # The i-th waiter needs i + 1 slots beyond those already free at t0
+        lateness[i] = loop.time() - (t0 + max(0.0, i + 1 - level0) / rate)
+
+    # Use up the burst so every request below has to queue
+    while limiter.allow_request("client"):
+        pass
+    tasks = [asyncio.ensure_future(request(i)) for i in range(waiters)]
+
+    wall = time.perf_counter()
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - wall
+
+    lateness.sort()
+    return {
+        "wall_s": wall,
+        "ideal_s": max(0.0, waiters - level0) / rate,
+        "p50_late_ms": lateness[waiters // 2] * 1000,
+        "p99_late_ms": lateness[int(waiters * 0.99)] * 1000,
+        "max_late_ms": lateness[-1] * 1000,
+        "timers_armed": timers,
+    }
+
+
+def main():
+    waiters = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 20_000.0
+    cases = {
+        "token": AsyncTokenBucketRateLimiter(rate=rate, capacity=10),
+        "leaky": AsyncLeakyBucketRateLimiter(capacity=10, leak_rate=rate),
+    }
+    print(f"{waiters} concurrent waiters, rate {rate:.0f}/s")
+    for name, limiter in cases.items():
+        stats = asyncio.run(run(limiter, waiters, rate))
+        print(f"{name:>6}: " + ", ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+                                          for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
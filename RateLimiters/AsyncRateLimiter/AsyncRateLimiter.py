@@ -0,0 +1,211 @@
+from abc import abstractmethod
+import asyncio
+from collections import deque
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiter
+
+# Float slack so a timer that fires exactly on the refill deadline is not
+# rejected because of rounding in elapsed * rate.
+_EPSILON = 1e-9
+
+
+class _Bucket:
+    __slots__ = ("level", "last_time", "waiters", "timer")
+
+    def __init__(self, level, now):
+        self.level = level          # tokens (token bucket) or water (leaky bucket)
+        self.last_time = now
+        self.waiters = deque()      # FIFO of futures waiting for a slot
+        self.timer = None           # the one loop.call_at handle for this bucket
+
+
+# Abstract asyncio limiter: acquire() waits for a slot instead of rejecting.
+# Each client bucket owns a single scheduler timer armed for the moment the
+# next slot frees up; when it fires, waiters are granted in FIFO order.
+class AsyncRateLimiter(RateLimiter):
+    def __init__(self):
+        self.buckets = {}
+
+    @abstractmethod
+    def _initial_level(self):
+        pass
+
+    @abstractmethod
+    def _advance(self, bucket, elapsed):
+        pass
+
+    @abstractmethod
+    def _clamp(self, bucket):
+        pass
+
+    @abstractmethod
+    def _available(self, bucket) -> bool:
+        pass
+
+    @abstractmethod
+    def _consume(self, bucket):
+        pass
+
+    @abstractmethod
+    def _release(self, bucket):
+        pass
+
+    @abstractmethod
+    def _wait_time(self, bucket) -> float:
+        pass
+
+    def _bucket(self, client_id, now):
+        bucket = self.buckets.get(client_id)
+        if bucket is None:
+            bucket = self.buckets[client_id] = _Bucket(self._initial_level(), now)
+        return bucket
+
+    def _refill(self, bucket, now):
+        self._advance(bucket, now - bucket.last_time)
+        bucket.last_time = now
+        # While waiters are queued every slot is handed out the moment it frees
+        # up, so a timer that fires late must not lose slots to the clamp.
+        if not bucket.waiters:
+            self._clamp(bucket)
+
+    def allow_request(self, client_id: str) -> bool:
+        # Non-blocking check; must be called from the event loop thread.
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        bucket = self._bucket(client_id, now)
+        self._refill(bucket, now)
+        if not bucket.waiters and self._available(bucket):
+            self._consume(bucket)
+            return True
+        return False
+
+    async def acquire(self, client_id: str) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        bucket = self._bucket(client_id, now)
+        self._refill(bucket, now)
+        # Fast path: nobody queued ahead of us and a slot is free
+        if not bucket.waiters and self._available(bucket):
+            self._consume(bucket)
+            return
+
+        future = loop.create_future()
+        bucket.waiters.append(future)
+        if bucket.timer is None:
+            self._arm(bucket, loop, now)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted but the caller went away before using it
+                self._release(bucket)
+            self._dispatch(bucket, loop)
+            raise
+
+    def _arm(self, bucket, loop, now):
+        bucket.timer = loop.call_at(now + self._wait_time(bucket), self._on_timer, bucket, loop)
+
+    def _on_timer(self, bucket, loop):
+        bucket.timer = None
+        self._dispatch(bucket, loop)
+
+    def _dispatch(self, bucket, loop):
+        now = loop.time()
+        self._refill(bucket, now)
+        waiters = bucket.waiters
+        while waiters:
+            future = waiters[0]
+            if future.done():  # cancelled while queued
+                waiters.popleft()
+                continue
+            if not self._available(bucket):
+                break
+            waiters.popleft()
+            self._consume(bucket)
+            future.set_result(None)
+
+        if not waiters:
+            self._clamp(bucket)
+            if bucket.timer is not None:
+                bucket.timer.cancel()
+                bucket.timer = None
+        elif bucket.timer is None:
+            self._arm(bucket, loop, now)
+
+    def waiting(self, client_id: str) -> int:
+        bucket = self.buckets.get(client_id)
+        if bucket is None:
+            return 0
+        return sum(1 for future in bucket.waiters if not future.done())
+
+
+# Token bucket: bursts up to capacity, then one slot every 1 / rate seconds
+class AsyncTokenBucketRateLimiter(AsyncRateLimiter):
+    def __init__(self, rate, capacity):
+        super().__init__()
+        self.rate = rate
+        self.capacity = capacity
+
+    def _initial_level(self):
+        return self.capacity
+
+    def _advance(self, bucket, elapsed):
+        bucket.level += elapsed * self.rate
+
+    def _clamp(self, bucket):
+        bucket.level = min(self.capacity, bucket.level)
+
+    def _available(self, bucket) -> bool:
+        return bucket.level >= 1 - _EPSILON
+
+    def _consume(self, bucket):
+        bucket.level -= 1
+
+    def _release(self, bucket):
+        bucket.level = min(self.capacity, bucket.level + 1)
+
+    def _wait_time(self, bucket) -> float:
+        return max(0.0, (1 - bucket.level) / self.rate)
+
+
+# Leaky bucket: admits while the water level leaves room for one more drop
+class AsyncLeakyBucketRateLimiter(AsyncRateLimiter):
+    def __init__(self, capacity, leak_rate):
+        super().__init__()
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+
+    def _initial_level(self):
+        return 0
+
+    def _advance(self, bucket, elapsed):
+        bucket.level -= elapsed * self.leak_rate
+
+    def _clamp(self, bucket):
+        bucket.level = max(0, bucket.level)
+
+    def _available(self, bucket) -> bool:
+        return bucket.level + 1 <= self.capacity + _EPSILON
+
+    def _consume(self, bucket):
+        bucket.level += 1
+
+    def _release(self, bucket):
+        bucket.level = max(0, bucket.level - 1)
+
+    def _wait_time(self, bucket) -> float:
+        return max(0.0, (bucket.level + 1 - self.capacity) / self.leak_rate)
+
+
+if __name__ == "__main__":
+    async def main():
+        limiter = AsyncTokenBucketRateLimiter(rate=5, capacity=2)
+        start = asyncio.get_running_loop().time()
+
+        async def request(i):
+            await limiter.acquire("client1")
+            print(f"request {i} granted at {asyncio.get_running_loop().time() - start:.2f}s")
+
+        await asyncio.gather(*(request(i) for i in range(6)))
+
+    asyncio.run(main())
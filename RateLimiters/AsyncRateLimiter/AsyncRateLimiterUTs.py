@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+
+from RateLimiters.AsyncRateLimiter.AsyncRateLimiter import (
+    AsyncTokenBucketRateLimiter, AsyncLeakyBucketRateLimiter
+)
+
+
+class TestAsyncRateLimiters(unittest.IsolatedAsyncioTestCase):
+
+    async def test_token_bucket_burst_then_waits(self):
+        limiter = AsyncTokenBucketRateLimiter(rate=100, capacity=3)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await limiter.acquire("c")
+        self.assertLess(loop.time() - start, 0.005)
+
+        await limiter.acquire("c")
+        self.assertGreaterEqual(loop.time() - start, 0.009)
+
+    async def test_allow_request_does_not_jump_queue(self):
+        limiter = AsyncTokenBucketRateLimiter(rate=1000, capacity=1)
+        await limiter.acquire("c")
+        waiter = asyncio.ensure_future(limiter.acquire("c"))
+        await asyncio.sleep(0)
+        self.assertFalse(limiter.allow_request("c"))
+        await waiter
+
+    async def test_fifo_order(self):
+        limiter = AsyncLeakyBucketRateLimiter(capacity=1, leak_rate=500)
+        order = []
+
+        async def request(i):
+            await limiter.acquire("c")
+            order.append(i)
+
+        await asyncio.gather(*(request(i) for i in range(10)))
+        self.assertEqual(order, list(range(10)))
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = AsyncTokenBucketRateLimiter(rate=50, capacity=1)
+        await limiter.acquire("c")
+        cancelled = asyncio.ensure_future(limiter.acquire("c"))
+        survivor = asyncio.ensure_future(limiter.acquire("c"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await survivor
+        # The survivor takes the first refilled token, not the second one
+        self.assertLess(loop.time() - start, 0.035)
+        self.assertEqual(limiter.waiting("c"), 0)
+        self.assertIsNone(limiter.buckets["c"].timer)
+
+    async def test_clients_are_independent(self):
+        limiter = AsyncTokenBucketRateLimiter(rate=1, capacity=1)
+        await limiter.acquire("a")
+        self.assertFalse(limiter.allow_request("a"))
+        self.assertTrue(limiter.allow_request("b"))
+
+
+if __name__ == '__main__':
+    unittest.main()
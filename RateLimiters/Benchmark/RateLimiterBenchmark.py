@@ -0,0 +1,200 @@
+'''
+    Benchmark and accuracy harness for the RateLimiters algorithms.
+
+    Synthetic traffic (bursty clients, Zipf-distributed clients, window
+    boundary spikes) is replayed against every algorithm under a VirtualClock,
+    so runs are reproducible and nothing sleeps. For each algorithm it reports:
+      * decisions/sec and p99 decision latency
+      * memory per tracked client (tracemalloc)
+      * over/under-admission against an exact sliding window of
+        max_requests per window_size (float timestamps), and the peak number
+        admitted in any window_size span as a multiple of max_requests
+
+    python -m RateLimiters.Benchmark.RateLimiterBenchmark [scale]
+'''
+from collections import defaultdict, deque
+import random
+import sys
+import time
+import tracemalloc
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import (
+    RateLimiter, RateLimiterFactory, VirtualClock, LeakyBucketRateLimiter, TokenBucketRateLimiter
+)
+
+MAX_REQUESTS = 20
+WINDOW_SIZE = 10
+
+# --- Traffic Patterns ---
+# Each pattern returns a time-sorted list of (timestamp, client_id).
+
+def bursty_traffic(rng, clients=200, duration=600.0, burst_size=40, burst_span=1.0, idle_mean=30.0):
+    events = []
+    for c in range(clients):
+        client_id = f"client_{c}"
+        t = rng.uniform(0, idle_mean)
+        while t < duration:
+            events.extend((t + rng.uniform(0, burst_span), client_id) for _ in range(burst_size))
+            t += burst_span + rng.expovariate(1 / idle_mean)
+    events.sort()
+    return events
+
+
+def zipf_traffic(rng, clients=5_000, requests=200_000, rate=500.0, s=1.1):
+    weights = [1 / (k ** s) for k in range(1, clients + 1)]
+    ids = rng.choices([f"client_{c}" for c in range(clients)], weights=weights, k=requests)
+    events, t = [], 0.0
+    for client_id in ids:
+        t += rng.expovariate(rate)
+        events.append((t, client_id))
+    return events
+
+
+def boundary_spike_traffic(rng, clients=200, windows=30):
+    # Every 2 windows: one request at t = 2kW opens a window (lazily anchored
+    # limiters start it there, epoch-aligned ones are already on it), then
+    # max_requests arrive just before t = 2kW + W and max_requests right after
+    events = []
+    for c in range(clients):
+        client_id = f"client_{c}"
+        for k in range(windows):
+            anchor = 2 * k * WINDOW_SIZE
+            boundary = anchor + WINDOW_SIZE
+            events.append((anchor, client_id))
+            events.extend((boundary - 0.5 + rng.uniform(0, 0.01), client_id) for _ in range(MAX_REQUESTS))
+            events.extend((boundary + rng.uniform(0, 0.01), client_id) for _ in range(MAX_REQUESTS))
+    events.sort()
+    return events
+
+# --- Algorithms ---
+
+# Token and leaky buckets in FixedSlidingWithThreading keep one bucket for
+# all clients; give every client its own so they can be compared per client.
+class PerClientLimiter(RateLimiter):
+    def __init__(self, make_limiter):
+        self.make_limiter = make_limiter
+        self.limiters = {}
+
+    def allow_request(self, client_id: str) -> bool:
+        limiter = self.limiters.get(client_id)
+        if limiter is None:
+            limiter = self.limiters[client_id] = self.make_limiter()
+        return limiter.allow_request(client_id)
+
+
+ALGORITHMS = ["fixed", "sliding", "sliding_counter", "token", "leaky"]
+
+
+def create_limiter(name, clock) -> RateLimiter:
+    rate = MAX_REQUESTS / WINDOW_SIZE
+    if name == "token":
+        return PerClientLimiter(lambda: TokenBucketRateLimiter(rate, MAX_REQUESTS, clock))
+    elif name == "leaky":
+        return PerClientLimiter(lambda: LeakyBucketRateLimiter(MAX_REQUESTS, rate, clock))
+    return RateLimiterFactory.create_rate_limiter(name, MAX_REQUESTS, WINDOW_SIZE, clock=clock)
+
+# --- Measurement ---
+
+def reference_admissions(events):
+    # Exact sliding window: admit at t iff fewer than MAX_REQUESTS admitted in (t - W, t]
+    admitted = defaultdict(int)
+    logs = defaultdict(deque)
+    for t, client_id in events:
+        log = logs[client_id]
+        while log and log[0] <= t - WINDOW_SIZE:
+            log.popleft()
+        if len(log) < MAX_REQUESTS:
+            log.append(t)
+            admitted[client_id] += 1
+    return admitted
+
+
+def peak_window_ratio(admitted_times):
+    peak = 0
+    for times in admitted_times.values():
+        lo = 0
+        for hi, t in enumerate(times):
+            while times[lo] <= t - WINDOW_SIZE:
+                lo += 1
+            peak = max(peak, hi - lo + 1)
+    return peak / MAX_REQUESTS
+
+
+def replay(name, events):
+    clock = VirtualClock(0.0)
+    limiter = create_limiter(name, clock)
+    latencies = [0] * len(events)
+    admitted_times = defaultdict(list)
+    perf = time.perf_counter_ns
+    for i, (t, client_id) in enumerate(events):
+        clock.now = t
+        start = perf()
+        allowed = limiter.allow_request(client_id)
+        latencies[i] = perf() - start
+        if allowed:
+            admitted_times[client_id].append(t)
+    return latencies, admitted_times
+
+
+def memory_per_client(name, events):
+    clients = len({client_id for _, client_id in events})
+    clock = VirtualClock(0.0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    limiter = create_limiter(name, clock)
+    for t, client_id in events:
+        clock.now = t
+        limiter.allow_request(client_id)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del limiter
+    return used / clients
+
+
+def evaluate(name, events, reference):
+    latencies, admitted_times = replay(name, events)
+    latencies.sort()
+    total_reference = sum(reference.values())
+    over = under = 0
+    for client_id in set(reference) | set(admitted_times):
+        diff = len(admitted_times.get(client_id, ())) - reference.get(client_id, 0)
+        if diff > 0:
+            over += diff
+        else:
+            under -= diff
+    return {
+        "algorithm": name,
+        "decisions/s": len(latencies) / (sum(latencies) / 1e9),
+        "p99 ns": latencies[int(len(latencies) * 0.99)],
+        "bytes/client": memory_per_client(name, events),
+        "over %": 100 * over / total_reference,
+        "under %": 100 * under / total_reference,
+        "peak/limit": peak_window_ratio(admitted_times),
+    }
+
+
+def print_table(rows):
+    print(f"{'algorithm':>16} {'decisions/s':>12} {'p99 ns':>8} {'bytes/client':>12} "
+          f"{'over %':>7} {'under %':>8} {'peak/limit':>10}")
+    for r in rows:
+        print(f"{r['algorithm']:>16} {r['decisions/s']:>12,.0f} {r['p99 ns']:>8} {r['bytes/client']:>12,.0f} "
+              f"{r['over %']:>7.2f} {r['under %']:>8.2f} {r['peak/limit']:>10.2f}")
+
+
+def main():
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    rng = random.Random(42)
+    patterns = {
+        "bursty": bursty_traffic(rng, clients=int(200 * scale)),
+        "zipf": zipf_traffic(rng, requests=int(200_000 * scale)),
+        "boundary spike": boundary_spike_traffic(rng, clients=int(200 * scale)),
+    }
+    print(f"limit {MAX_REQUESTS} requests / {WINDOW_SIZE}s per client")
+    for pattern, events in patterns.items():
+        reference = reference_admissions(events)
+        print(f"\n{pattern}: {len(events)} requests, {len(reference)} clients")
+        print_table([evaluate(name, events, reference) for name in ALGORITHMS])
+
+
+if __name__ == "__main__":
+    main()
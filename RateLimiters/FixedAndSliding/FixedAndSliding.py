@@ -9,14 +9,15 @@ class RateLimiter(ABC):
         pass
 
 class FixedWindowRateLimiter(RateLimiter):
-    def __init__(self, max_requests: int, window_size: int):
+    def __init__(self, max_requests: int, window_size: int, clock=time.time):
         self.max_requests = max_requests
         self.window_size = window_size
         self.request_counts = {}
         self.window_start_times = {}
+        self.clock = clock
 
     def allow_request(self, client_id: str) -> bool:
-        current_time = int(time.time())
+        current_time = int(self.clock())
         self.window_start_times.setdefault(client_id, current_time)
         self.request_counts.setdefault(client_id, 0)
 
@@ -31,17 +32,18 @@ class FixedWindowRateLimiter(RateLimiter):
         return False
 
 class SlidingWindowRateLimiter(RateLimiter):
-    def __init__(self, max_requests: int, window_size: int):
+    def __init__(self, max_requests: int, window_size: int, clock=time.time):
         self.max_requests = max_requests
         self.window_size = window_size
         self.request_timestamps = {}
+        self.clock = clock
 
     def allow_request(self, client_id: str) -> bool:
-        current_time = int(time.time())
+        current_time = int(self.clock())
         self.request_timestamps.setdefault(client_id, deque())
 
         timestamps = self.request_timestamps[client_id]
-        while timestamps and current_time - timestamps[0] > self.window_size:
+        while timestamps and current_time - timestamps[0] >= self.window_size:
             timestamps.popleft()
 
         if len(timestamps) < self.max_requests:
@@ -50,20 +52,22 @@ class SlidingWindowRateLimiter(RateLimiter):
         return False
 
 class LeakyBucketWithCredits(RateLimiter):
-    def __init__(self, capacity, leak_rate):
+    def __init__(self, capacity, leak_rate, clock=time.time):
         """
         :param capacity: Maximum number of request credits
         :param leak_rate: Number of credits restored per second
+        :param clock: Time source in seconds, e.g. a VirtualClock in tests
         """
         self.capacity = capacity
         self.leak_rate = leak_rate
         self.credits = capacity  # Start with full credits
-        self.last_time = time.time()
+        self.clock = clock
+        self.last_time = clock()
         self.lock = Lock()
 
     def allow_request(self):
         with self.lock:
-            now = time.time()
+            now = self.clock()
             elapsed = now - self.last_time
             # Refill credits based on elapsed time
             restored = elapsed * self.leak_rate
@@ -76,16 +80,17 @@ class LeakyBucketWithCredits(RateLimiter):
             return False
 
 class LeakyBucket(RateLimiter):
-    def __init__(self, capacity, leak_rate):
+    def __init__(self, capacity, leak_rate, clock=time.time):
         self.capacity = capacity          # Max water level (max requests bucket can hold)
         self.leak_rate = leak_rate        # Requests removed (leaked) per second
         self.water = 0                    # Current water level (pending requests)
-        self.last_time = time.time()      # Last time leakage was calculated
+        self.clock = clock                # Time source in seconds
+        self.last_time = clock()          # Last time leakage was calculated
         self.lock = Lock()                # Thread-safety for concurrent access
 
     def allow_request(self):
         with self.lock:
-            now = time.time()
+            now = self.clock()
             elapsed = now - self.last_time  # Time passed since last check
             self.last_time = now
             leaked = elapsed * self.leak_rate
@@ -99,11 +104,11 @@ class LeakyBucket(RateLimiter):
 
 class RateLimiterFactory:
     @staticmethod
-    def create_rate_limiter(type: str, max_requests: int, window_size: int) -> RateLimiter:
+    def create_rate_limiter(type: str, max_requests: int, window_size: int, clock=time.time) -> RateLimiter:
         if type == "fixed":
-            return FixedWindowRateLimiter(max_requests, window_size)
+            return FixedWindowRateLimiter(max_requests, window_size, clock)
         elif type == "sliding":
-            return SlidingWindowRateLimiter(max_requests, window_size)
+            return SlidingWindowRateLimiter(max_requests, window_size, clock)
         else:
             raise ValueError("Unknown rate limiter type")
 #
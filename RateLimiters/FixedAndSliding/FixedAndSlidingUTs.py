@@ -1,11 +1,16 @@
 import unittest
-import time
-from FixedAndSliding import *
+
+from RateLimiters.FixedAndSliding.FixedAndSliding import *
+# Manually advanced clock so the window tests don't sleep and don't depend on
+# where in the current second they happen to start
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import VirtualClock
+
 
 class TestRateLimiters(unittest.TestCase):
 
     def test_fixed_window_rate_limiter(self):
-        limiter = FixedWindowRateLimiter(max_requests=3, window_size=1)
+        clock = VirtualClock(1000.0)
+        limiter = FixedWindowRateLimiter(max_requests=3, window_size=1, clock=clock)
         client_id = 'client_test'
 
         # Initially allow 3 requests
@@ -17,13 +22,14 @@ class TestRateLimiters(unittest.TestCase):
         self.assertFalse(limiter.allow_request(client_id))
 
         # Wait for window reset
-        time.sleep(1.1)
+        clock.advance(1.1)
 
         # Requests should be allowed again after window reset
         self.assertTrue(limiter.allow_request(client_id))
 
     def test_sliding_window_rate_limiter(self):
-        limiter = SlidingWindowRateLimiter(max_requests=3, window_size=1)
+        clock = VirtualClock(1000.0)
+        limiter = SlidingWindowRateLimiter(max_requests=3, window_size=1, clock=clock)
         client_id = 'client_test_sliding'
 
         # Initially allow 3 requests
@@ -35,7 +41,7 @@ class TestRateLimiters(unittest.TestCase):
         self.assertFalse(limiter.allow_request(client_id))
 
         # After some requests slide out of the window, allow new requests
-        time.sleep(1.1)
+        clock.advance(1.1)
 
         self.assertTrue(limiter.allow_request(client_id))
         self.assertTrue(limiter.allow_request(client_id))
@@ -9,17 +9,29 @@ class RateLimiter(ABC):
     def allow_request(self, client_id: str) -> bool:
         pass
 
+# Manually advanced clock; pass it as `clock` to replay traffic without sleeping
+class VirtualClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
 # 1. Fixed Window Rate Limiter
 class FixedWindowRateLimiter(RateLimiter):
-    def __init__(self, max_requests: int, window_size: int):
+    def __init__(self, max_requests: int, window_size: int, clock=time.time):
         self.max_requests = max_requests
         self.window_size = window_size
         self.request_counts = {}
         self.window_start_times = {}
+        self.clock = clock
         self.lock = Lock()
 
     def allow_request(self, client_id: str) -> bool:
-        current_time = int(time.time())
+        current_time = int(self.clock())
         with self.lock:
             self.window_start_times.setdefault(client_id, current_time) # sets to default value if key doesn't exist
             self.request_counts.setdefault(client_id, 0)
@@ -36,14 +48,15 @@ class FixedWindowRateLimiter(RateLimiter):
 
 # 2. Sliding Window Log Rate Limiter
 class SlidingWindowRateLimiter(RateLimiter):
-    def __init__(self, max_requests: int, window_size: int):
+    def __init__(self, max_requests: int, window_size: int, clock=time.time):
         self.max_requests = max_requests
         self.window_size = window_size
         self.request_timestamps = {}
+        self.clock = clock
         self.lock = Lock()
 
     def allow_request(self, client_id: str) -> bool:
-        current_time = int(time.time())
+        current_time = int(self.clock())
         with self.lock:
             self.request_timestamps.setdefault(client_id, deque())
 
@@ -58,14 +71,15 @@ class SlidingWindowRateLimiter(RateLimiter):
 
 # 3. Sliding Window Counter Rate Limiter
 class SlidingWindowCounterRateLimiter(RateLimiter):
-    def __init__(self, max_requests: int, window_size: int):
+    def __init__(self, max_requests: int, window_size: int, clock=time.time):
         self.max_requests = max_requests
         self.window_size = window_size
         self.counters = {}
+        self.clock = clock
         self.lock = Lock()
 
     def allow_request(self, client_id: str) -> bool:
-        current_time = int(time.time())
+        current_time = int(self.clock())
         current_window = current_time // self.window_size
 
         with self.lock:
@@ -88,16 +102,17 @@ class SlidingWindowCounterRateLimiter(RateLimiter):
 
 # 4. Leaky Bucket Rate Limiter
 class LeakyBucketRateLimiter(RateLimiter):
-    def __init__(self, capacity, leak_rate):
+    def __init__(self, capacity, leak_rate, clock=time.time):
         self.capacity = capacity
         self.leak_rate = leak_rate
         self.water = 0
-        self.last_time = time.time()
+        self.clock = clock
+        self.last_time = clock()
         self.lock = Lock()
 
     def allow_request(self, client_id: str) -> bool:
         with self.lock:
-            now = time.time()
+            now = self.clock()
             elapsed = now - self.last_time
             self.last_time = now
             leaked = elapsed * self.leak_rate
@@ -109,16 +124,17 @@ class LeakyBucketRateLimiter(RateLimiter):
 
 # 5. Token Bucket Rate Limiter
 class TokenBucketRateLimiter(RateLimiter):
-    def __init__(self, rate, capacity):
+    def __init__(self, rate, capacity, clock=time.time):
         self.rate = rate
         self.capacity = capacity
         self.tokens = capacity
-        self.last_time = time.time()
+        self.clock = clock
+        self.last_time = clock()
         self.lock = Lock()
 
     def allow_request(self, client_id: str) -> bool:
         with self.lock:
-            now = time.time()
+            now = self.clock()
             elapsed = now - self.last_time
             self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
             self.last_time = now
@@ -130,17 +146,26 @@ class TokenBucketRateLimiter(RateLimiter):
 # Factory Pattern
 class RateLimiterFactory:
     @staticmethod
-    def create_rate_limiter(type: str, max_requests: int, window_size: int) -> RateLimiter:
+    def create_rate_limiter(type: str, max_requests: int, window_size: int, backend=None,
+                            clock=None) -> RateLimiter:
+        # A backend (e.g. SharedMemoryBackend) keeps the limiter state outside this process
+        # and reads its own clock, so give a virtual clock to the backend instead
+        if backend is not None:
+            if clock is not None:
+                raise ValueError("clock cannot be combined with a backend; pass it to the backend")
+            return backend.create_rate_limiter(type, max_requests, window_size)
+        if clock is None:
+            clock = time.time
         if type == "fixed":
-            return FixedWindowRateLimiter(max_requests, window_size)
+            return FixedWindowRateLimiter(max_requests, window_size, clock)
         elif type == "sliding":
-            return SlidingWindowRateLimiter(max_requests, window_size)
+            return SlidingWindowRateLimiter(max_requests, window_size, clock)
         elif type == "sliding_counter":
-            return SlidingWindowCounterRateLimiter(max_requests, window_size)
+            return SlidingWindowCounterRateLimiter(max_requests, window_size, clock)
         elif type == "leaky":
-            return LeakyBucketRateLimiter(max_requests, window_size)
+            return LeakyBucketRateLimiter(max_requests, window_size, clock)
         elif type == "token":
-            return TokenBucketRateLimiter(max_requests, window_size)
+            return TokenBucketRateLimiter(max_requests, window_size, clock)
         else:
             raise ValueError("Unknown rate limiter type")
 
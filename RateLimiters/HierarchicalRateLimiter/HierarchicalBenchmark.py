@@ -0,0 +1,71 @@
+'''
+    Benchmark: user -> tenant -> global limits as one HierarchicalRateLimiter
+    versus chaining three limiters from FixedSlidingWithThreading.
+    Reports decisions/sec and how many units of quota the chain burned on
+    earlier tiers for requests that a later tier then rejected.
+
+    python -m RateLimiters.HierarchicalRateLimiter.HierarchicalBenchmark [decisions]
+'''
+import random
+import sys
+import time
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import (
+    FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+)
+from RateLimiters.HierarchicalRateLimiter.HierarchicalRateLimiter import (
+    HierarchicalRateLimiter, FixedWindowTier
+)
+
+USERS, TENANTS = 10_000, 100
+USER_LIMIT, TENANT_LIMIT, GLOBAL_LIMIT = 20, 1_000, 60_000
+
+
+def tenant_of(user):
+    return f"tenant_{int(user[5:]) % TENANTS}"
+
+
+def run_chained(users):
+    user_limiter = FixedWindowRateLimiter(USER_LIMIT, 3600)
+    tenant_limiter = FixedWindowRateLimiter(TENANT_LIMIT, 3600)
+    global_limiter = SlidingWindowCounterRateLimiter(GLOBAL_LIMIT, 3600)
+    admitted = burned = 0
+    start = time.perf_counter()
+    for user in users:
+        passed = 0
+        for limiter, key in ((user_limiter, user), (tenant_limiter, tenant_of(user)), (global_limiter, "global")):
+            if not limiter.allow_request(key):
+                break
+            passed += 1
+        if passed == 3:
+            admitted += 1
+        else:
+            burned += passed  # quota already taken by the tiers that said yes
+    return time.perf_counter() - start, admitted, burned
+
+
+def run_hierarchical(users):
+    limiter = HierarchicalRateLimiter([
+        FixedWindowTier("user", USER_LIMIT, 3600),
+        FixedWindowTier("tenant", TENANT_LIMIT, 3600, key_func=tenant_of),
+        FixedWindowTier("global", GLOBAL_LIMIT, 3600, key_func=lambda _: "global"),
+    ])
+    admitted = 0
+    start = time.perf_counter()
+    for user in users:
+        admitted += limiter.allow_request(user)
+    return time.perf_counter() - start, admitted, 0
+
+
+def main():
+    decisions = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    rng = random.Random(7)
+    users = [f"user_{rng.randrange(USERS)}" for _ in range(decisions)]
+    for name, run in (("chained x3", run_chained), ("hierarchical", run_hierarchical)):
+        elapsed, admitted, burned = run(users)
+        print(f"{name:>13}: {decisions / elapsed:>10,.0f} decisions/s, admitted {admitted}, "
+              f"quota burned by rejected requests {burned}")
+
+
+if __name__ == "__main__":
+    main()
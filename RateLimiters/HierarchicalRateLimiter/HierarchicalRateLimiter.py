@@ -0,0 +1,122 @@
+from abc import ABC, abstractmethod
+import time
+from collections import deque
+from threading import Lock
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiter
+
+# --- Tiers ---
+# A tier is one limit in the chain. check() finds (or creates) the state for
+# a key and returns it if the tier would admit the request, None otherwise;
+# consume() charges the request to that state. Splitting the two lets the
+# composite limiter charge every tier or none of them.
+
+class Tier(ABC):
+    def __init__(self, name: str, key_func=None):
+        self.name = name
+        self.key_func = key_func  # client_id -> tier key; None keys the tier by client_id
+
+    @abstractmethod
+    def check(self, key: str, now: float):
+        pass
+
+    @abstractmethod
+    def consume(self, state, now: float):
+        pass
+
+
+class FixedWindowTier(Tier):
+    def __init__(self, name: str, max_requests: int, window_size: int, key_func=None):
+        super().__init__(name, key_func)
+        self.max_requests = max_requests
+        self.window_size = window_size
+        self.windows = {}  # key -> [window_start, count]
+
+    def check(self, key, now):
+        current_time = int(now)
+        state = self.windows.get(key)
+        if state is None or current_time - state[0] >= self.window_size:
+            state = self.windows[key] = [current_time, 0]
+        return state if state[1] < self.max_requests else None
+
+    def consume(self, state, now):
+        state[1] += 1
+
+
+class SlidingWindowTier(Tier):
+    def __init__(self, name: str, max_requests: int, window_size: int, key_func=None):
+        super().__init__(name, key_func)
+        self.max_requests = max_requests
+        self.window_size = window_size
+        self.request_timestamps = {}
+
+    def check(self, key, now):
+        current_time = int(now)
+        timestamps = self.request_timestamps.setdefault(key, deque())
+        while timestamps and current_time - timestamps[0] >= self.window_size:
+            timestamps.popleft()
+        return timestamps if len(timestamps) < self.max_requests else None
+
+    def consume(self, state, now):
+        state.append(int(now))
+
+
+class TokenBucketTier(Tier):
+    def __init__(self, name: str, rate, capacity, key_func=None):
+        super().__init__(name, key_func)
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}  # key -> [tokens, last_time]
+
+    def check(self, key, now):
+        state = self.buckets.get(key)
+        if state is None:
+            state = self.buckets[key] = [self.capacity, now]
+        if now > state[1]:  # a clock that steps back must not credit the same interval twice
+            state[0] = min(self.capacity, state[0] + (now - state[1]) * self.rate)
+            state[1] = now
+        return state if state[0] >= 1 else None
+
+    def consume(self, state, now):
+        state[0] -= 1
+
+# --- Composite Limiter ---
+
+# Evaluates a chain of tiers (e.g. user -> tenant -> global) under one lock
+# with one clock read, and charges the request to every tier only if all of
+# them admit it; a rejection by any tier leaves the other tiers untouched.
+class HierarchicalRateLimiter(RateLimiter):
+    def __init__(self, tiers: list, clock=time.time):
+        self.tiers = tiers
+        self.clock = clock
+        self.lock = Lock()
+
+    def evaluate(self, client_id: str):
+        """Returns (allowed, name of the rejecting tier or None)"""
+        with self.lock:
+            # Read inside the lock so tiers see timestamps in order
+            now = self.clock()
+            charged = []
+            for tier in self.tiers:
+                key_func = tier.key_func
+                state = tier.check(client_id if key_func is None else key_func(client_id), now)
+                if state is None:
+                    return False, tier.name
+                charged.append((tier, state))
+            for tier, state in charged:
+                tier.consume(state, now)
+            return True, None
+
+    def allow_request(self, client_id: str) -> bool:
+        return self.evaluate(client_id)[0]
+
+
+if __name__ == "__main__":
+    tenant_of = {"alice": "acme", "bob": "acme", "carol": "globex"}
+    limiter = HierarchicalRateLimiter([
+        FixedWindowTier("user", 3, 60),
+        FixedWindowTier("tenant", 4, 60, key_func=tenant_of.get),
+        TokenBucketTier("global", rate=1, capacity=6, key_func=lambda _: "global"),
+    ])
+    for user in ["alice"] * 4 + ["bob"] * 2 + ["carol"] * 3:
+        print(user, limiter.evaluate(user))
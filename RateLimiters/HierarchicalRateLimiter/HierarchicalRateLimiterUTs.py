@@ -0,0 +1,56 @@
+import unittest
+
+from RateLimiters.HierarchicalRateLimiter.HierarchicalRateLimiter import (
+    HierarchicalRateLimiter, FixedWindowTier, SlidingWindowTier, TokenBucketTier
+)
+
+
+class TestHierarchicalRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.tenant_of = {"alice": "acme", "bob": "acme", "carol": "globex"}
+        self.user = FixedWindowTier("user", 2, 60)
+        self.tenant = SlidingWindowTier("tenant", 3, 60, key_func=self.tenant_of.get)
+        self.glob = TokenBucketTier("global", rate=0.001, capacity=4, key_func=lambda _: "global")
+        self.limiter = HierarchicalRateLimiter([self.user, self.tenant, self.glob])
+
+    def test_each_tier_can_reject(self):
+        self.assertEqual(self.limiter.evaluate("alice"), (True, None))
+        self.assertEqual(self.limiter.evaluate("alice"), (True, None))
+        self.assertEqual(self.limiter.evaluate("alice"), (False, "user"))
+        self.assertEqual(self.limiter.evaluate("bob"), (True, None))
+        self.assertEqual(self.limiter.evaluate("bob"), (False, "tenant"))
+        self.assertEqual(self.limiter.evaluate("carol"), (True, None))
+        self.assertEqual(self.limiter.evaluate("carol"), (False, "global"))
+
+    def test_rejection_consumes_nothing(self):
+        exhausted = TokenBucketTier("global", rate=0, capacity=0, key_func=lambda _: "global")
+        limiter = HierarchicalRateLimiter([self.user, self.tenant, exhausted])
+        for _ in range(5):
+            self.assertEqual(limiter.evaluate("alice"), (False, "global"))
+        # Neither the user window nor the tenant log was charged
+        self.assertEqual(self.user.windows["alice"][1], 0)
+        self.assertEqual(len(self.tenant.request_timestamps["acme"]), 0)
+
+    def test_clock_is_read_under_the_lock(self):
+        held = []
+
+        def clock():
+            held.append(limiter.lock.locked())
+            return 0.0
+        limiter = HierarchicalRateLimiter([self.user], clock=clock)
+        limiter.evaluate("alice")
+        self.assertEqual(held, [True])
+
+    def test_token_bucket_ignores_a_clock_stepping_back(self):
+        bucket = TokenBucketTier("global", rate=1, capacity=10, key_func=lambda _: "global")
+        times = iter([100.0, 100.0, 90.0, 100.0])
+        limiter = HierarchicalRateLimiter([bucket], clock=lambda: next(times))
+        for _ in range(4):
+            limiter.evaluate("alice")
+        # No refill: the 90..100 interval was never credited
+        self.assertEqual(bucket.buckets["global"], [6, 100.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
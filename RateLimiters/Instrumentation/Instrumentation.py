@@ -0,0 +1,178 @@
+from bisect import bisect_left
+from threading import Lock
+import time
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiter
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2, 1e-1)
+
+# Per-client state dicts of the limiters, checked in this order for tracked-client counts
+_CLIENT_STATE = ("request_counts", "request_timestamps", "counters", "buckets")
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        # Cumulative, like Prometheus' le buckets
+        cumulative, total = [], 0
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return {"buckets": list(zip(self.buckets + (float("inf"),), cumulative)),
+                "sum": self.sum, "count": total}
+
+
+def tracked_clients(limiter):
+    """Number of clients a limiter holds state for, or None if it keeps one shared bucket"""
+    for attr in _CLIENT_STATE:
+        state = getattr(limiter, attr, None)
+        if isinstance(state, dict):
+            return len(state)
+    return None
+
+
+class LimiterMetrics:
+    def __init__(self, algorithm: str, limiter: RateLimiter, name: str = None):
+        self.algorithm = algorithm
+        self.name = algorithm if name is None else name
+        self.limiter = limiter
+        self.allowed = 0
+        self.denied = 0
+        self.latency = Histogram()
+        self.lock_wait = Histogram()
+        self.lock = Lock()  # guards the counters above, never the limiter itself
+
+    def record(self, allowed: bool, latency: float):
+        with self.lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.denied += 1
+            self.latency.observe(latency)
+
+    def record_lock_wait(self, wait: float):
+        with self.lock:
+            self.lock_wait.observe(wait)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            snapshot = {
+                "name": self.name,
+                "algorithm": self.algorithm,
+                "allowed": self.allowed,
+                "denied": self.denied,
+                "decision_latency": self.latency.snapshot(),
+                "lock_wait": self.lock_wait.snapshot(),
+            }
+        snapshot["tracked_clients"] = tracked_clients(self.limiter)
+        return snapshot
+
+
+# Stands in for a limiter's own Lock and times how long acquiring it takes.
+# The wait goes into the metrics under their own lock, the one snapshot() reads under.
+class TimedLock:
+    def __init__(self, lock, metrics: LimiterMetrics):
+        self.inner = lock
+        self.metrics = metrics
+
+    def __enter__(self):
+        start = time.perf_counter()
+        self.inner.acquire()
+        self.metrics.record_lock_wait(time.perf_counter() - start)
+        return self
+
+    def __exit__(self, *exc):
+        self.inner.release()
+        return False
+
+
+# Note: wrapping a limiter that has a `lock` replaces limiter.lock with a TimedLock
+# around it, since the wait can only be timed from inside the limiter. The limiter
+# still works if called directly, but those calls count towards lock_wait too.
+class InstrumentedRateLimiter(RateLimiter):
+    def __init__(self, limiter: RateLimiter, metrics: LimiterMetrics):
+        self.limiter = limiter
+        self.metrics = metrics
+        if hasattr(limiter, "lock"):
+            limiter.lock = TimedLock(limiter.lock, metrics)
+
+    def allow_request(self, client_id: str) -> bool:
+        perf_counter = time.perf_counter
+        start = perf_counter()
+        allowed = self.limiter.allow_request(client_id)
+        self.metrics.record(allowed, perf_counter() - start)
+        return allowed
+
+
+def _label(value) -> str:
+    # Prometheus text format: backslash, double quote and newline are escaped in label values
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Pull-style registry: instrument() limiters, then scrape snapshot() or to_prometheus().
+# Every limiter is exported under its own `limiter` label: its name, which defaults
+# to the algorithm and must be unique in the registry.
+# A disabled registry hands back the limiter itself, so it costs nothing per decision.
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.metrics = []
+
+    def instrument(self, limiter: RateLimiter, algorithm: str, name: str = None) -> RateLimiter:
+        if not self.enabled:
+            return limiter
+        metrics = LimiterMetrics(algorithm, limiter, name)
+        if any(m.name == metrics.name for m in self.metrics):
+            raise ValueError(f"A limiter named {metrics.name!r} is already instrumented; pass a unique name")
+        self.metrics.append(metrics)
+        return InstrumentedRateLimiter(limiter, metrics)
+
+    def snapshot(self) -> list:
+        return [metrics.snapshot() for metrics in self.metrics]
+
+    def to_prometheus(self) -> str:
+        snapshots = self.snapshot()
+        lines = ["# HELP ratelimiter_decisions_total Rate limiter decisions by result",
+                 "# TYPE ratelimiter_decisions_total counter"]
+        labels = [f'limiter="{_label(s["name"])}",algorithm="{_label(s["algorithm"])}"' for s in snapshots]
+        for s, label in zip(snapshots, labels):
+            lines.append(f'ratelimiter_decisions_total{{{label},result="allowed"}} {s["allowed"]}')
+            lines.append(f'ratelimiter_decisions_total{{{label},result="denied"}} {s["denied"]}')
+        for name, key, help_text in (
+            ("ratelimiter_decision_latency_seconds", "decision_latency", "Time spent in allow_request"),
+            ("ratelimiter_lock_wait_seconds", "lock_wait", "Time spent waiting for the limiter lock"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for s, label in zip(snapshots, labels):
+                histogram = s[key]
+                for bound, count in histogram["buckets"]:
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{label},le="{le}"}} {count}')
+                lines.append(f"{name}_sum{{{label}}} {histogram['sum']}")
+                lines.append(f"{name}_count{{{label}}} {histogram['count']}")
+        lines.append("# HELP ratelimiter_tracked_clients Clients the limiter holds state for")
+        lines.append("# TYPE ratelimiter_tracked_clients gauge")
+        for s, label in zip(snapshots, labels):
+            if s["tracked_clients"] is not None:
+                lines.append(f'ratelimiter_tracked_clients{{{label}}} {s["tracked_clients"]}')
+        return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiterFactory
+
+    registry = MetricsRegistry()
+    limiter = registry.instrument(RateLimiterFactory.create_rate_limiter("fixed", 3, 60), "fixed")
+    for client in ["alice"] * 4 + ["bob"]:
+        limiter.allow_request(client)
+    print(registry.to_prometheus())
@@ -0,0 +1,43 @@
+'''
+    Benchmark: cost of instrumentation per decision. Compares a bare limiter,
+    the same limiter passed through a disabled MetricsRegistry (which must
+    be the very same object, hence the same speed) and an instrumented one.
+
+    python -m RateLimiters.Instrumentation.InstrumentationBenchmark [decisions]
+'''
+import sys
+import time
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiterFactory
+from RateLimiters.Instrumentation.Instrumentation import MetricsRegistry
+
+ALGORITHMS = ["fixed", "sliding", "sliding_counter", "leaky", "token"]
+
+
+def ns_per_decision(limiter, clients, rounds=3):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for client_id in clients:
+            limiter.allow_request(client_id)
+        best = min(best, (time.perf_counter_ns() - start) / len(clients))
+    return best
+
+
+def main():
+    decisions = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    clients = [f"client_{i % 1000}" for i in range(decisions // 3)]
+    print(f"{'algorithm':>16} {'bare ns':>8} {'disabled ns':>12} {'enabled ns':>11}")
+    for name in ALGORITHMS:
+        # Generous limits so every algorithm does its full allow path
+        bare = RateLimiterFactory.create_rate_limiter(name, 10**9, 60)
+        disabled = MetricsRegistry(enabled=False).instrument(
+            RateLimiterFactory.create_rate_limiter(name, 10**9, 60), name)
+        enabled = MetricsRegistry().instrument(RateLimiterFactory.create_rate_limiter(name, 10**9, 60), name)
+        assert type(disabled) is type(bare)
+        timings = [ns_per_decision(limiter, clients) for limiter in (bare, disabled, enabled)]
+        print(f"{name:>16} {timings[0]:>8.0f} {timings[1]:>12.0f} {timings[2]:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import threading
+import unittest
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import (
+    RateLimiterFactory, VirtualClock
+)
+from RateLimiters.Instrumentation.Instrumentation import MetricsRegistry, InstrumentedRateLimiter, Histogram
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock(1000.0)
+        self.registry = MetricsRegistry()
+
+    def test_disabled_registry_returns_the_limiter_itself(self):
+        limiter = RateLimiterFactory.create_rate_limiter("fixed", 3, 60, clock=self.clock)
+        lock = limiter.lock
+        self.assertIs(MetricsRegistry(enabled=False).instrument(limiter, "fixed"), limiter)
+        self.assertIs(limiter.lock, lock)
+
+    def test_counts_decisions_and_clients(self):
+        limiter = self.registry.instrument(
+            RateLimiterFactory.create_rate_limiter("fixed", 2, 60, clock=self.clock), "fixed")
+        self.assertIsInstance(limiter, InstrumentedRateLimiter)
+        results = [limiter.allow_request(c) for c in ("a", "a", "a", "b")]
+        self.assertEqual(results, [True, True, False, True])
+        snapshot = self.registry.snapshot()[0]
+        self.assertEqual((snapshot["allowed"], snapshot["denied"]), (3, 1))
+        self.assertEqual(snapshot["tracked_clients"], 2)
+        self.assertEqual(snapshot["decision_latency"]["count"], 4)
+        self.assertEqual(snapshot["lock_wait"]["count"], 4)
+
+    def test_shared_bucket_has_no_client_count(self):
+        limiter = self.registry.instrument(
+            RateLimiterFactory.create_rate_limiter("token", 1, 5, clock=self.clock), "token")
+        limiter.allow_request("a")
+        self.assertIsNone(self.registry.snapshot()[0]["tracked_clients"])
+        self.assertNotIn("ratelimiter_tracked_clients{", self.registry.to_prometheus())
+
+    def test_counters_are_exact_under_threads(self):
+        limiter = self.registry.instrument(
+            RateLimiterFactory.create_rate_limiter("sliding_counter", 1000, 60, clock=self.clock), "sliding_counter")
+        threads = [threading.Thread(target=lambda: [limiter.allow_request("a") for _ in range(500)])
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        snapshot = self.registry.snapshot()[0]
+        self.assertEqual((snapshot["allowed"], snapshot["denied"]), (1000, 1000))
+
+    def test_histogram_is_cumulative(self):
+        histogram = Histogram(buckets=(1.0, 2.0))
+        for value in (0.5, 1.5, 1.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.snapshot()["buckets"], [(1.0, 1), (2.0, 3), (float("inf"), 4)])
+
+    def test_prometheus_text(self):
+        limiter = self.registry.instrument(
+            RateLimiterFactory.create_rate_limiter("sliding", 1, 60, clock=self.clock), "sliding")
+        limiter.allow_request("a")
+        limiter.allow_request("a")
+        text = self.registry.to_prometheus()
+        labels = 'limiter="sliding",algorithm="sliding"'
+        self.assertIn(f'ratelimiter_decisions_total{{{labels},result="allowed"}} 1', text)
+        self.assertIn(f'ratelimiter_decisions_total{{{labels},result="denied"}} 1', text)
+        self.assertIn(f'ratelimiter_decision_latency_seconds_bucket{{{labels},le="+Inf"}} 2', text)
+        self.assertIn(f'ratelimiter_lock_wait_seconds_count{{{labels}}} 2', text)
+        self.assertIn(f'ratelimiter_tracked_clients{{{labels}}} 1', text)
+
+    def test_each_limiter_gets_its_own_series(self):
+        for name in ("api", 'a\\b "c"\nd'):
+            limiter = self.registry.instrument(
+                RateLimiterFactory.create_rate_limiter("fixed", 1, 60, clock=self.clock), "fixed", name=name)
+            limiter.allow_request("a")
+        text = self.registry.to_prometheus()
+        self.assertIn('ratelimiter_decisions_total{limiter="api",algorithm="fixed",result="allowed"} 1', text)
+        self.assertIn('ratelimiter_decisions_total{limiter="a\\\\b \\"c\\"\\nd",algorithm="fixed",result="allowed"} 1', text)
+        series = [line.rsplit(" ", 1)[0] for line in text.splitlines() if not line.startswith("#")]
+        self.assertEqual(len(series), len(set(series)))
+        with self.assertRaises(ValueError):
+            self.registry.instrument(RateLimiterFactory.create_rate_limiter("fixed", 1, 60), "fixed", name="api")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,20 +5,22 @@ import time
 from threading import Lock
 
 class LeakyBucketWithCredits:
-    def __init__(self, capacity, leak_rate):
+    def __init__(self, capacity, leak_rate, clock=time.time):
         """
         :param capacity: Maximum number of request credits
         :param leak_rate: Number of credits restored per second
+        :param clock: Time source in seconds, e.g. a VirtualClock in tests
         """
         self.capacity = capacity
         self.leak_rate = leak_rate
         self.credits = capacity  # Start with full credits
-        self.last_time = time.time()
+        self.clock = clock
+        self.last_time = clock()
         self.lock = Lock()
 
     def allow_request(self):
         with self.lock:
-            now = time.time()
+            now = self.clock()
             elapsed = now - self.last_time
             # Refill credits based on elapsed time
             restored = elapsed * self.leak_rate
@@ -31,16 +33,17 @@ class LeakyBucketWithCredits:
             return False
 
 class LeakyBucket:
-    def __init__(self, capacity, leak_rate):
+    def __init__(self, capacity, leak_rate, clock=time.time):
         self.capacity = capacity          # Max water level (max requests bucket can hold)
         self.leak_rate = leak_rate        # Requests removed (leaked) per second
         self.water = 0                    # Current water level (pending requests)
-        self.last_time = time.time()      # Last time leakage was calculated
+        self.clock = clock                # Time source in seconds
+        self.last_time = clock()          # Last time leakage was calculated
         self.lock = Lock()                # Thread-safety for concurrent access
 
     def allow_request(self):
         with self.lock:
-            now = time.time()
+            now = self.clock()
             elapsed = now - self.last_time  # Time passed since last check
             self.last_time = now
             leaked = elapsed * self.leak_rate
@@ -0,0 +1,352 @@
+from abc import ABC, abstractmethod
+from collections import deque
+import json
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiter
+
+# --- Scripts ---
+# Server-side scripts, the equivalent of Redis EVALSHA: each one runs
+# atomically against the store's data with the store's clock, so every
+# gateway node sees the same state and the same time.
+
+def _fixed_window(data, now, key, max_requests, window_size):
+    current_time = int(now)
+    state = data.get(key)
+    if state is None or current_time - state[0] >= window_size:
+        state = data[key] = [current_time, 0]
+    if state[1] < max_requests:
+        state[1] += 1
+        return True
+    return False
+
+def _sliding_log(data, now, key, max_requests, window_size):
+    current_time = int(now)
+    timestamps = data.setdefault(key, deque())
+    while timestamps and current_time - timestamps[0] >= window_size:
+        timestamps.popleft()
+    if len(timestamps) < max_requests:
+        timestamps.append(current_time)
+        return True
+    return False
+
+def _sliding_counter(data, now, key, max_requests, window_size):
+    current_window = int(now) // window_size
+    state = data.get(key)
+    if state is None or state[0] != current_window:
+        state = data[key] = [current_window, 0]
+    if state[1] < max_requests:
+        state[1] += 1
+        return True
+    return False
+
+def _leaky_bucket(data, now, key, capacity, leak_rate):
+    state = data.setdefault(key, [0, now])
+    state[0] = max(0, state[0] - (now - state[1]) * leak_rate)
+    state[1] = now
+    if state[0] < capacity:
+        state[0] += 1
+        return True
+    return False
+
+def _token_lease(data, now, key, rate, capacity, wanted):
+    # Takes up to `wanted` whole tokens in one go; returns how many were granted
+    state = data.setdefault(key, [capacity, now])
+    state[0] = min(capacity, state[0] + (now - state[1]) * rate)
+    state[1] = now
+    granted = min(wanted, int(state[0]))
+    state[0] -= granted
+    return granted
+
+def _token_bucket(data, now, key, rate, capacity):
+    return _token_lease(data, now, key, rate, capacity, 1) == 1
+
+SCRIPTS = {
+    "fixed_window": _fixed_window,
+    "sliding_log": _sliding_log,
+    "sliding_counter": _sliding_counter,
+    "leaky_bucket": _leaky_bucket,
+    "token_bucket": _token_bucket,
+    "token_lease": _token_lease,
+}
+
+# --- Store Interface ---
+
+class KeyValueStore(ABC):
+    @abstractmethod
+    def execute(self, commands: list) -> list:
+        """Runs [(script, key, *args), ...] in one round-trip, returns the results in order"""
+        pass
+
+    def eval(self, script: str, key: str, *args):
+        return self.execute([(script, key, *args)])[0]
+
+    def pipeline(self):
+        return Pipeline(self)
+
+
+class Pipeline:
+    def __init__(self, store: KeyValueStore):
+        self.store = store
+        self.commands = []
+
+    def eval(self, script: str, key: str, *args):
+        self.commands.append((script, key, *args))
+        return self
+
+    def execute(self) -> list:
+        commands, self.commands = self.commands, []
+        return self.store.execute(commands) if commands else []
+
+
+# Local store; also the engine behind StoreServer
+class InMemoryStore(KeyValueStore):
+    def __init__(self, clock=time.time):
+        self.data = {}
+        self.clock = clock
+        self.lock = threading.Lock()
+
+    def execute(self, commands: list) -> list:
+        with self.lock:
+            now = self.clock()
+            return [SCRIPTS[script](self.data, now, key, *args) for script, key, *args in commands]
+
+# --- Wire Protocol ---
+# Frame = 4-byte big-endian length + JSON body.
+# Request body: [[script, key, *args], ...]   Response body: [result, ...]
+
+_LENGTH = struct.Struct(">I")
+
+def _send_frame(sock, payload):
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    sock.sendall(_LENGTH.pack(len(body)) + body)
+
+def _recv_exactly(sock, size):
+    chunks = bytearray()
+    while len(chunks) < size:
+        chunk = sock.recv(size - len(chunks))
+        if not chunk:
+            raise ConnectionError("store connection closed")
+        chunks += chunk
+    return bytes(chunks)
+
+def _recv_frame(sock):
+    (size,) = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+    return json.loads(_recv_exactly(sock, size))
+
+
+class _StoreRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                commands = _recv_frame(self.request)
+                _send_frame(self.request, self.server.store.execute(commands))
+        except ConnectionError:   # the client hung up, possibly before reading its reply
+            return
+
+
+# In-process stand-in for the external store, speaking the same protocol
+class StoreServer:
+    def __init__(self, host="127.0.0.1", port=0, store: InMemoryStore = None):
+        self.store = store or InMemoryStore()
+        self.server = socketserver.ThreadingTCPServer((host, port), _StoreRequestHandler)
+        self.server.daemon_threads = True
+        self.server.store = self.store
+        self.address = self.server.server_address
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.address
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ConnectionPool:
+    def __init__(self, address, max_connections=8, timeout=5.0):
+        self.address = address
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(max_connections)
+
+    def acquire(self):
+        self.slots.acquire()
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            try:
+                sock = socket.create_connection(self.address, timeout=self.timeout)
+            except OSError:
+                self.slots.release()
+                raise
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return sock
+
+    def release(self, sock, broken=False):
+        if broken:
+            sock.close()
+        else:
+            self.idle.put(sock)
+        self.slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# Client for StoreServer (or any server speaking the same framing)
+class RemoteStore(KeyValueStore):
+    _recv = staticmethod(_recv_frame)   # per-client hook: tests break one client's replies, not the server's
+
+    def __init__(self, address, max_connections=8):
+        self.pool = ConnectionPool(address, max_connections)
+        self.round_trips = 0
+
+    def execute(self, commands: list) -> list:
+        sock = self.pool.acquire()
+        broken = True   # on any error the stream may be mid-frame: close the socket, don't reuse it
+        try:
+            _send_frame(sock, commands)
+            results = self._recv(sock)
+            broken = False
+        finally:
+            self.pool.release(sock, broken=broken)
+        self.round_trips += 1
+        return results
+
+    def close(self):
+        self.pool.close()
+
+# --- Rate Limiters ---
+# One scripted eval, i.e. at most one round-trip, per decision. allow_requests
+# pipelines a whole batch of decisions into a single round-trip.
+
+class StoreRateLimiter(RateLimiter):
+    script = None
+
+    def __init__(self, store: KeyValueStore, namespace: str, *params):
+        self.store = store
+        self.namespace = namespace
+        self.params = params
+
+    def _key(self, client_id):
+        return f"{self.namespace}:{client_id}"
+
+    def allow_request(self, client_id: str) -> bool:
+        return self.store.eval(self.script, self._key(client_id), *self.params)
+
+    def allow_requests(self, client_ids: list) -> list:
+        pipe = self.store.pipeline()
+        for client_id in client_ids:
+            pipe.eval(self.script, self._key(client_id), *self.params)
+        return pipe.execute()
+
+
+class StoreFixedWindowRateLimiter(StoreRateLimiter):
+    script = "fixed_window"
+
+
+class StoreSlidingWindowRateLimiter(StoreRateLimiter):
+    script = "sliding_log"
+
+
+class StoreSlidingWindowCounterRateLimiter(StoreRateLimiter):
+    script = "sliding_counter"
+
+
+# Token/leaky buckets keep one bucket shared by all clients, like the in-process versions
+class StoreLeakyBucketRateLimiter(StoreRateLimiter):
+    script = "leaky_bucket"
+
+    def _key(self, client_id):
+        return self.namespace
+
+
+class StoreTokenBucketRateLimiter(StoreRateLimiter):
+    script = "token_bucket"
+
+    def _key(self, client_id):
+        return self.namespace
+
+
+# Token bucket that pre-allocates a lease of tokens from the store and spends
+# it locally, so a node makes about one round-trip per `lease_size` decisions.
+# Leased tokens unused after `lease_ttl` seconds are dropped rather than
+# returned, which bounds how stale a node's share of the limit can get.
+class LeasedTokenBucketRateLimiter(RateLimiter):
+    def __init__(self, store: KeyValueStore, namespace: str, rate, capacity, lease_size=10, lease_ttl=1.0,
+                 clock=time.monotonic):
+        self.store = store
+        self.namespace = namespace
+        self.rate = rate
+        self.capacity = capacity
+        self.lease_size = lease_size
+        self.lease_ttl = lease_ttl
+        self.leased = 0
+        self.lease_expiry = 0.0
+        self.clock = clock
+        self.lock = threading.Lock()
+
+    def allow_request(self, client_id: str) -> bool:
+        with self.lock:
+            now = self.clock()
+            if self.leased == 0 or now >= self.lease_expiry:
+                self.leased = self.store.eval("token_lease", self.namespace,
+                                              self.rate, self.capacity, self.lease_size)
+                self.lease_expiry = now + self.lease_ttl
+            if self.leased > 0:
+                self.leased -= 1
+                return True
+            return False
+
+
+# Backend for RateLimiterFactory, shared by every gateway node pointing at the same store
+class RemoteStoreBackend:
+    def __init__(self, store: KeyValueStore, lease_size=None):
+        self.store = store
+        self.lease_size = lease_size
+
+    def create_rate_limiter(self, type: str, max_requests: int, window_size: int) -> RateLimiter:
+        namespace = f"{type}:{max_requests}:{window_size}"
+        if type == "fixed":
+            return StoreFixedWindowRateLimiter(self.store, namespace, max_requests, window_size)
+        elif type == "sliding":
+            return StoreSlidingWindowRateLimiter(self.store, namespace, max_requests, window_size)
+        elif type == "sliding_counter":
+            return StoreSlidingWindowCounterRateLimiter(self.store, namespace, max_requests, window_size)
+        elif type == "leaky":
+            return StoreLeakyBucketRateLimiter(self.store, namespace, max_requests, window_size)
+        elif type == "token":
+            if self.lease_size:
+                return LeasedTokenBucketRateLimiter(self.store, namespace, max_requests, window_size,
+                                                    lease_size=self.lease_size)
+            return StoreTokenBucketRateLimiter(self.store, namespace, max_requests, window_size)
+        else:
+            raise ValueError("Unknown rate limiter type")
+
+
+if __name__ == "__main__":
+    from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiterFactory
+
+    server = StoreServer()
+    address = server.start()
+    node_a, node_b = RemoteStore(address), RemoteStore(address)
+    limiter_a = RateLimiterFactory.create_rate_limiter("fixed", 3, 60, backend=RemoteStoreBackend(node_a))
+    limiter_b = RateLimiterFactory.create_rate_limiter("fixed", 3, 60, backend=RemoteStoreBackend(node_b))
+    for limiter in (limiter_a, limiter_b, limiter_a, limiter_b):
+        print(limiter.allow_request("client1"))
+    node_a.close()
+    node_b.close()
+    server.stop()
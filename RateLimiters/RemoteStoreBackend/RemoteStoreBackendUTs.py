@@ -0,0 +1,77 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiterFactory, VirtualClock
+from RateLimiters.RemoteStoreBackend.RemoteStoreBackend import (
+    StoreServer, RemoteStore, InMemoryStore, RemoteStoreBackend,
+    StoreSlidingWindowRateLimiter, LeasedTokenBucketRateLimiter
+)
+
+
+class TestRemoteStoreBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock(1000.0)
+        self.server = StoreServer(store=InMemoryStore(clock=self.clock))
+        address = self.server.start()
+        self.node_a = RemoteStore(address, max_connections=2)
+        self.node_b = RemoteStore(address, max_connections=2)
+
+    def tearDown(self):
+        self.node_a.close()
+        self.node_b.close()
+        self.server.stop()
+
+    def test_limit_is_shared_between_nodes(self):
+        limiter_a = RateLimiterFactory.create_rate_limiter("fixed", 3, 60, backend=RemoteStoreBackend(self.node_a))
+        limiter_b = RateLimiterFactory.create_rate_limiter("fixed", 3, 60, backend=RemoteStoreBackend(self.node_b))
+        decisions = [limiter.allow_request("c") for limiter in (limiter_a, limiter_b, limiter_a, limiter_b)]
+        self.assertEqual(decisions, [True, True, True, False])
+
+        self.clock.advance(60)
+        self.assertTrue(limiter_b.allow_request("c"))
+
+    def test_one_round_trip_per_decision(self):
+        limiter = RemoteStoreBackend(self.node_a).create_rate_limiter("sliding", 2, 10)
+        self.assertIsInstance(limiter, StoreSlidingWindowRateLimiter)
+        for _ in range(5):
+            limiter.allow_request("c")
+        self.assertEqual(self.node_a.round_trips, 5)
+
+    def test_pipelined_batch_is_one_round_trip(self):
+        limiter = RemoteStoreBackend(self.node_a).create_rate_limiter("sliding_counter", 2, 10)
+        decisions = limiter.allow_requests(["a", "a", "a", "b"])
+        self.assertEqual(decisions, [True, True, False, True])
+        self.assertEqual(self.node_a.round_trips, 1)
+
+    def test_token_leases_cut_round_trips(self):
+        backend = RemoteStoreBackend(self.node_a, lease_size=5)
+        limiter = backend.create_rate_limiter("token", 1, 12)
+        self.assertIsInstance(limiter, LeasedTokenBucketRateLimiter)
+        admitted = sum(limiter.allow_request("c") for _ in range(10))
+        self.assertEqual(admitted, 10)
+        self.assertEqual(self.node_a.round_trips, 2)
+
+        # Only 2 of the 12 tokens are left in the store for the other node
+        other = RemoteStoreBackend(self.node_b, lease_size=5).create_rate_limiter("token", 1, 12)
+        self.assertEqual(sum(other.allow_request("c") for _ in range(5)), 2)
+
+    def test_failed_call_returns_its_connection_slot(self):
+        bad_reply = json.JSONDecodeError("Expecting value", "", 0)
+        with patch.object(self.node_a, "_recv", side_effect=bad_reply):
+            for i in range(3):  # more failures than the pool has connections
+                with self.assertRaises(json.JSONDecodeError):
+                    self.node_a.eval("fixed_window", f"broken{i}", 1, 60)
+        self.assertTrue(self.node_a.eval("fixed_window", "c", 1, 60))
+        self.assertFalse(self.node_a.eval("fixed_window", "c", 1, 60))
+        self.assertEqual(self.node_a.pool.idle.qsize(), 1)
+        for _ in range(2):  # every slot is free again, and there are no more than two
+            self.assertTrue(self.node_a.pool.slots.acquire(blocking=False))
+        self.assertFalse(self.node_a.pool.slots.acquire(blocking=False))
+        for _ in range(2):
+            self.node_a.pool.slots.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+'''
+    Benchmark: decisions/sec and round-trips per decision against the
+    in-process StoreServer, for one eval per decision, pipelined batches and
+    leased token buckets.
+
+    python -m RateLimiters.RemoteStoreBackend.StoreBenchmark [decisions] [batch] [lease]
+'''
+import sys
+import time
+
+from RateLimiters.RemoteStoreBackend.RemoteStoreBackend import (
+    StoreServer, RemoteStore, RemoteStoreBackend
+)
+
+
+def report(name, store, decisions, elapsed):
+    print(f"{name:>28}: {decisions / elapsed:>10,.0f} decisions/s, "
+          f"{store.round_trips / decisions:.3f} round-trips/decision")
+
+
+def main():
+    decisions = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    lease = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    clients = [f"client_{i % 1000}" for i in range(decisions)]
+
+    server = StoreServer()
+    address = server.start()
+
+    for algorithm in ("fixed", "sliding_counter", "token"):
+        store = RemoteStore(address)
+        limiter = RemoteStoreBackend(store).create_rate_limiter(algorithm, 1_000_000, 60)
+        start = time.perf_counter()
+        for client_id in clients:
+            limiter.allow_request(client_id)
+        report(f"{algorithm} eval/decision", store, decisions, time.perf_counter() - start)
+        store.close()
+
+    store = RemoteStore(address)
+    limiter = RemoteStoreBackend(store).create_rate_limiter("sliding_counter", 1_000_000, 60)
+    start = time.perf_counter()
+    for i in range(0, decisions, batch):
+        limiter.allow_requests(clients[i:i + batch])
+    report(f"sliding_counter batch={batch}", store, decisions, time.perf_counter() - start)
+    store.close()
+
+    store = RemoteStore(address)
+    limiter = RemoteStoreBackend(store, lease_size=lease).create_rate_limiter("token", 1_000_000, 1_000_000)
+    start = time.perf_counter()
+    for client_id in clients:
+        limiter.allow_request(client_id)
+    report(f"token lease={lease}", store, decisions, time.perf_counter() - start)
+    store.close()
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
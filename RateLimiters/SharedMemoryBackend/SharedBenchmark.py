@@ -0,0 +1,68 @@
+'''
+    Benchmark: cross-process decision throughput of the shared-memory backend.
+    Each worker is forked after the backend is created (pre-fork server model)
+    and makes `decisions` allow_request calls spread over `clients` client ids.
+    Also reports how many requests one hot client got admitted in total,
+    against the per-process limiters where every worker has its own copy.
+
+    python -m RateLimiters.SharedMemoryBackend.SharedBenchmark [decisions] [clients]
+'''
+import multiprocessing
+import random
+import sys
+import time
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiterFactory
+from RateLimiters.SharedMemoryBackend.SharedMemoryBackend import SharedMemoryBackend
+
+LIMIT = 1000
+
+
+def worker(backend, algorithm, decisions, clients, barrier, results):
+    limiter = RateLimiterFactory.create_rate_limiter(algorithm, LIMIT, 60, backend=backend)
+    ids = [f"client_{random.randrange(clients)}" for _ in range(decisions)]
+    hot_admitted = 0
+    barrier.wait()
+    start = time.perf_counter()
+    for client_id in ids:
+        limiter.allow_request(client_id)
+    elapsed = time.perf_counter() - start
+    for _ in range(2 * LIMIT):
+        hot_admitted += limiter.allow_request("hot_client")
+    results.put((elapsed, hot_admitted))
+
+
+def run(processes, algorithm, decisions, clients, shared):
+    ctx = multiprocessing.get_context("fork")
+    backend = SharedMemoryBackend(slots=4 * (clients + 1)) if shared else None
+    barrier = ctx.Barrier(processes)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=worker, args=(backend, algorithm, decisions, clients, barrier, results))
+               for _ in range(processes)]
+    for w in workers:
+        w.start()
+    stats = [results.get() for _ in workers]
+    for w in workers:
+        w.join()
+    if backend:
+        backend.close()
+        backend.unlink()
+    slowest = max(elapsed for elapsed, _ in stats)
+    return processes * decisions / slowest, sum(admitted for _, admitted in stats)
+
+
+def main():
+    decisions = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    print(f"{decisions} decisions per process over {clients} clients, hot client limit {LIMIT}")
+    for algorithm in ("fixed", "sliding_counter"):
+        for processes in (1, 2, 4, 8):
+            for shared in (False, True):
+                rate, admitted = run(processes, algorithm, decisions, clients, shared)
+                backend = "shared" if shared else "per-process"
+                print(f"{algorithm:>15} {backend:>11} x{processes}: "
+                      f"{rate:>12,.0f} decisions/s, hot client admitted {admitted}")
+
+
+if __name__ == "__main__":
+    main()
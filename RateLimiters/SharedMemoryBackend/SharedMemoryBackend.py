@@ -0,0 +1,247 @@
+from hashlib import blake2b
+from multiprocessing import Lock, shared_memory
+import struct
+import time
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiter
+
+# Slot layout (32 bytes): key hash (0 = empty) followed by three float fields.
+# The first two mean whatever the owning algorithm needs; the third is the time
+# from which the key's state is back to a new key's (its slot can be reused).
+_HASH = struct.Struct("<Q")
+_FIELDS = struct.Struct("<ddd")
+_SLOT_SIZE = _HASH.size + _FIELDS.size
+
+
+def _key_hash(key: str) -> int:
+    # Stable across processes, unlike hash(), which is salted per interpreter
+    h = int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "little")
+    return h or 1
+
+
+# Open-addressing hash table in a multiprocessing.shared_memory block.
+# Updates to a key run under the stripe lock of the key's home slot; claiming
+# a slot for a new key additionally takes the insert lock, so two keys from
+# different stripes can never claim the same slot. A new key may take over the
+# slot of an expired key on its probe path (under that key's stripe lock too);
+# slots never go back to empty, so probing never has to deal with tombstones.
+class SharedHashTable:
+    def __init__(self, slots=65536, stripes=64):
+        self.slots = slots
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * _SLOT_SIZE)
+        self.shm.buf[:slots * _SLOT_SIZE] = bytes(slots * _SLOT_SIZE)
+        self.locks = [Lock() for _ in range(stripes)]
+        self.insert_lock = Lock()
+
+    # Picklable for spawn-started workers; fork-started workers simply inherit it
+    def __getstate__(self):
+        return {"name": self.shm.name, "slots": self.slots,
+                "locks": self.locks, "insert_lock": self.insert_lock}
+
+    def __setstate__(self, state):
+        self.slots = state["slots"]
+        self.shm = shared_memory.SharedMemory(name=state["name"])
+        self.locks = state["locks"]
+        self.insert_lock = state["insert_lock"]
+
+    def _find(self, h, home):
+        buf = self.shm.buf
+        index = home
+        while True:
+            stored = _HASH.unpack_from(buf, index * _SLOT_SIZE)[0]
+            if stored == h:
+                return index * _SLOT_SIZE
+            if stored == 0:
+                return None
+            index = (index + 1) % self.slots
+            if index == home:
+                return None
+
+    def _claim(self, h, home, now):
+        held = self.locks[home % len(self.locks)]
+        with self.insert_lock:
+            index = home
+            while True:
+                offset = index * _SLOT_SIZE
+                stored = _HASH.unpack_from(self.shm.buf, offset)[0]
+                if stored == 0:
+                    return self._publish(h, offset)
+                if now is not None and self._take_expired(h, offset, stored, now, held):
+                    return offset
+                index = (index + 1) % self.slots
+                if index == home:
+                    raise RuntimeError("shared rate limiter table is full")
+
+    def _publish(self, h, offset):
+        _FIELDS.pack_into(self.shm.buf, offset + _HASH.size, 0.0, 0.0, 0.0)
+        _HASH.pack_into(self.shm.buf, offset, h)  # publish the key last
+        return offset
+
+    def _take_expired(self, h, offset, stored, now, held):
+        # Takes over the slot of an expired key, under that key's stripe lock so none
+        # of its updates are in flight. Not waiting for the lock avoids a lock-order
+        # deadlock, and a key busy enough to hold it is unlikely to be idle anyway.
+        lock = self.locks[(stored % self.slots) % len(self.locks)]
+        if lock is not held and not lock.acquire(block=False):
+            return False
+        try:
+            if _FIELDS.unpack_from(self.shm.buf, offset + _HASH.size)[2] > now:
+                return False
+            self._publish(h, offset)
+            return True
+        finally:
+            if lock is not held:
+                lock.release()
+
+    def update(self, key: str, decide, now=None):
+        """
+        :param decide: called with the stored fields (None for a new key) and
+                       returns (new_fields, result); runs under the key's lock.
+                       new_fields[2] is when the key's state expires
+        :param now: the caller's clock; with it, a new key may reuse the slot of
+                    a key that expired at or before `now`
+        """
+        h = _key_hash(key)
+        home = h % self.slots
+        with self.locks[home % len(self.locks)]:
+            offset = self._find(h, home)
+            if offset is None:
+                offset = self._claim(h, home, now)
+                fields = None
+            else:
+                fields = _FIELDS.unpack_from(self.shm.buf, offset + _HASH.size)
+            new_fields, result = decide(fields)
+            _FIELDS.pack_into(self.shm.buf, offset + _HASH.size, *new_fields)
+            return result
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+# 1. Fixed Window Rate Limiter: (window_start, count)
+class SharedFixedWindowRateLimiter(RateLimiter):
+    def __init__(self, table: SharedHashTable, namespace: str, max_requests: int, window_size: int,
+                 clock=time.time):
+        self.table = table
+        self.namespace = namespace
+        self.max_requests = max_requests
+        self.window_size = window_size
+        self.clock = clock
+
+    def allow_request(self, client_id: str) -> bool:
+        current_time = int(self.clock())
+
+        def decide(fields):
+            if fields is None or current_time - fields[0] >= self.window_size:
+                window_start, count = current_time, 0
+            else:
+                window_start, count = fields[0], fields[1]
+            expires = window_start + self.window_size
+            if count < self.max_requests:
+                return (window_start, count + 1, expires), True
+            return (window_start, count, expires), False
+
+        return self.table.update(f"{self.namespace}:{client_id}", decide, current_time)
+
+
+# 3. Sliding Window Counter Rate Limiter: (current_window, count)
+class SharedSlidingWindowCounterRateLimiter(RateLimiter):
+    def __init__(self, table: SharedHashTable, namespace: str, max_requests: int, window_size: int,
+                 clock=time.time):
+        self.table = table
+        self.namespace = namespace
+        self.max_requests = max_requests
+        self.window_size = window_size
+        self.clock = clock
+
+    def allow_request(self, client_id: str) -> bool:
+        current_time = int(self.clock())
+        current_window = current_time // self.window_size
+
+        def decide(fields):
+            count = fields[1] if fields is not None and fields[0] == current_window else 0
+            expires = (current_window + 1) * self.window_size
+            if count < self.max_requests:
+                return (current_window, count + 1, expires), True
+            return (current_window, count, expires), False
+
+        return self.table.update(f"{self.namespace}:{client_id}", decide, current_time)
+
+
+# 4. Leaky Bucket Rate Limiter: (water, last_time), one bucket shared by all clients
+class SharedLeakyBucketRateLimiter(RateLimiter):
+    def __init__(self, table: SharedHashTable, namespace: str, capacity, leak_rate, clock=time.time):
+        self.table = table
+        self.namespace = namespace
+        self.capacity = capacity
+        self.leak_rate = leak_rate
+        self.clock = clock
+
+    def allow_request(self, client_id: str) -> bool:
+        def decide(fields):
+            now = self.clock()
+            water, last_time = (0.0, now) if fields is None else (fields[0], fields[1])
+            water = max(0, water - (now - last_time) * self.leak_rate)
+            allowed = water < self.capacity
+            if allowed:
+                water += 1
+            expires = now + water / self.leak_rate if self.leak_rate else float("inf")   # empty again
+            return (water, now, expires), allowed
+
+        return self.table.update(self.namespace, decide)
+
+
+# 5. Token Bucket Rate Limiter: (tokens, last_time), one bucket shared by all clients
+class SharedTokenBucketRateLimiter(RateLimiter):
+    def __init__(self, table: SharedHashTable, namespace: str, rate, capacity, clock=time.time):
+        self.table = table
+        self.namespace = namespace
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+
+    def allow_request(self, client_id: str) -> bool:
+        def decide(fields):
+            now = self.clock()
+            tokens, last_time = (self.capacity, now) if fields is None else (fields[0], fields[1])
+            tokens = min(self.capacity, tokens + (now - last_time) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            expires = now + (self.capacity - tokens) / self.rate if self.rate else float("inf")   # full again
+            return (tokens, now, expires), allowed
+
+        return self.table.update(self.namespace, decide)
+
+
+# Backend for RateLimiterFactory: create it in the parent before forking the
+# workers, and every worker's limiter enforces one shared limit.
+class SharedMemoryBackend:
+    def __init__(self, slots=65536, stripes=64, clock=time.time):
+        self.table = SharedHashTable(slots, stripes)
+        self.clock = clock
+
+    def create_rate_limiter(self, type: str, max_requests: int, window_size: int) -> RateLimiter:
+        # Same arguments in every worker -> same namespace -> same shared state
+        namespace = f"{type}:{max_requests}:{window_size}"
+        if type == "fixed":
+            return SharedFixedWindowRateLimiter(self.table, namespace, max_requests, window_size, self.clock)
+        elif type == "sliding_counter":
+            return SharedSlidingWindowCounterRateLimiter(self.table, namespace, max_requests, window_size, self.clock)
+        elif type == "leaky":
+            return SharedLeakyBucketRateLimiter(self.table, namespace, max_requests, window_size, self.clock)
+        elif type == "token":
+            return SharedTokenBucketRateLimiter(self.table, namespace, max_requests, window_size, self.clock)
+        elif type == "sliding":
+            raise ValueError("Sliding window log needs unbounded per-client state; use sliding_counter")
+        else:
+            raise ValueError("Unknown rate limiter type")
+
+    def close(self):
+        self.table.close()
+
+    def unlink(self):
+        self.table.unlink()
@@ -0,0 +1,99 @@
+import multiprocessing
+import unittest
+
+from RateLimiters.FixedAndSlidingWindowCounterThread.FixedSlidingWithThreading import RateLimiterFactory, VirtualClock
+from RateLimiters.SharedMemoryBackend.SharedMemoryBackend import (
+    SharedMemoryBackend, SharedHashTable, SharedFixedWindowRateLimiter, SharedTokenBucketRateLimiter
+)
+
+
+def _worker(backend, attempts, results):
+    limiter = RateLimiterFactory.create_rate_limiter("fixed", 50, 60, backend=backend)
+    results.put(sum(limiter.allow_request("shared_client") for _ in range(attempts)))
+
+
+class TestSharedMemoryBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = SharedMemoryBackend(slots=64, stripes=4)
+
+    def tearDown(self):
+        self.backend.close()
+        self.backend.unlink()
+
+    def test_factory_uses_backend(self):
+        limiter = RateLimiterFactory.create_rate_limiter("fixed", 3, 60, backend=self.backend)
+        self.assertIsInstance(limiter, SharedFixedWindowRateLimiter)
+        self.assertEqual([limiter.allow_request("a") for _ in range(4)], [True, True, True, False])
+        self.assertTrue(limiter.allow_request("b"))
+
+        token = RateLimiterFactory.create_rate_limiter("token", 1, 2, backend=self.backend)
+        self.assertIsInstance(token, SharedTokenBucketRateLimiter)
+        self.assertEqual([token.allow_request("a") for _ in range(3)], [True, True, False])
+
+        with self.assertRaises(ValueError):
+            RateLimiterFactory.create_rate_limiter("sliding", 3, 60, backend=self.backend)
+        with self.assertRaises(ValueError):  # the backend's own clock would be used, not this one
+            RateLimiterFactory.create_rate_limiter("fixed", 3, 60, backend=self.backend, clock=lambda: 0.0)
+
+    def test_limiters_with_same_config_share_state(self):
+        first = RateLimiterFactory.create_rate_limiter("sliding_counter", 2, 60, backend=self.backend)
+        second = RateLimiterFactory.create_rate_limiter("sliding_counter", 2, 60, backend=self.backend)
+        self.assertTrue(first.allow_request("c"))
+        self.assertTrue(second.allow_request("c"))
+        self.assertFalse(first.allow_request("c"))
+
+    def test_table_full(self):
+        table = SharedHashTable(slots=2, stripes=1)
+        try:
+            table.update("a", lambda fields: ((1.0, 0.0, 0.0), None))
+            table.update("b", lambda fields: ((1.0, 0.0, 0.0), None))
+            with self.assertRaises(RuntimeError):
+                table.update("c", lambda fields: ((1.0, 0.0, 0.0), None))
+        finally:
+            table.close()
+            table.unlink()
+
+    def test_expired_slots_are_reused(self):
+        table = SharedHashTable(slots=2, stripes=1)
+        try:
+            table.update("a", lambda fields: ((1.0, 0.0, 10.0), None), now=0.0)
+            table.update("b", lambda fields: ((1.0, 0.0, 20.0), None), now=0.0)
+            with self.assertRaises(RuntimeError):
+                table.update("c", lambda fields: ((1.0, 0.0, 30.0), None), now=5.0)
+            self.assertIsNone(table.update("c", lambda fields: ((1.0, 0.0, 30.0), fields), now=10.0))  # takes a's slot
+            self.assertEqual(table.update("b", lambda fields: (fields, fields), now=10.0), (1.0, 0.0, 20.0))
+            self.assertIsNone(table.update("a", lambda fields: ((1.0, 0.0, 40.0), fields), now=20.0))  # a starts over
+        finally:
+            table.close()
+            table.unlink()
+
+    def test_more_clients_than_slots_over_time(self):
+        clock = VirtualClock(1000.0)
+        backend = SharedMemoryBackend(slots=8, stripes=2, clock=clock)
+        try:
+            for name in ("fixed", "sliding_counter"):
+                limiter = backend.create_rate_limiter(name, 2, 10)
+                for round_ in range(5):   # 6 new clients a window, 30 in all
+                    clients = [f"{round_}-{i}" for i in range(6)]
+                    self.assertEqual([limiter.allow_request(c) for c in clients + clients + clients],
+                                     [True] * 12 + [False] * 6)
+                    clock.advance(10)
+        finally:
+            backend.close()
+            backend.unlink()
+
+    def test_limit_is_global_across_processes(self):
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        workers = [ctx.Process(target=_worker, args=(self.backend, 40, results)) for _ in range(4)]
+        for w in workers:
+            w.start()
+        admitted = sum(results.get(timeout=10) for _ in workers)
+        for w in workers:
+            w.join()
+        self.assertEqual(admitted, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
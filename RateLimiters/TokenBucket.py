@@ -2,16 +2,17 @@ import time
 from threading import Lock
 
 class TokenBucket:
-    def __init__(self, rate, capacity):
+    def __init__(self, rate, capacity, clock=time.time):
         self.rate = rate
         self.capacity = capacity
         self.tokens = capacity
-        self.last_time = time.time()
+        self.clock = clock
+        self.last_time = clock()
         self.lock = Lock()
 
     def allow_request(self):
         with self.lock:
-            now = time.time()
+            now = self.clock()
             elapsed = now - self.last_time
             self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
             self.last_time = now
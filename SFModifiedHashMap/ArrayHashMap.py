@@ -0,0 +1,151 @@
+'''
+    CustomHashMap with flat, parallel storage instead of one Entry object
+    per slot:
+      hashes - array('q') of the stored hash of each slot's key
+      keys   - list of key references
+      values - list of value references
+      states - bytearray, one byte per slot: EMPTY / OCCUPIED / TOMBSTONE
+    Probing compares the stored hash before touching the key, so most
+    mismatches never dereference a key object. Same resize and tombstone
+    policy as CustomHashMap.
+'''
+from array import array
+
+EMPTY, OCCUPIED, TOMBSTONE = 0, 1, 2
+
+
+class ArrayHashMap:
+    MAX_LOAD = 0.7   # (live + tombstones) / capacity that triggers a rebuild
+    MIN_LOAD = 0.2   # live / capacity below which the table shrinks
+
+    def __init__(self, capacity=16):
+        self.min_capacity = capacity
+        self.size = 0
+        self.tombstones = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.hashes = array("q", bytes(8 * capacity))
+        self.keys = [None] * capacity
+        self.values = [None] * capacity
+        self.states = bytearray(capacity)
+
+    def _find(self, key, h):
+        """Index of the occupied slot for key, or None"""
+        states, hashes, keys = self.states, self.hashes, self.keys
+        capacity = self.capacity
+        index = h % capacity
+        state = states[index]
+        while state:
+            if state == OCCUPIED and hashes[index] == h:
+                stored = keys[index]
+                if stored is key or stored == key:
+                    return index
+            index += 1
+            if index == capacity:
+                index = 0
+            state = states[index]
+        return None
+
+    def get(self, key):
+        # _find inlined: get is the hot path
+        h = hash(key)
+        states, hashes, keys = self.states, self.hashes, self.keys
+        capacity = self.capacity
+        index = h % capacity
+        state = states[index]
+        while state:
+            if state == OCCUPIED and hashes[index] == h:
+                stored = keys[index]
+                if stored is key or stored == key:
+                    return self.values[index]
+            index += 1
+            if index == capacity:
+                index = 0
+            state = states[index]
+        return None
+
+    def __contains__(self, key):
+        return self._find(key, hash(key)) is not None
+
+    def __len__(self):
+        return self.size
+
+    def remove(self, key):
+        index = self._find(key, hash(key))
+        if index is None:
+            return
+        self.states[index] = TOMBSTONE
+        self.keys[index] = self.values[index] = None  # drop the references now
+        self.size -= 1
+        self.tombstones += 1
+        if self.capacity > self.min_capacity and self.size < self.capacity * self.MIN_LOAD:
+            self._resize(max(self.min_capacity, self.capacity // 2))
+
+    def insert(self, key, value):
+        h = hash(key)
+        states, hashes, keys = self.states, self.hashes, self.keys
+        capacity = self.capacity
+        index = h % capacity
+        free = None  # first tombstone on the probe path, reused for a new key
+
+        state = states[index]
+        while state:
+            if state == OCCUPIED:
+                if hashes[index] == h:
+                    stored = keys[index]
+                    if stored is key or stored == key:
+                        self.values[index] = value
+                        return
+            elif free is None:
+                free = index
+            index += 1
+            if index == capacity:
+                index = 0
+            state = states[index]
+
+        if free is not None:
+            index = free
+            self.tombstones -= 1
+        states[index] = OCCUPIED
+        hashes[index] = h
+        keys[index] = key
+        self.values[index] = value
+        self.size += 1
+
+        if self.size + self.tombstones > capacity * self.MAX_LOAD:
+            # Mostly tombstones: rebuild in place; otherwise double
+            if self.size > capacity * self.MAX_LOAD / 2:
+                self._resize(capacity * 2)
+            else:
+                self._resize(capacity)
+
+    def _resize(self, capacity):
+        old_states, old_hashes, old_keys, old_values = self.states, self.hashes, self.keys, self.values
+        self._allocate(capacity)
+        self.tombstones = 0
+        states, hashes, keys, values = self.states, self.hashes, self.keys, self.values
+        for i in range(len(old_states)):
+            if old_states[i] == OCCUPIED:
+                h = old_hashes[i]
+                index = h % capacity
+                while states[index]:
+                    index = (index + 1) % capacity
+                states[index] = OCCUPIED
+                hashes[index] = h
+                keys[index] = old_keys[i]
+                values[index] = old_values[i]
+
+    def items(self):
+        for i in range(self.capacity):
+            if self.states[i] == OCCUPIED:
+                yield self.keys[i], self.values[i]
+
+
+if __name__ == "__main__":
+    arrayMap = ArrayHashMap(5)
+    for key in (1, 11, 21, 31, 41):
+        arrayMap.insert(key, key)
+    arrayMap.remove(21)
+    print(arrayMap.capacity, list(arrayMap.items()), arrayMap.get(21), arrayMap.get(41))
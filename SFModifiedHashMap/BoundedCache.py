@@ -0,0 +1,195 @@
+'''
+    Capacity-bounded cache on top of CustomHashMap.
+
+    The map holds key -> _CacheNode; the eviction policy links the same
+    nodes intrusively, so every operation is O(1):
+      lru - one doubly linked list, most recently used at the front
+      lfu - a doubly linked list of frequency buckets in increasing order,
+            each holding its nodes in recency order; the victim is the least
+            recently used node of the lowest frequency
+    Entries may carry a TTL; expired entries are dropped when looked up and
+    count as misses.
+'''
+import time
+
+from SFModifiedHashMap.CustomHashMap import CustomHashMap
+
+
+class _CacheNode:
+    __slots__ = ("key", "value", "expires", "prev", "next", "bucket")
+
+    def __init__(self, key=None, value=None, expires=None):
+        self.key = key
+        self.value = value
+        self.expires = expires
+        self.prev = self.next = self
+        self.bucket = None
+
+
+def _link_after(anchor, node):
+    node.prev, node.next = anchor, anchor.next
+    anchor.next.prev = node
+    anchor.next = node
+
+
+def _unlink(node):
+    node.prev.next = node.next
+    node.next.prev = node.prev
+    node.prev = node.next = node
+
+
+class _LRUPolicy:
+    def __init__(self):
+        self.head = _CacheNode()   # sentinel: head.next is the most recent, head.prev the least
+
+    def add(self, node):
+        _link_after(self.head, node)
+
+    def touch(self, node):
+        _unlink(node)
+        _link_after(self.head, node)
+
+    def discard(self, node):
+        _unlink(node)
+
+    def victim(self):
+        return self.head.prev
+
+
+class _FrequencyBucket:
+    __slots__ = ("freq", "nodes", "prev", "next")
+
+    def __init__(self, freq):
+        self.freq = freq
+        self.nodes = _CacheNode()  # sentinel of this bucket's recency list
+        self.prev = self.next = self
+
+
+class _LFUPolicy:
+    def __init__(self):
+        self.head = _FrequencyBucket(0)   # sentinel: head.next has the lowest frequency
+
+    def _bucket_after(self, bucket, freq):
+        # The bucket for `freq`, created right after `bucket` if missing
+        if bucket.next is not self.head and bucket.next.freq == freq:
+            return bucket.next
+        new = _FrequencyBucket(freq)
+        new.prev, new.next = bucket, bucket.next
+        bucket.next.prev = new
+        bucket.next = new
+        return new
+
+    def _drop_if_empty(self, bucket):
+        if bucket.nodes.next is bucket.nodes:
+            bucket.prev.next = bucket.next
+            bucket.next.prev = bucket.prev
+
+    def add(self, node):
+        node.bucket = self._bucket_after(self.head, 1)
+        _link_after(node.bucket.nodes, node)
+
+    def touch(self, node):
+        old = node.bucket
+        node.bucket = self._bucket_after(old, old.freq + 1)
+        _unlink(node)
+        _link_after(node.bucket.nodes, node)
+        self._drop_if_empty(old)
+
+    def discard(self, node):
+        _unlink(node)
+        self._drop_if_empty(node.bucket)
+        node.bucket = None
+
+    def victim(self):
+        return self.head.next.nodes.prev
+
+
+POLICIES = {"lru": _LRUPolicy, "lfu": _LFUPolicy}
+
+
+class BoundedCache:
+    def __init__(self, max_entries: int, policy: str = "lru", ttl: float = None, clock=time.monotonic):
+        if policy not in POLICIES:
+            raise ValueError("Unknown eviction policy")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.map = CustomHashMap(max(10, int(max_entries / CustomHashMap.MAX_LOAD) + 1))
+        self.policy = POLICIES[policy]()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        node = self.map.get(key)
+        if node is None:
+            self.misses += 1
+            return None
+        if self._expire(node):
+            self.misses += 1
+            return None
+        self.policy.touch(node)
+        self.hits += 1
+        return node.value
+
+    def insert(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else self.clock() + ttl
+        node = self.map.get(key)
+        if node is not None:
+            node.value, node.expires = value, expires
+            self.policy.touch(node)
+            return
+        if len(self.map) >= self.max_entries:
+            self._drop(self.policy.victim())
+            self.evictions += 1
+        node = _CacheNode(key, value, expires)
+        self.map.insert(key, node)
+        self.policy.add(node)
+
+    def remove(self, key):
+        node = self.map.get(key)
+        if node is not None:
+            self._drop(node)
+
+    def _drop(self, node):
+        self.policy.discard(node)
+        self.map.remove(node.key)
+
+    def _expire(self, node) -> bool:
+        """Drops the node if its TTL has run out; True if it did"""
+        if node.expires is not None and node.expires <= self.clock():
+            self._drop(node)
+            self.expirations += 1
+            return True
+        return False
+
+    def __contains__(self, key):
+        # A membership test is not a use: no recency or hit/miss bookkeeping
+        node = self.map.get(key)
+        return node is not None and not self._expire(node)
+
+    def __len__(self):
+        return len(self.map)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+if __name__ == "__main__":
+    for policy in ("lru", "lfu"):
+        cache = BoundedCache(2, policy)
+        cache.insert("a", 1)
+        cache.insert("b", 2)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.insert("c", 3)   # lru evicts "a", lfu evicts "b"
+        print(policy, [key for key in "abc" if key in cache], cache.stats())
@@ -0,0 +1,70 @@
+'''
+    Benchmark: bulk build and batch lookup versus looped single-key calls on
+    CustomHashMap, for n random int keys:
+      insert loop  - one insert() per key, growing as it goes
+      bulk_insert  - (key, value) pairs, table sized once
+      from_arrays  - parallel NumPy arrays, vectorised hashing
+      get loop     - one get() per key
+      get_many     - one call for the whole batch (list, then NumPy array)
+
+    python -m SFModifiedHashMap.BulkBenchmark [n]
+'''
+import random
+import sys
+import time
+
+from SFModifiedHashMap.CustomHashMap import CustomHashMap, np
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def insert_loop(keys):
+    hash_map = CustomHashMap()
+    for key in keys:
+        hash_map.insert(key, key)
+    return hash_map
+
+
+def bulk(keys):
+    hash_map = CustomHashMap()
+    hash_map.bulk_insert(zip(keys, keys))
+    return hash_map
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(29)
+    keys = [rng.getrandbits(62) for _ in range(n)]
+    lookups = rng.sample(keys, n // 2) + [rng.getrandbits(62) for _ in range(n // 2)]
+
+    rows = []
+    loop_time, hash_map = timed(lambda: insert_loop(keys))
+    rows.append(("insert loop", loop_time))
+    rows.append(("bulk_insert", timed(lambda: bulk(keys))[0]))
+    if np is not None:
+        key_array = np.array(keys, dtype=np.int64)
+        rows.append(("from_arrays", timed(lambda: CustomHashMap.from_arrays(key_array, key_array))[0]))
+    get = hash_map.get
+    get_time, expected = timed(lambda: [get(key) for key in lookups])
+    rows.append(("get loop", get_time))
+    many_time, results = timed(lambda: hash_map.get_many(lookups))
+    assert results == expected
+    rows.append(("get_many", many_time))
+    if np is not None:
+        lookup_array = np.array(lookups, dtype=np.int64)
+        many_time, results = timed(lambda: hash_map.get_many(lookup_array))
+        assert results == expected
+        rows.append(("get_many np", many_time))
+
+    print(f"n = {n:,} random int keys, NumPy {'on' if np is not None else 'off'}")
+    print(f"{'operation':>12} {'seconds':>8} {'ns/key':>7}")
+    for name, elapsed in rows:
+        print(f"{name:>12} {elapsed:>8.2f} {elapsed / n * 1e9:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+'''
+    Benchmark: BoundedCache LRU versus LFU on read-through Zipfian workloads
+    (get, and insert on a miss). Reports hit rate and ops/sec for several
+    Zipf skews and cache sizes.
+
+    python -m SFModifiedHashMap.CacheBenchmark [requests]
+'''
+from bisect import bisect_left
+from itertools import accumulate
+import random
+import sys
+import time
+
+from SFModifiedHashMap.BoundedCache import BoundedCache
+
+KEYS = 100_000
+
+
+def zipf_keys(rng, s, requests):
+    cumulative = list(accumulate(1 / (k ** s) for k in range(1, KEYS + 1)))
+    total = cumulative[-1]
+    # Shuffle ranks so popular keys are not also numerically adjacent
+    ranks = list(range(KEYS))
+    rng.shuffle(ranks)
+    return [ranks[bisect_left(cumulative, rng.random() * total)] for _ in range(requests)]
+
+
+def run(policy, size, keys):
+    cache = BoundedCache(size, policy)
+    get, insert = cache.get, cache.insert
+    start = time.perf_counter()
+    for key in keys:
+        if get(key) is None:
+            insert(key, key)
+    elapsed = time.perf_counter() - start
+    return cache.stats()["hit_rate"], len(keys) / elapsed
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    rng = random.Random(23)
+    print(f"{requests:,} requests over {KEYS:,} keys")
+    print(f"{'zipf s':>7} {'size':>7} {'lru hit %':>10} {'lfu hit %':>10} {'lru ops/s':>11} {'lfu ops/s':>11}")
+    for s in (0.8, 1.0, 1.2):
+        keys = zipf_keys(rng, s, requests)
+        for size in (KEYS // 100, KEYS // 10):
+            (lru_hit, lru_ops), (lfu_hit, lfu_ops) = run("lru", size, keys), run("lfu", size, keys)
+            print(f"{s:>7} {size:>7,} {lru_hit * 100:>10.2f} {lfu_hit * 100:>10.2f} {lru_ops:>11,.0f} {lfu_ops:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+'''
+    Benchmark: insert/get/remove cost of CustomHashMap under churn.
+    The map is filled to n random keys, then every round removes a random
+    live key and inserts a fresh one, so the live size stays at n while tombstones
+    keep appearing. ns/op should stay flat as n grows, and the average probe
+    length should stay bounded. (Sequential integer keys are a different,
+    adversarial pattern: hash() is the identity for ints, so they form one
+    long linear-probing cluster.)
+
+    python -m SFModifiedHashMap.ChurnBenchmark [max_size]
+'''
+import random
+import sys
+import time
+
+from SFModifiedHashMap.CustomHashMap import CustomHashMap
+
+
+def average_probe(custom_map):
+    total = 0
+    for key, _ in custom_map.items():
+        index, probes = custom_map._hash(key), 1
+        while custom_map.buckets[index].key != key or not custom_map.buckets[index].active:
+            index = (index + 1) % custom_map.capacity
+            probes += 1
+        total += probes
+    return total / max(1, len(custom_map))
+
+
+def run(n, rounds, rng):
+    custom_map = CustomHashMap()
+    live = [rng.getrandbits(62) for _ in range(n)]
+    for key in live:
+        custom_map.insert(key, key)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        i = rng.randrange(n)
+        custom_map.remove(live[i])
+        key = rng.getrandbits(62)
+        custom_map.insert(key, key)
+        live[i] = key
+    churn = time.perf_counter() - start
+
+    probes = [live[rng.randrange(n)] for _ in range(rounds)]
+    start = time.perf_counter()
+    for key in probes:
+        custom_map.get(key)
+    get = time.perf_counter() - start
+
+    return churn / (2 * rounds) * 1e9, get / rounds * 1e9, average_probe(custom_map), custom_map
+
+
+def main():
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(3)
+    print(f"{'n':>10} {'churn ns/op':>12} {'get ns/op':>10} {'avg probe':>10} {'capacity':>10} {'tombstones':>11}")
+    n = 1_000
+    while n <= max_size:
+        churn, get, probe, custom_map = run(n, 200_000, rng)
+        print(f"{n:>10,} {churn:>12.0f} {get:>10.0f} {probe:>10.2f} {custom_map.capacity:>10,} "
+              f"{custom_map.tombstones:>11,}")
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
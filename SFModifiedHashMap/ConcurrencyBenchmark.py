@@ -0,0 +1,105 @@
+'''
+    Benchmark: ConcurrentHashMap versus CustomHashMap behind one global Lock.
+      1. Throughput of a read-heavy mix (default 90% get / 10% insert+remove)
+         at 1, 2, 4 and 8 threads.
+      2. Worst single-insert pause while growing a map to n keys: the global
+         map rehashes everything at once, the concurrent map migrates a few
+         buckets per write.
+    On a GIL build, threads share one core, so total ops/sec cannot rise
+    with threads; what to look for is that the concurrent map does not
+    degrade as threads are added. Free-threaded builds can scale for real.
+    The cyclic GC is disabled so its pauses do not get counted as resizes.
+
+    python -m SFModifiedHashMap.ConcurrencyBenchmark [ops_per_thread] [n]
+'''
+import gc
+import random
+import sys
+import threading
+import time
+
+from SFModifiedHashMap.CustomHashMap import CustomHashMap
+from SFModifiedHashMap.ConcurrentHashMap import ConcurrentHashMap
+
+KEYS = 100_000
+# Random keys: sequential ints would put CustomHashMap's identity hashing into
+# one long probe cluster and measure that instead of the locking
+_rng = random.Random(17)
+KEY_SPACE = [_rng.getrandbits(62) for _ in range(KEYS)]
+
+
+class LockedHashMap:
+    def __init__(self):
+        self.map = CustomHashMap()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return self.map.get(key)
+
+    def insert(self, key, value):
+        with self.lock:
+            self.map.insert(key, value)
+
+    def remove(self, key):
+        with self.lock:
+            self.map.remove(key)
+
+
+def worker(hash_map, ops, read_ratio, seed, barrier):
+    rng = random.Random(seed)
+    plan = [(rng.random() < read_ratio, rng.random() < 0.5, rng.choice(KEY_SPACE)) for _ in range(ops)]
+    barrier.wait()
+    for read, add, key in plan:
+        if read:
+            hash_map.get(key)
+        elif add:
+            hash_map.insert(key, key)
+        else:
+            hash_map.remove(key)
+
+
+def throughput(make_map, threads, ops, read_ratio=0.9):
+    hash_map = make_map()
+    for key in KEY_SPACE:
+        hash_map.insert(key, key)
+    barrier = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(hash_map, ops, read_ratio, i, barrier)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def worst_insert_pause(make_map, n):
+    hash_map = make_map()
+    worst = 0
+    perf = time.perf_counter
+    rng = random.Random(19)
+    for key in (rng.getrandbits(62) for _ in range(n)):
+        start = perf()
+        hash_map.insert(key, key)
+        worst = max(worst, perf() - start)
+    return worst
+
+
+def main():
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    gc.disable()
+    maps = {"global lock": LockedHashMap, "concurrent": ConcurrentHashMap}
+    print(f"90% reads, {ops:,} ops per thread, {KEYS:,} keys")
+    print(f"{'threads':>8} " + " ".join(f"{name + ' ops/s':>22}" for name in maps))
+    for threads in (1, 2, 4, 8):
+        row = [throughput(make_map, threads, ops) for make_map in maps.values()]
+        print(f"{threads:>8} " + " ".join(f"{r:>22,.0f}" for r in row))
+    print(f"\nworst single insert while growing to {n:,} keys")
+    for name, make_map in maps.items():
+        print(f"{name:>12}: {worst_insert_pause(make_map, n) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
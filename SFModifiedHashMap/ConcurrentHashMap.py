@@ -0,0 +1,186 @@
+'''
+    Thread-safe hash map for lookup tables shared across worker threads.
+
+    * Keys are split over `segments`, each with its own lock; writers only
+      ever take the lock of the key's segment.
+    * Buckets are chains of nodes whose key and next pointer never change
+      once published. A writer builds the new chain head off to the side and
+      publishes it with one list-slot assignment, so readers take no lock at
+      all and see either the old chain or the new one.
+    * A segment that passes LOAD_FACTOR starts migrating into a table twice
+      the size. Every write to that segment moves MIGRATE_STEP more buckets;
+      a moved bucket is replaced by a _Forward marker that sends readers and
+      writers on to the new table, so no operation ever rehashes everything.
+'''
+from threading import Lock
+
+
+class _Node:
+    __slots__ = ("key", "hash", "value", "next")
+
+    def __init__(self, key, h, value, next):
+        self.key = key
+        self.hash = h
+        self.value = value   # the only field updated in place (a single store)
+        self.next = next
+
+
+# Placed in every migrated bucket of the old table; one instance per migration
+class _Forward:
+    __slots__ = ("table",)
+
+    def __init__(self, table):
+        self.table = table
+
+
+def _spread(key):
+    h = hash(key)
+    return h ^ (h >> 16)
+
+
+class _Segment:
+    def __init__(self, capacity):
+        self.table = [None] * capacity
+        self.next_table = None
+        self.forward = None
+        self.migrate_index = 0
+        self.count = 0
+        self.lock = Lock()
+
+
+class ConcurrentHashMap:
+    LOAD_FACTOR = 0.75
+    MIGRATE_STEP = 8   # buckets moved per write while a segment is migrating
+
+    def __init__(self, capacity=64, segments=16):
+        if segments & (segments - 1):
+            raise ValueError("segments must be a power of two")
+        self.segment_bits = segments.bit_length() - 1
+        per_segment = 1 << max(1, (max(1, capacity // segments) - 1).bit_length())
+        self.segments = [_Segment(per_segment) for _ in range(segments)]
+
+    def _segment(self, h):
+        return self.segments[h & (len(self.segments) - 1)]
+
+    def _bucket(self, h, table):
+        return (h >> self.segment_bits) & (len(table) - 1)
+
+    # --- Reads: no locks ---
+
+    def get(self, key, default=None):
+        h = _spread(key)
+        table = self._segment(h).table
+        node = table[self._bucket(h, table)]
+        while isinstance(node, _Forward):
+            table = node.table
+            node = table[self._bucket(h, table)]
+        while node is not None:
+            if node.hash == h and (node.key is key or node.key == key):
+                return node.value
+            node = node.next
+        return default
+
+    def __contains__(self, key):
+        missing = object()
+        return self.get(key, missing) is not missing
+
+    def __len__(self):
+        return sum(segment.count for segment in self.segments)
+
+    def items(self):
+        """Weakly consistent: each bucket is seen as it was when visited"""
+        for segment in self.segments:
+            table = segment.table
+            for index in range(len(table)):
+                yield from self._walk(table, index)
+
+    def _walk(self, table, index):
+        node = table[index]
+        if isinstance(node, _Forward):
+            # A doubled table splits bucket i into buckets i and i + len(table)
+            yield from self._walk(node.table, index)
+            yield from self._walk(node.table, index + len(table))
+            return
+        while node is not None:
+            yield node.key, node.value
+            node = node.next
+
+    # --- Writes: one segment lock ---
+
+    def _write_table(self, segment, h):
+        """(table, index) a write for hash h must go to; caller holds the lock"""
+        table = segment.table
+        index = self._bucket(h, table)
+        if isinstance(table[index], _Forward):
+            table = segment.next_table
+            index = self._bucket(h, table)
+        return table, index
+
+    def insert(self, key, value):
+        h = _spread(key)
+        segment = self._segment(h)
+        with segment.lock:
+            self._migrate(segment)
+            table, index = self._write_table(segment, h)
+            node = table[index]
+            while node is not None:
+                if node.hash == h and (node.key is key or node.key == key):
+                    node.value = value
+                    return
+                node = node.next
+            table[index] = _Node(key, h, value, table[index])
+            segment.count += 1
+            if segment.next_table is None and segment.count > len(segment.table) * self.LOAD_FACTOR:
+                self._start_migration(segment)
+
+    def remove(self, key):
+        h = _spread(key)
+        segment = self._segment(h)
+        with segment.lock:
+            self._migrate(segment)
+            table, index = self._write_table(segment, h)
+            # Copy the nodes in front of the removed one; the tail is shared
+            prefix = []
+            node = table[index]
+            while node is not None and not (node.hash == h and (node.key is key or node.key == key)):
+                prefix.append(node)
+                node = node.next
+            if node is None:
+                return
+            head = node.next
+            for kept in reversed(prefix):
+                head = _Node(kept.key, kept.hash, kept.value, head)
+            table[index] = head
+            segment.count -= 1
+
+    # --- Incremental resize ---
+
+    def _start_migration(self, segment):
+        segment.next_table = [None] * (2 * len(segment.table))
+        segment.forward = _Forward(segment.next_table)
+        segment.migrate_index = 0
+
+    def _migrate(self, segment):
+        if segment.next_table is None:
+            return
+        old, new, forward = segment.table, segment.next_table, segment.forward
+        end = min(len(old), segment.migrate_index + self.MIGRATE_STEP)
+        for index in range(segment.migrate_index, end):
+            node = old[index]
+            while node is not None:
+                target = self._bucket(node.hash, new)
+                new[target] = _Node(node.key, node.hash, node.value, new[target])
+                node = node.next
+            old[index] = forward   # readers still holding `old` follow this
+        segment.migrate_index = end
+        if end == len(old):
+            segment.table = new    # publish before dropping next_table
+            segment.next_table = segment.forward = None
+
+
+if __name__ == "__main__":
+    concurrentMap = ConcurrentHashMap(capacity=4, segments=2)
+    for key in (1, 11, 21, 31, 41):
+        concurrentMap.insert(key, key)
+    concurrentMap.remove(21)
+    print(len(concurrentMap), sorted(concurrentMap.items()), concurrentMap.get(21), concurrentMap.get(41))
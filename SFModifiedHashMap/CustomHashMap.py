@@ -1,7 +1,41 @@
 '''
     Build a custom hash map - such that
     insert, get and remove are the order of O(1)
+
+    Open addressing with linear probing. Any hashable key is accepted.
+    The table grows when live entries plus tombstones pass MAX_LOAD and
+    shrinks when live entries drop below MIN_LOAD; every resize rebuilds
+    the table from live entries only, so tombstones never pile up.
+
+    bulk_insert / from_arrays / get_many size the table once and hash a
+    whole batch up front; int keys given as a NumPy array are hashed as one
+    vectorised array operation.
 '''
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # optional: the bulk paths fall back to hash() per key
+    np = None
+
+
+def _int_hashes(keys):
+    """hash(k) for every k of an int64 array, matching Python's int hash exactly"""
+    modulus = np.uint64(sys.hash_info.modulus)
+    negative = keys < 0
+    # Magnitudes as uint64 (|-2**63| does not fit int64)
+    magnitude = np.where(negative, (~keys).astype(np.uint64) + np.uint64(1), keys.astype(np.uint64))
+    reduced = (magnitude % modulus).astype(np.int64)
+    hashes = np.where(negative, -reduced, reduced)
+    hashes[hashes == -1] = -2   # -1 is reserved as an error marker in CPython
+    return hashes
+
+
+def _sequence(values):
+    """values as something with len(): NumPy arrays and lists as they are, other iterables as a list"""
+    if isinstance(values, list) or (np is not None and isinstance(values, np.ndarray)):
+        return values
+    return list(values)
 
 
 class Entry:
@@ -12,78 +46,203 @@ class Entry:
 
 
 class CustomHashMap:
+    MAX_LOAD = 0.7   # (live + tombstones) / capacity that triggers a rebuild
+    MIN_LOAD = 0.2   # live / capacity below which the table shrinks
+
     def __init__(self, capacity=10):
+        self.min_capacity = capacity
         self.capacity = capacity
         self.size = 0
+        self.tombstones = 0
         self.buckets = [None] * self.capacity
 
     def _hash(self, key):
-        return key % self.capacity
+        return hash(key) % self.capacity
 
-    def get(self, key):
+    def _find(self, key):
+        """Index of the active entry for key, or None"""
         index = self._hash(key)
         o_index = index
 
         while self.buckets[index]:
-            if self.buckets[index].key == key:
-                return self.buckets[index].value
+            entry = self.buckets[index]
+            if entry.active and entry.key == key:
+                return index
             index = (index + 1) % self.capacity
             if index == o_index:
                 break
         return None
 
+    def get(self, key):
+        index = self._find(key)
+        return None if index is None else self.buckets[index].value
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __len__(self):
+        return self.size
+
     def remove(self, key):
+        index = self._find(key)
+        if index is None:
+            return
+        self.buckets[index].active = False
+        self.size -= 1
+        self.tombstones += 1
+        if self.capacity > self.min_capacity and self.size < self.capacity * self.MIN_LOAD:
+            self._resize(max(self.min_capacity, self.capacity // 2))
+
+    def insert(self, key, value):
         index = self._hash(key)
         o_index = index
+        free = None  # first tombstone on the probe path, reused for a new key
 
         while self.buckets[index]:
-            if self.buckets[index].key == key and self.buckets[index].active:
-                self.buckets[index].active = False
-                self.size -= 1
-                return
+            entry = self.buckets[index]
+            if entry.active:
+                if entry.key == key:
+                    entry.value = value
+                    return
+            elif free is None:
+                free = index
             index = (index + 1) % self.capacity
             if index == o_index:
                 break
 
-    def insert(self, key, value):
-        index = self._hash(key)
-        o_index = index
-        if self.buckets[index] is None:
+        if free is not None:
+            self.buckets[free] = Entry(key, value)
+            self.tombstones -= 1
+        else:
             self.buckets[index] = Entry(key, value)
-            self.size += 1
-            print(index, self.buckets)
-            return
+        self.size += 1
 
-        while self.buckets[index]:
-            index = (index + 1) % self.capacity
-            print(index)
-            if index == o_index:
-                raise Exception("resize required")
-            if self.buckets[index] is None:
-                self.buckets[index] = Entry(key, value)
+        if self.size + self.tombstones > self.capacity * self.MAX_LOAD:
+            # Mostly tombstones: rebuild in place; otherwise double
+            if self.size > self.capacity * self.MAX_LOAD / 2:
+                self._resize(self.capacity * 2)
+            else:
+                self._resize(self.capacity)
+
+    def _resize(self, capacity):
+        old = self.buckets
+        self.capacity = capacity
+        self.buckets = [None] * capacity
+        self.tombstones = 0
+        for entry in old:
+            if entry and entry.active:
+                index = self._hash(entry.key)
+                while self.buckets[index]:
+                    index = (index + 1) % capacity
+                self.buckets[index] = entry
+
+    # --- Bulk APIs ---
+
+    def _homes(self, keys):
+        """(home slot of every key, keys as a list)"""
+        if np is not None and isinstance(keys, np.ndarray) and keys.ndim == 1 and keys.dtype.kind == "i":
+            homes = _int_hashes(keys.astype(np.int64)) % self.capacity
+            return homes.tolist(), keys.tolist()
+        # A list of Python ints is hashed faster here than converted to an array first
+        keys = list(keys)
+        capacity = self.capacity
+        return [hash(key) % capacity for key in keys], keys
+
+    def bulk_insert(self, items):
+        """Inserts (key, value) pairs, resizing at most once up front"""
+        items = list(items)
+        self._bulk_place([key for key, _ in items], [value for _, value in items])
+
+    @classmethod
+    def from_arrays(cls, keys, values):
+        """Builds a map from parallel key and value iterables (lists, NumPy arrays, generators)"""
+        keys, values = _sequence(keys), _sequence(values)
+        if len(keys) != len(values):
+            raise ValueError(f"{len(keys)} keys but {len(values)} values")
+        hash_map = cls()
+        hash_map._bulk_place(keys, values)
+        return hash_map
+
+    def _bulk_place(self, keys, values):
+        needed = self.size + len(keys)
+        if needed + self.tombstones > self.capacity * self.MAX_LOAD:
+            self._resize(max(self.capacity, int(needed / self.MAX_LOAD) + 1))
+        homes, keys = self._homes(keys)
+        if np is not None and isinstance(values, np.ndarray):
+            values = values.tolist()
+        buckets, capacity = self.buckets, self.capacity
+        for key, value, index in zip(keys, values, homes):
+            free = None
+            entry = buckets[index]
+            while entry:
+                if entry.active:
+                    if entry.key == key:
+                        entry.value = value
+                        break
+                elif free is None:
+                    free = index
+                index += 1
+                if index == capacity:
+                    index = 0
+                entry = buckets[index]
+            else:
+                if free is not None:
+                    index = free
+                    self.tombstones -= 1
+                buckets[index] = Entry(key, value)
                 self.size += 1
-                return
+
+    def get_many(self, keys) -> list:
+        """[get(key) for key in keys], with the hashing done as one batch"""
+        homes, keys = self._homes(keys)
+        buckets, capacity = self.buckets, self.capacity
+        results = []
+        append = results.append
+        for key, index in zip(keys, homes):
+            entry = buckets[index]
+            while entry is not None:
+                if entry.key == key and entry.active:
+                    append(entry.value)
+                    break
+                index += 1
+                if index == capacity:
+                    index = 0
+                entry = buckets[index]
+            else:
+                append(None)
+        return results
+
+    def items(self):
+        for entry in self.buckets:
+            if entry and entry.active:
+                yield entry.key, entry.value
 
 
 # 1, 11, 21, 31, 41: capcity - 5
 # get (1) get(11) get(21) get(1) get(11)
 
+if __name__ == "__main__":
+    customMap = CustomHashMap(5)
+    customMap.insert(1, 1)
+    customMap.insert(11, 11)
+    customMap.insert(21, 21)
+    customMap.insert(31, 31)
+    customMap.insert(41, 41)
+
+    print(customMap.capacity, list(customMap.items()))
 
-customMap = CustomHashMap(5)
-customMap.insert(1, 1)
-customMap.insert(11, 11)
-customMap.insert(21, 21)
-customMap.insert(31, 31)
-customMap.insert(41, 41)
+    print(customMap.get(1))
 
-print(customMap.buckets)
+    print(customMap.get(11))
 
-print(customMap.get(1))
+    print(customMap.get(21))
 
-print(customMap.get(11))
+    print(customMap.get(31))
 
-print(customMap.get(21))
+    print(customMap.get(41))
 
-print(customMap.get(31))
+    customMap.remove(21)
+    print(customMap.get(21))
 
-print(customMap.get(41))
\ No newline at end of file
+    customMap.insert("apple", 3)
+    print(customMap.get("apple"))
@@ -0,0 +1,442 @@
+from multiprocessing import get_context
+import os
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+
+from SFModifiedHashMap.CustomHashMap import CustomHashMap, np, _int_hashes
+from SFModifiedHashMap.ArrayHashMap import ArrayHashMap
+from SFModifiedHashMap.RobinHoodHashMap import RobinHoodHashMap, _mix
+from SFModifiedHashMap.ConcurrentHashMap import ConcurrentHashMap
+from SFModifiedHashMap.BoundedCache import BoundedCache
+from SFModifiedHashMap.PersistentHashMap import PersistentHashMap, _SLOT, _HEADER_SIZE
+
+
+# Behaviour every map implementation shares; subclasses set map_class
+class HashMapContract:
+    map_class = None
+
+    def test_clustered_keys(self):
+        custom_map = self.map_class(5)
+        for key in (1, 11, 21, 31, 41):
+            custom_map.insert(key, key)
+        for key in (1, 11, 21, 31, 41):
+            self.assertEqual(custom_map.get(key), key)
+        self.assertGreater(custom_map.capacity, 5)
+
+    def test_get_skips_removed_entries(self):
+        custom_map = self.map_class(10)
+        custom_map.insert(1, "a")
+        custom_map.insert(11, "b")
+        custom_map.remove(1)
+        self.assertIsNone(custom_map.get(1))
+        self.assertEqual(custom_map.get(11), "b")
+        self.assertNotIn(1, custom_map)
+
+    def test_insert_existing_key_updates(self):
+        custom_map = self.map_class(10)
+        custom_map.insert("apple", 1)
+        custom_map.insert("apple", 2)
+        self.assertEqual(custom_map.get("apple"), 2)
+        self.assertEqual(len(custom_map), 1)
+
+    def test_any_hashable_key(self):
+        custom_map = self.map_class(10)
+        keys = ["x", (1, 2), 3.5, frozenset({1}), None]
+        for i, key in enumerate(keys):
+            custom_map.insert(key, i)
+        for i, key in enumerate(keys):
+            self.assertEqual(custom_map.get(key), i)
+
+    def test_grows_and_shrinks(self):
+        custom_map = self.map_class(8)
+        for key in range(1000):
+            custom_map.insert(key, key)
+        self.assertGreaterEqual(custom_map.capacity, 1000 / self.map_class.MAX_LOAD)
+        for key in range(1000):
+            custom_map.remove(key)
+        self.assertEqual(len(custom_map), 0)
+        self.assertEqual(custom_map.capacity, 8)
+
+    def test_churn_keeps_tombstones_bounded(self):
+        custom_map = self.map_class(16)
+        reference = {}
+        rng = random.Random(1)
+        for _ in range(20000):
+            key = rng.randrange(500)
+            if rng.random() < 0.5:
+                custom_map.insert(key, key * 2)
+                reference[key] = key * 2
+            else:
+                custom_map.remove(key)
+                reference.pop(key, None)
+            self.assertLessEqual(custom_map.size + getattr(custom_map, "tombstones", 0),
+                                 custom_map.capacity * self.map_class.MAX_LOAD)
+        self.assertEqual(dict(custom_map.items()), reference)
+        for key in range(500):
+            self.assertEqual(custom_map.get(key), reference.get(key))
+
+
+class TestCustomHashMap(HashMapContract, unittest.TestCase):
+    map_class = CustomHashMap
+
+
+class TestArrayHashMap(HashMapContract, unittest.TestCase):
+    map_class = ArrayHashMap
+
+    def test_remove_drops_references(self):
+        array_map = ArrayHashMap(16)
+        array_map.insert("k", object())
+        array_map.remove("k")
+        self.assertEqual(array_map.keys, [None] * array_map.capacity)
+        self.assertEqual(array_map.values, [None] * array_map.capacity)
+
+
+class TestRobinHoodHashMap(HashMapContract, unittest.TestCase):
+    map_class = RobinHoodHashMap
+
+    def assert_invariant(self, robin_map):
+        for index in range(robin_map.capacity):
+            probe = robin_map.probes[index]
+            if probe:
+                home = robin_map.hashes[index] >> robin_map.shift
+                self.assertEqual(probe, ((index - home) & robin_map.mask) + 1)
+                self.assertEqual(robin_map.hashes[index], _mix(hash(robin_map.keys[index])))
+
+    def test_adversarial_keys_keep_probes_short(self):
+        robin_map = RobinHoodHashMap()
+        for key in range(0, 1 << 20, 1 << 8):  # multiples of every capacity up to 256
+            robin_map.insert(key, key)
+        self.assertLess(robin_map.max_probe(), 32)  # linear probing on hash() needs thousands here
+        self.assert_invariant(robin_map)
+
+    def test_high_bit_keys_keep_probes_short_and_table_small(self):
+        for shift in (32, 40, 48, 52):
+            robin_map = RobinHoodHashMap()
+            for i in range(3000):  # low `shift` bits all zero
+                robin_map.insert(i << shift, i)
+            self.assertEqual(robin_map.capacity, 4096)
+            self.assertLess(robin_map.max_probe(), 32)
+            self.assert_invariant(robin_map)
+
+    def test_remove_shifts_back_without_tombstones(self):
+        robin_map = RobinHoodHashMap(64)
+        rng = random.Random(2)
+        keys = [rng.randrange(10**6) for _ in range(40)]
+        for key in keys:
+            robin_map.insert(key, key)
+        for key in keys[::2]:
+            robin_map.remove(key)
+        self.assert_invariant(robin_map)
+        self.assertEqual(sum(1 for p in robin_map.probes if p), len(robin_map))
+        for key in keys[1::2]:
+            self.assertEqual(robin_map.get(key), key)
+
+
+class TestCustomHashMapBulk(unittest.TestCase):
+
+    def test_bulk_insert_matches_looped_insert(self):
+        rng = random.Random(4)
+        keys = [rng.randrange(-10**6, 10**6) for _ in range(3000)] + [-1, -2, 0, 2**62, -2**63]
+        looped, bulk = CustomHashMap(), CustomHashMap()
+        for key in keys[:100]:
+            looped.insert(key, "old")
+            bulk.insert(key, "old")
+        for key in keys[:50]:
+            looped.remove(key)
+            bulk.remove(key)
+        for i, key in enumerate(keys):
+            looped.insert(key, i)
+        bulk.bulk_insert((key, i) for i, key in enumerate(keys))
+        self.assertEqual(dict(bulk.items()), dict(looped.items()))
+        self.assertEqual(len(bulk), len(looped))
+        self.assertLessEqual(bulk.size + bulk.tombstones, bulk.capacity * CustomHashMap.MAX_LOAD)
+
+    def test_from_arrays_and_get_many(self):
+        keys = list(range(0, 5000, 5))
+        hash_map = CustomHashMap.from_arrays(keys, [key * 2 for key in keys])
+        self.assertEqual(hash_map.get_many([0, 5, 7, 4995]), [0, 10, None, 9990])
+        for key in keys:
+            self.assertEqual(hash_map.get(key), key * 2)
+
+    def test_from_arrays_takes_iterables_of_equal_length(self):
+        hash_map = CustomHashMap.from_arrays((key for key in range(100)), map(str, range(100)))
+        self.assertEqual(hash_map.get_many([0, 99, 100]), ["0", "99", None])
+        with self.assertRaises(ValueError):
+            CustomHashMap.from_arrays([1, 2, 3], ["one", "two"])
+
+    def test_non_int_keys_fall_back_to_hash(self):
+        keys = ["a", "b", (1, 2), 2.5, True]
+        hash_map = CustomHashMap.from_arrays(keys, range(len(keys)))
+        self.assertEqual(hash_map.get_many(keys + ["missing"]), [0, 1, 2, 3, 4, None])
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_vectorised_hash_matches_python(self):
+        keys = np.array([0, 1, -1, -2, 2**61 - 1, 2**61, -(2**61), 2**63 - 1, -2**63, 123456789], dtype=np.int64)
+        self.assertEqual(_int_hashes(keys).tolist(), [hash(int(k)) for k in keys])
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_numpy_arrays(self):
+        keys = np.arange(-500, 500, dtype=np.int64)
+        hash_map = CustomHashMap.from_arrays(keys, keys * 3)
+        self.assertEqual(hash_map.get_many(np.array([-500, 499, 1000])), [-1500, 1497, None])
+        self.assertIs(type(next(iter(hash_map.items()))[0]), int)
+
+
+class TestConcurrentHashMap(unittest.TestCase):
+
+    def test_basic_operations(self):
+        concurrent_map = ConcurrentHashMap(capacity=4, segments=2)
+        for key in (1, 11, 21, 31, 41):
+            concurrent_map.insert(key, key)
+        concurrent_map.insert(11, "eleven")
+        concurrent_map.remove(21)
+        self.assertEqual(len(concurrent_map), 4)
+        self.assertEqual(concurrent_map.get(11), "eleven")
+        self.assertIsNone(concurrent_map.get(21))
+        self.assertNotIn(21, concurrent_map)
+        self.assertEqual(sorted(concurrent_map.items()), [(1, 1), (11, "eleven"), (31, 31), (41, 41)])
+
+    def test_incremental_migration_keeps_every_key_visible(self):
+        concurrent_map = ConcurrentHashMap(capacity=2, segments=1)
+        segment = concurrent_map.segments[0]
+        saw_migration = False
+        for key in range(2000):
+            concurrent_map.insert(key, key)
+            saw_migration |= segment.next_table is not None
+            if key % 97 == 0:
+                for probe in range(key + 1):
+                    self.assertEqual(concurrent_map.get(probe), probe)
+                self.assertEqual(len(dict(concurrent_map.items())), key + 1)
+        self.assertTrue(saw_migration)
+        for key in range(0, 2000, 2):
+            concurrent_map.remove(key)
+        self.assertEqual(dict(concurrent_map.items()), {key: key for key in range(1, 2000, 2)})
+
+    def test_readers_see_stable_keys_during_writes(self):
+        concurrent_map = ConcurrentHashMap(capacity=16, segments=4)
+        for key in range(500):
+            concurrent_map.insert(("stable", key), key)
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                for key in range(0, 500, 7):
+                    if concurrent_map.get(("stable", key)) != key:
+                        errors.append(key)
+
+        def writer(worker):
+            for key in range(3000):
+                concurrent_map.insert((worker, key), key)
+                if key % 3 == 0:
+                    concurrent_map.remove((worker, key))
+
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        writers = [threading.Thread(target=writer, args=(w,)) for w in range(3)]
+        for t in readers + writers:
+            t.start()
+        for t in writers:
+            t.join()
+        done.set()
+        for t in readers:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(concurrent_map), 500 + 3 * 2000)
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class TestBoundedCache(unittest.TestCase):
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = BoundedCache(3, "lru")
+        for key in "abc":
+            cache.insert(key, key)
+        cache.get("a")
+        cache.insert("d", "d")
+        self.assertNotIn("b", cache)
+        cache.insert("e", "e")
+        self.assertNotIn("c", cache)
+        self.assertEqual([key for key in "ade" if key in cache], ["a", "d", "e"])
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+    def test_lfu_evicts_least_frequent_then_oldest(self):
+        cache = BoundedCache(3, "lfu")
+        for key in "abc":
+            cache.insert(key, key)
+        for _ in range(3):
+            cache.get("a")
+        cache.get("b")
+        cache.insert("d", "d")          # c has the lowest frequency
+        self.assertNotIn("c", cache)
+        cache.insert("e", "e")          # d is the only entry used once
+        self.assertNotIn("d", cache)
+        cache.get("e")
+        cache.insert("f", "f")          # b and e tie at 2; b was used less recently
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 3)
+
+    def test_update_and_remove(self):
+        for policy in ("lru", "lfu"):
+            cache = BoundedCache(2, policy)
+            cache.insert("a", 1)
+            cache.insert("a", 2)
+            self.assertEqual(cache.get("a"), 2)
+            self.assertEqual(len(cache), 1)
+            cache.remove("a")
+            self.assertIsNone(cache.get("a"))
+            cache.insert("b", 1)
+            cache.insert("c", 1)
+            self.assertEqual(len(cache), 2)
+
+    def test_ttl_expiry_counts_as_miss(self):
+        clock = FakeClock(1000.0)
+        cache = BoundedCache(10, "lru", ttl=5, clock=clock)
+        cache.insert("a", 1)
+        cache.insert("b", 2, ttl=60)
+        clock.advance(6)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "evictions": 0, "expirations": 1,
+                                         "hit_rate": 0.5})
+        self.assertEqual(len(cache), 1)
+
+    def test_contains_respects_ttl(self):
+        clock = FakeClock(1000.0)
+        cache = BoundedCache(10, "lru", ttl=5, clock=clock)
+        cache.insert("a", 1)
+        self.assertIn("a", cache)
+        clock.advance(6)
+        self.assertNotIn("a", cache)
+        self.assertEqual((len(cache), cache.stats()["expirations"]), (0, 1))
+
+    def test_max_entries_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            BoundedCache(0)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            BoundedCache(1, "fifo")
+
+
+def read_keys(path, keys):
+    with PersistentHashMap(path, readonly=True) as persistent_map:
+        return [persistent_map.get(key) for key in keys]
+
+
+def crash_writer(path):
+    persistent_map = PersistentHashMap(path)
+    persistent_map.insert(1, b"first-value")
+    os._exit(0)   # no flush() or close(): the header still has the counts from open
+
+
+class TestPersistentHashMap(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "map.chm")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_survives_reopen_through_resizes(self):
+        reference = {}
+        with PersistentHashMap(self.path, capacity=8) as persistent_map:
+            for key in range(-500, 1500):
+                value = str(key).encode() * (key % 5)
+                persistent_map.insert(key, value)
+                reference[key] = value
+            for key in range(0, 1500, 3):
+                persistent_map.remove(key)
+                del reference[key]
+            persistent_map.insert(7, b"updated")
+            reference[7] = b"updated"
+            self.assertGreater(persistent_map.capacity, 2000)
+        with PersistentHashMap(self.path, readonly=True) as persistent_map:
+            self.assertEqual(len(persistent_map), len(reference))
+            self.assertEqual(dict(persistent_map.items()), reference)
+            self.assertIsNone(persistent_map.get(3))
+            self.assertNotIn(3, persistent_map)
+
+    def test_high_bit_keys_keep_probes_short(self):
+        for shift, count in ((48, 3000), (52, 2000)):  # int64 keys with the low `shift` bits zero
+            with PersistentHashMap(self.path + str(shift)) as persistent_map:
+                for i in range(count):
+                    persistent_map.insert(i << shift, b"v")
+                self.assertLessEqual(persistent_map.capacity, 8192)
+                longest = max(len(self.probe_path(persistent_map, i << shift)) for i in range(count))
+                self.assertLess(longest, 32)
+                self.assertEqual(persistent_map.get((count - 1) << shift), b"v")
+
+    @staticmethod
+    def probe_path(persistent_map, key):
+        slot, path = _mix(key) >> persistent_map.shift, []
+        while True:
+            stored = _SLOT.unpack_from(persistent_map.index, _HEADER_SIZE + slot * _SLOT.size)[0]
+            path.append(slot)
+            if stored == key:
+                return path
+            slot = (slot + 1) & persistent_map.mask
+
+    def test_readonly_map_rejects_writes_and_shares_the_heap(self):
+        with PersistentHashMap(self.path) as persistent_map:
+            persistent_map.insert(1, b"one")
+        persistent_map = PersistentHashMap(self.path, readonly=True)
+        with self.assertRaises(PermissionError):
+            persistent_map.insert(2, b"two")
+        view = persistent_map.get_view(1)
+        self.assertIs(view.obj, persistent_map.heap)
+        self.assertEqual(bytes(view), b"one")
+        view.release()
+        persistent_map.close()
+        with self.assertRaises(FileNotFoundError):
+            PersistentHashMap(os.path.join(self.directory, "missing"), readonly=True)
+
+    def test_reopen_after_a_writer_crash(self):
+        PersistentHashMap(self.path).close()
+        writer = get_context("spawn").Process(target=crash_writer, args=(self.path,))
+        writer.start()
+        writer.join()
+        self.assertEqual(writer.exitcode, 0)
+        with PersistentHashMap(self.path) as persistent_map:
+            self.assertEqual(len(persistent_map), 1)
+            self.assertEqual(persistent_map.get(1), b"first-value")
+            persistent_map.insert(2, b"XXXXXXXXXXX")
+            self.assertEqual(persistent_map.get(1), b"first-value")
+        with PersistentHashMap(self.path, readonly=True) as persistent_map:
+            self.assertEqual(dict(persistent_map.items()), {1: b"first-value", 2: b"XXXXXXXXXXX"})
+
+    def test_view_survives_heap_growth(self):
+        with PersistentHashMap(self.path) as persistent_map:
+            persistent_map.insert(1, b"one")
+            view = persistent_map.get_view(1)
+            for key in range(2, 100):
+                persistent_map.insert(key, b"x" * 1000)   # grows the heap past its first 4 KiB
+            self.assertEqual(bytes(view), b"one")
+            self.assertEqual(persistent_map.get(99), b"x" * 1000)
+            view.release()
+
+    def test_reader_processes(self):
+        with PersistentHashMap(self.path) as persistent_map:
+            for key in range(1000):
+                persistent_map.insert(key, key.to_bytes(4, "little"))
+        with get_context("spawn").Pool(2) as pool:
+            results = pool.starmap(read_keys, [(self.path, range(0, 1000, 2)), (self.path, range(1, 1000, 2))])
+        self.assertEqual(results[0], [key.to_bytes(4, "little") for key in range(0, 1000, 2)])
+        self.assertEqual(results[1], [key.to_bytes(4, "little") for key in range(1, 1000, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
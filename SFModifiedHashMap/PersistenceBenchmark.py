@@ -0,0 +1,117 @@
+'''
+    Benchmark: warm start of PersistentHashMap versus rebuilding an
+    in-memory map from the same data.
+      1. For growing n: time to open the persisted map and serve its first
+         lookup, against the time to rebuild an ArrayHashMap of n entries.
+      2. Reader processes: each opens the largest map read-only and does
+         random lookups; on Linux, /proc/self/smaps shows how many of the
+         pages it touched are shared with the other readers rather than
+         private copies.
+
+    python -m SFModifiedHashMap.PersistenceBenchmark [max_n] [readers]
+'''
+from multiprocessing import get_context
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from SFModifiedHashMap.ArrayHashMap import ArrayHashMap
+from SFModifiedHashMap.PersistentHashMap import PersistentHashMap
+
+
+def value_of(key):
+    return key.to_bytes(8, "little", signed=True) * 2
+
+
+def build(path, n):
+    # Pre-sized so the build does not pay for resizes
+    with PersistentHashMap(path, capacity=int(n / PersistentHashMap.MAX_LOAD) + 1) as persistent_map:
+        for key in range(n):
+            persistent_map.insert(key * 7919, value_of(key * 7919))
+
+
+def mapped_kib(path):
+    """(shared KiB, private KiB) resident for mappings of `path`, or None off Linux"""
+    try:
+        with open("/proc/self/smaps") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    shared = private = 0
+    inside = False
+    for line in lines:
+        fields = line.split()
+        if "-" in fields[0] and len(fields) >= 5:
+            inside = fields[-1] in (path, path + ".heap")
+        elif inside and fields[0] in ("Shared_Clean:", "Shared_Dirty:"):
+            shared += int(fields[1])
+        elif inside and fields[0] in ("Private_Clean:", "Private_Dirty:"):
+            private += int(fields[1])
+    return shared, private
+
+
+def reader(path, n, lookups, seed, barrier):
+    rng = random.Random(seed)
+    keys = [rng.randrange(n) * 7919 for _ in range(lookups)]
+    barrier.wait()  # every reader maps the files before any of them measures
+    start = time.perf_counter()
+    persistent_map = PersistentHashMap(path, readonly=True)
+    opened = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        persistent_map.get(key)
+    elapsed = time.perf_counter() - start
+    barrier.wait()  # all readers still have the pages mapped
+    memory = mapped_kib(path)
+    persistent_map.close()
+    return opened, lookups / elapsed, memory
+
+
+def main():
+    max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"{'n':>12} {'build s':>8} {'open+get ms':>12} {'index MiB':>10} {'rebuild ArrayHashMap s':>23}")
+        n = 1_000
+        while n <= max_n:
+            path = os.path.join(directory, f"map_{n}.chm")
+            start = time.perf_counter()
+            build(path, n)
+            built = time.perf_counter() - start
+
+            start = time.perf_counter()
+            persistent_map = PersistentHashMap(path, readonly=True)
+            persistent_map.get((n // 2) * 7919)
+            warm = time.perf_counter() - start
+            persistent_map.close()
+
+            start = time.perf_counter()
+            array_map = ArrayHashMap()
+            for key in range(n):
+                array_map.insert(key * 7919, value_of(key * 7919))
+            rebuilt = time.perf_counter() - start
+            del array_map
+
+            print(f"{n:>12,} {built:>8.1f} {warm * 1e3:>12.3f} {os.path.getsize(path) / 2**20:>10.1f} "
+                  f"{rebuilt:>23.2f}")
+            n *= 10
+        n //= 10
+
+        context = get_context("fork")
+        barrier = context.Manager().Barrier(readers)
+        with context.Pool(readers) as pool:
+            results = pool.starmap(reader, [(path, n, 200_000, seed, barrier) for seed in range(readers)])
+        print(f"\n{readers} reader processes on the {n:,}-entry map")
+        for i, (opened, rate, memory) in enumerate(results):
+            shared = "n/a" if memory is None else f"{memory[0]:,} KiB shared, {memory[1]:,} KiB private"
+            print(f"  reader {i}: open {opened * 1e3:.3f} ms, {rate:,.0f} lookups/s, {shared}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
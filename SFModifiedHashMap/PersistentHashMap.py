@@ -0,0 +1,252 @@
+'''
+    Disk-backed CustomHashMap for integer keys and bytes values.
+
+    Two memory-mapped files:
+      <path>       index: a 64-byte header, then `capacity` fixed-width slots
+                   (key int64, value offset uint64, value length uint32, state)
+      <path>.heap  values, appended back to back; a slot points into it
+
+    Opening a map only maps the files and reads the header, so it costs the
+    same for 1k entries as for 100M; pages are faulted in by the lookups that
+    touch them. Read-only maps share those pages with every other process
+    mapping the same files, and get_view() returns a memoryview straight
+    into the shared heap without copying.
+
+    One process writes at a time. Readers get a consistent view of a map
+    that is not being written (build it, flush or close it, then open readers).
+    The header carries an `open` flag that a writer sets on open and clears
+    on close(); a map whose writer died without closing (crash, os._exit)
+    still has it set, and the next open rebuilds size, tombstones and
+    heap_end from the slots instead of trusting the stale header, so new
+    values are never appended over live ones.
+
+    Linear probing from the top bits of a mixed hash, with tombstones; growing the table writes
+    a new index file and swaps it in, leaving the heap untouched. Values that
+    are overwritten or removed stay in the heap until the map is rebuilt.
+'''
+import mmap
+import os
+import struct
+
+from SFModifiedHashMap.RobinHoodHashMap import _mix, _shift
+
+EMPTY, OCCUPIED, TOMBSTONE = 0, 1, 2
+
+_MAGIC = b"CHMAP002"   # 002: home slot from the top bits of _mix
+_HEADER = struct.Struct("<8sQQQQQ")    # magic, capacity, size, tombstones, heap_end, open
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<qQIB3x")       # key, offset, length, state
+_HEAP_MIN = 4096
+
+
+class PersistentHashMap:
+    MAX_LOAD = 0.7
+
+    def __init__(self, path: str, capacity=1024, readonly=False):
+        self.path = path
+        self.heap_path = path + ".heap"
+        self.readonly = readonly
+        self.retired = []   # heap maps replaced while a get_view() memoryview still used them
+        if not os.path.exists(path):
+            if readonly:
+                raise FileNotFoundError(path)
+            self._create_index(path, 1 << max(3, (capacity - 1).bit_length()))
+            with open(self.heap_path, "wb") as f:
+                f.truncate(_HEAP_MIN)
+        self._open()
+
+    # --- Files ---
+
+    @staticmethod
+    def _create_index(path, capacity, size=0, tombstones=0, heap_end=0):
+        with open(path, "wb") as f:
+            f.truncate(_HEADER_SIZE + capacity * _SLOT.size)
+            f.write(_HEADER.pack(_MAGIC, capacity, size, tombstones, heap_end, 0))
+
+    def _write_header(self, writing):
+        _HEADER.pack_into(self.index, 0, _MAGIC, self.capacity, self.size, self.tombstones, self.heap_end,
+                          int(writing))
+
+    def _open(self):
+        mode, access = ("rb", mmap.ACCESS_READ) if self.readonly else ("r+b", mmap.ACCESS_WRITE)
+        self.index_file = open(self.path, mode)
+        self.heap_file = open(self.heap_path, mode)
+        self.index = mmap.mmap(self.index_file.fileno(), 0, access=access)
+        self.heap = mmap.mmap(self.heap_file.fileno(), 0, access=access)
+        magic, self.capacity, self.size, self.tombstones, self.heap_end, writing = _HEADER.unpack_from(self.index, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a PersistentHashMap index")
+        self.mask = self.capacity - 1
+        self.shift = _shift(self.capacity)
+        if writing:
+            self._recover()
+        if not self.readonly:
+            self._write_header(writing=True)
+
+    def _recover(self):
+        # The last writer did not close the map: its header counts are stale
+        self.size = self.tombstones = self.heap_end = 0
+        with memoryview(self.index) as view:
+            for key, offset, length, state in _SLOT.iter_unpack(view[_HEADER_SIZE:]):
+                if state == OCCUPIED:
+                    self.size += 1
+                    self.heap_end = max(self.heap_end, offset + length)
+                elif state == TOMBSTONE:
+                    self.tombstones += 1
+
+    def _close_maps(self):
+        self.index.close()
+        self.heap.close()
+        self.retired.clear()   # each is unmapped once its last memoryview is released
+        self.index_file.close()
+        self.heap_file.close()
+
+    def flush(self, writing=True):
+        if not self.readonly:
+            self._write_header(writing)
+            self.index.flush()
+            self.heap.flush()
+
+    def close(self):
+        self.flush(writing=False)
+        self._close_maps()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # --- Lookups ---
+
+    def _find(self, key):
+        """(slot offset, offset, length) for key, or None"""
+        index, mask, unpack = self.index, self.mask, _SLOT.unpack_from
+        slot = _mix(key) >> self.shift
+        while True:
+            position = _HEADER_SIZE + slot * _SLOT.size
+            stored, offset, length, state = unpack(index, position)
+            if state == EMPTY:
+                return None
+            if state == OCCUPIED and stored == key:
+                return position, offset, length
+            slot = (slot + 1) & mask
+
+    def get(self, key):
+        found = self._find(key)
+        if found is None:
+            return None
+        _, offset, length = found
+        return self.heap[offset:offset + length]
+
+    def get_view(self, key):
+        """
+        Zero-copy memoryview into the heap (keep read-only maps open while it is in use).
+        A writer that grows the heap while a view is alive keeps the old mapping
+        around for it until close(), so the view stays valid.
+        """
+        found = self._find(key)
+        if found is None:
+            return None
+        _, offset, length = found
+        return memoryview(self.heap)[offset:offset + length]
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __len__(self):
+        return self.size
+
+    def items(self):
+        for slot in range(self.capacity):
+            key, offset, length, state = _SLOT.unpack_from(self.index, _HEADER_SIZE + slot * _SLOT.size)
+            if state == OCCUPIED:
+                yield key, self.heap[offset:offset + length]
+
+    # --- Writes ---
+
+    def _append(self, value: bytes):
+        end = self.heap_end + len(value)
+        if end > len(self.heap):
+            new_size = max(end, 2 * len(self.heap))
+            self.heap.flush()
+            try:
+                self.heap.close()
+            except BufferError:
+                # A get_view() memoryview still points into it: keep it mapped (the file
+                # only grows, so the view stays valid) and map the larger file alongside
+                self.retired.append(self.heap)
+            os.ftruncate(self.heap_file.fileno(), new_size)
+            self.heap = mmap.mmap(self.heap_file.fileno(), 0, access=mmap.ACCESS_WRITE)
+        offset = self.heap_end
+        self.heap[offset:end] = value
+        self.heap_end = end
+        return offset
+
+    def insert(self, key: int, value: bytes):
+        if self.readonly:
+            raise PermissionError("map was opened read-only")
+        index, mask = self.index, self.mask
+        slot = _mix(key) >> self.shift
+        free = None  # first tombstone on the probe path
+        while True:
+            position = _HEADER_SIZE + slot * _SLOT.size
+            stored, _, _, state = _SLOT.unpack_from(index, position)
+            if state == EMPTY:
+                break
+            if state == OCCUPIED and stored == key:
+                _SLOT.pack_into(index, position, key, self._append(value), len(value), OCCUPIED)
+                return
+            if state == TOMBSTONE and free is None:
+                free = position
+            slot = (slot + 1) & mask
+        if free is not None:
+            position = free
+            self.tombstones -= 1
+        _SLOT.pack_into(index, position, key, self._append(value), len(value), OCCUPIED)
+        self.size += 1
+        if self.size + self.tombstones > self.capacity * self.MAX_LOAD:
+            self._resize(self.capacity * 2 if self.size > self.capacity * self.MAX_LOAD / 2 else self.capacity)
+
+    def remove(self, key: int):
+        if self.readonly:
+            raise PermissionError("map was opened read-only")
+        found = self._find(key)
+        if found is None:
+            return
+        position = found[0]
+        _SLOT.pack_into(self.index, position, 0, 0, 0, TOMBSTONE)
+        self.size -= 1
+        self.tombstones += 1
+
+    def _resize(self, capacity):
+        # Write the new index next to the old one, then swap it in by rename
+        tmp_path = self.path + ".tmp"
+        self._create_index(tmp_path, capacity, self.size, 0, self.heap_end)
+        mask, shift = capacity - 1, _shift(capacity)
+        with open(tmp_path, "r+b") as f, mmap.mmap(f.fileno(), 0) as new_index, \
+                memoryview(self.index) as old_index:
+            for key, offset, length, state in _SLOT.iter_unpack(old_index[_HEADER_SIZE:]):
+                if state == OCCUPIED:
+                    slot = _mix(key) >> shift
+                    while new_index[_HEADER_SIZE + slot * _SLOT.size + 20]:  # state byte
+                        slot = (slot + 1) & mask
+                    _SLOT.pack_into(new_index, _HEADER_SIZE + slot * _SLOT.size, key, offset, length, OCCUPIED)
+            new_index.flush()
+        self.flush()
+        self._close_maps()
+        os.replace(tmp_path, self.path)
+        self._open()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), "demo.chm")
+    with PersistentHashMap(path, capacity=5) as persistentMap:
+        for key in (1, 11, 21, 31, 41):
+            persistentMap.insert(key, f"value-{key}".encode())
+        persistentMap.remove(21)
+    with PersistentHashMap(path, readonly=True) as persistentMap:
+        print(len(persistentMap), persistentMap.get(21), bytes(persistentMap.get_view(41)))
@@ -0,0 +1,78 @@
+'''
+    Benchmark: linear probing on hash(key) (CustomHashMap, ArrayHashMap)
+    versus Robin Hood probing on a mixed hash (RobinHoodHashMap) under
+    adversarial key patterns. hash() is the identity for ints, so strided
+    and high-bit keys pile onto a few home slots in the linear-probing maps.
+    Reports build time, average/max probe length and hit/miss lookup time.
+
+    python -m SFModifiedHashMap.ProbingBenchmark [n]
+'''
+import random
+import sys
+import time
+
+from SFModifiedHashMap.CustomHashMap import CustomHashMap
+from SFModifiedHashMap.ArrayHashMap import ArrayHashMap
+from SFModifiedHashMap.RobinHoodHashMap import RobinHoodHashMap, _mix
+
+
+def probe_lengths(hash_map, keys):
+    if isinstance(hash_map, RobinHoodHashMap):
+        return [hash_map.probes[hash_map._find(key, _mix(hash(key)))] for key in keys]
+    if isinstance(hash_map, ArrayHashMap):
+        found = [hash_map._find(key, hash(key)) for key in keys]
+    else:
+        found = [hash_map._find(key) for key in keys]
+    return [(index - hash(key) % hash_map.capacity) % hash_map.capacity + 1 for key, index in zip(keys, found)]
+
+
+PATTERNS = {
+    "sequential": lambda n, rng: list(range(n)),
+    "stride 1024": lambda n, rng: [k * 1024 for k in range(n)],
+    "high bits <<32": lambda n, rng: [k << 32 for k in range(n)],
+    "high bits <<48": lambda n, rng: [k << 48 for k in range(n)],
+    "high bits <<52": lambda n, rng: [k << 52 for k in range(n)],
+    "random str": lambda n, rng: [f"user:{rng.getrandbits(48):x}" for _ in range(n)],
+}
+
+
+def run(map_class, keys, misses):
+    hash_map = map_class()
+    start = time.perf_counter()
+    for key in keys:
+        hash_map.insert(key, key)
+    build = time.perf_counter() - start
+
+    get = hash_map.get
+    start = time.perf_counter()
+    for key in keys:
+        get(key)
+    hit = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in misses:
+        get(key)
+    miss = time.perf_counter() - start
+
+    probes = probe_lengths(hash_map, keys)
+    return build / len(keys) * 1e9, sum(probes) / len(probes), max(probes), hit / len(keys) * 1e9, \
+        miss / len(misses) * 1e9
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rng = random.Random(11)
+    print(f"n = {n:,}")
+    print(f"{'pattern':>14} {'map':>17} {'insert ns':>10} {'avg probe':>10} {'max probe':>10} "
+          f"{'hit ns':>8} {'miss ns':>8}")
+    for pattern, make_keys in PATTERNS.items():
+        keys = make_keys(n, rng)
+        # Misses drawn from the same pattern, just past the inserted range
+        misses = make_keys(2 * n, rng)[n:] if pattern != "random str" else make_keys(n, rng)
+        for map_class in (CustomHashMap, ArrayHashMap, RobinHoodHashMap):
+            build, avg_probe, max_probe, hit, miss = run(map_class, keys, misses)
+            print(f"{pattern:>14} {map_class.__name__:>17} {build:>10.0f} {avg_probe:>10.2f} {max_probe:>10} "
+                  f"{hit:>8.0f} {miss:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
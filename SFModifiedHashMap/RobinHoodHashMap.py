@@ -0,0 +1,162 @@
+'''
+    Open-addressing hash map with Robin Hood probing.
+
+    * hash(key) is multiplied by 2^64 / golden ratio (Fibonacci hashing) and
+      the home slot is the top log2(capacity) bits of the 64-bit product
+      (mix >> shift). Those bits depend on every bit of the key, so
+      clustered integer keys (1, 11, 21, ..., multiples of the capacity,
+      keys whose low 40+ bits are zero) spread over the whole table. The
+      low bits of the product would not: they ignore the key's high bits.
+    * On insert, an entry that has probed further than the slot's occupant
+      takes the slot and the occupant moves on ("take from the rich"), which
+      keeps probe lengths short and even.
+    * Lookups stop as soon as they pass a slot whose occupant is closer to
+      home than the key would be, so misses are as cheap as hits.
+    * remove() shifts the following entries back one slot instead of
+      leaving a tombstone.
+    * Probe length is capped at MAX_PROBE; an insert that would exceed it
+      grows the table instead.
+'''
+from array import array
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(h):
+    # 2^64 / golden ratio; works on negative hashes too (two's complement & mask).
+    # Take the home slot from the top bits: _mix(h) >> _shift(capacity)
+    return (h * 0x9E3779B97F4A7C15) & _MASK64
+
+
+def _shift(capacity):
+    return 65 - capacity.bit_length()   # 64 - log2(capacity) for a power of two
+
+
+class RobinHoodHashMap:
+    MAX_LOAD = 0.8
+    MIN_LOAD = 0.2
+    MAX_PROBE = 255   # probe lengths are stored in a bytearray
+
+    def __init__(self, capacity=16):
+        capacity = 1 << max(3, (capacity - 1).bit_length())
+        self.min_capacity = capacity
+        self.size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.shift = _shift(capacity)
+        self.hashes = array("Q", bytes(8 * capacity))
+        self.keys = [None] * capacity
+        self.values = [None] * capacity
+        self.probes = bytearray(capacity)  # 1 + distance from the home slot; 0 = empty
+
+    def _find(self, key, h):
+        probes, hashes, keys, mask = self.probes, self.hashes, self.keys, self.mask
+        index = h >> self.shift
+        probe = 1
+        while probes[index] >= probe:
+            if hashes[index] == h:
+                stored = keys[index]
+                if stored is key or stored == key:
+                    return index
+            index = (index + 1) & mask
+            probe += 1
+        return None
+
+    def get(self, key):
+        h = _mix(hash(key))
+        probes, hashes, keys, mask = self.probes, self.hashes, self.keys, self.mask
+        index = h >> self.shift
+        probe = 1
+        while probes[index] >= probe:
+            if hashes[index] == h:
+                stored = keys[index]
+                if stored is key or stored == key:
+                    return self.values[index]
+            index = (index + 1) & mask
+            probe += 1
+        return None
+
+    def __contains__(self, key):
+        return self._find(key, _mix(hash(key))) is not None
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, key, value):
+        h = _mix(hash(key))
+        index = self._find(key, h)
+        if index is not None:
+            self.values[index] = value
+            return
+        if self.size + 1 > self.capacity * self.MAX_LOAD:
+            self._resize(self.capacity * 2)
+        self.size += 1
+        self._place(h, key, value)
+
+    def _place(self, h, key, value):
+        """Robin Hood insert of a key known to be absent"""
+        while True:
+            probes, hashes, keys, values, mask = self.probes, self.hashes, self.keys, self.values, self.mask
+            index = h >> self.shift
+            probe = 1
+            while probe <= self.MAX_PROBE:
+                occupant = probes[index]
+                if occupant == 0:
+                    probes[index], hashes[index], keys[index], values[index] = probe, h, key, value
+                    return
+                if occupant < probe:
+                    # The occupant is richer (closer to home): take its slot, carry it on
+                    probes[index], probe = probe, occupant
+                    hashes[index], h = h, hashes[index]
+                    keys[index], key = key, keys[index]
+                    values[index], value = value, values[index]
+                index = (index + 1) & mask
+                probe += 1
+            # Probe cap hit: grow, then place whatever entry is being carried
+            self._resize(self.capacity * 2)
+
+    def remove(self, key):
+        index = self._find(key, _mix(hash(key)))
+        if index is None:
+            return
+        probes, hashes, keys, values, mask = self.probes, self.hashes, self.keys, self.values, self.mask
+        # Backward shift: pull followers one slot closer to home until an
+        # empty slot or an entry already at home
+        following = (index + 1) & mask
+        while probes[following] > 1:
+            probes[index] = probes[following] - 1
+            hashes[index] = hashes[following]
+            keys[index] = keys[following]
+            values[index] = values[following]
+            index, following = following, (following + 1) & mask
+        probes[index] = 0
+        keys[index] = values[index] = None
+        self.size -= 1
+        if self.capacity > self.min_capacity and self.size < self.capacity * self.MIN_LOAD:
+            self._resize(self.capacity // 2)
+
+    def _resize(self, capacity):
+        old_probes, old_hashes, old_keys, old_values = self.probes, self.hashes, self.keys, self.values
+        self._allocate(capacity)
+        for i in range(len(old_probes)):
+            if old_probes[i]:
+                self._place(old_hashes[i], old_keys[i], old_values[i])
+
+    def items(self):
+        for i in range(self.capacity):
+            if self.probes[i]:
+                yield self.keys[i], self.values[i]
+
+    def max_probe(self):
+        return max(self.probes, default=0)
+
+
+if __name__ == "__main__":
+    robinMap = RobinHoodHashMap(5)
+    for key in (1, 11, 21, 31, 41):
+        robinMap.insert(key, key)
+    robinMap.remove(21)
+    print(robinMap.capacity, robinMap.max_probe(), list(robinMap.items()), robinMap.get(21), robinMap.get(41))
@@ -0,0 +1,71 @@
+'''
+    Benchmark: CustomHashMap (one Entry object per slot) versus ArrayHashMap
+    (parallel flat arrays) at n entries. Reports bytes per entry from
+    tracemalloc (keys and values are shared ints, so only the map's own
+    storage is counted), insert time, and hit/miss lookup time.
+
+    python -m SFModifiedHashMap.StorageBenchmark [n]
+'''
+import random
+import sys
+import time
+import tracemalloc
+
+from SFModifiedHashMap.CustomHashMap import CustomHashMap
+from SFModifiedHashMap.ArrayHashMap import ArrayHashMap
+
+
+def build(map_class, keys):
+    hash_map = map_class()
+    for key in keys:
+        hash_map.insert(key, key)
+    return hash_map
+
+
+def measure(map_class, keys, lookups, misses):
+    # Memory from one traced build, timings from an untraced one
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    hash_map = build(map_class, keys)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del hash_map
+
+    start = time.perf_counter()
+    hash_map = build(map_class, keys)
+    insert = time.perf_counter() - start
+
+    get = hash_map.get
+    start = time.perf_counter()
+    for key in lookups:
+        get(key)
+    hit = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in misses:
+        get(key)
+    miss = time.perf_counter() - start
+    return {
+        "bytes/entry": used / len(keys),
+        "insert ns": insert / len(keys) * 1e9,
+        "hit ns": hit / len(lookups) * 1e9,
+        "miss ns": miss / len(misses) * 1e9,
+        "capacity": hash_map.capacity,
+    }
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    rng = random.Random(5)
+    keys = [rng.getrandbits(62) for _ in range(n)]
+    lookups = rng.sample(keys, min(n, 1_000_000))
+    misses = [rng.getrandbits(62) | (1 << 62) for _ in range(len(lookups))]
+    print(f"n = {n:,} random 62-bit int keys")
+    print(f"{'map':>14} {'bytes/entry':>12} {'insert ns':>10} {'hit ns':>8} {'miss ns':>8} {'capacity':>12}")
+    for map_class in (CustomHashMap, ArrayHashMap):
+        r = measure(map_class, keys, lookups, misses)
+        print(f"{map_class.__name__:>14} {r['bytes/entry']:>12.1f} {r['insert ns']:>10.0f} {r['hit ns']:>8.0f} "
+              f"{r['miss ns']:>8.0f} {r['capacity']:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+'''
+    Benchmark: rolls/sec of NormalDice (random.randint per roll) against
+    SeededDice (blocks from a NumPy generator) for a few block sizes, and
+    games/sec of Game.start on the classic board with each dice (stdout
+    redirected to an in-memory buffer).
+
+    cd SnakeLadder && python DiceBenchmark.py [rolls]
+'''
+from contextlib import redirect_stdout
+import io
+import sys
+import time
+
+from SeededDice import SeededDice
+from SimulationBenchmark import make_board
+from SnakeLadder import Game, NormalDice, Player
+
+
+def rolls_per_second(dice, rolls):
+    roll = dice.roll
+    start = time.perf_counter()
+    for _ in range(rolls):
+        roll()
+    return rolls / (time.perf_counter() - start)
+
+
+def games_per_second(board, make_dice, games):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for game in range(games):
+            Game(board, [Player("A"), Player("B")], make_dice(game)).start()
+    return games / (time.perf_counter() - start)
+
+
+def main():
+    rolls = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    baseline = rolls_per_second(NormalDice(), rolls)
+    print(f"{'NormalDice (randint)':<26} {baseline:>12,.0f} rolls/s")
+    for block in (64, 4096, 65536):
+        rate = rolls_per_second(SeededDice(1, block=block), rolls)
+        print(f"{f'SeededDice block={block}':<26} {rate:>12,.0f} rolls/s  ({rate / baseline:.1f}x)")
+
+    board, games = make_board(), max(1, rolls // 200)
+    normal = games_per_second(board, lambda game: NormalDice(), games)
+    seeded = games_per_second(board, lambda game: SeededDice(1, stream=game, block=256), games)
+    print(f"Game.start, {games:,} games: NormalDice {normal:,.0f} games/s, "
+          f"SeededDice (one stream per game) {seeded:,.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+'''
+    Many concurrent SnakeLadder games on one shared board.
+
+    GameManager keeps every table in fixed-size slots of a few NumPy arrays
+    (positions[game, seat], whose turn it is, turns played, winner) next to
+    one read-only CompiledBoard, instead of a Game object and a deque of
+    Players per table. advance() plays one turn in every running game with
+    a handful of array operations. The moves are reported with the same
+    messages Game.play_turn prints, prefixed with the game id, to a
+    BufferedSink that writes them to its stream in large batches.
+
+    serve() drives the manager from an asyncio event loop: one round per
+    iteration, either inline (yielding to other tasks between rounds) or
+    in an executor so the loop stays free while a round runs. Games may be
+    created and removed from other tasks while it serves; a lock keeps them
+    out of a round in progress.
+'''
+import asyncio
+from threading import Lock
+
+import numpy as np
+
+from SnakeLadder import Board, Dice, NormalDice
+from Simulation import CompiledBoard, _faces, next_positions, roll_indices
+
+
+class BufferedSink:
+    def __init__(self, stream, buffer_lines=8192):
+        self.stream = stream
+        self.buffer_lines = buffer_lines
+        self.lines = []
+
+    def write_lines(self, lines):
+        self.lines.extend(lines)
+        if len(self.lines) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.stream.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+        self.stream.flush()
+
+
+class GameManager:
+    def __init__(self, board, dice: Dice = None, sink: BufferedSink = None, max_players=4, capacity=1024, rng=None):
+        """
+        :param board: Board or CompiledBoard, shared by every game
+        :param rng: numpy Generator, or a seed for one
+        :param capacity: game slots to start with (at least 1); doubled whenever they run out
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.board = board if isinstance(board, CompiledBoard) else CompiledBoard.from_board(board)
+        self.size = self.board.size
+        faces, self.probabilities = _faces(dice or NormalDice())
+        self.next = next_positions(self.board, faces)
+        self.rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        self.sink = sink
+        self.max_players = max_players
+        self.lock = Lock()
+
+        self.positions = np.zeros((capacity, max_players), dtype=np.int32)
+        self.players = np.zeros(capacity, dtype=np.int64)    # seats taken, 0 for a free slot
+        self.seat = np.zeros(capacity, dtype=np.int64)       # whose turn it is
+        self.turns = np.zeros(capacity, dtype=np.int64)
+        self.winners = np.full(capacity, -1, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.names = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def _grow(self):
+        capacity = len(self.active)
+        self.positions = np.vstack([self.positions, np.zeros_like(self.positions)])
+        self.players, self.seat, self.turns = (np.concatenate([a, np.zeros_like(a)])
+                                               for a in (self.players, self.seat, self.turns))
+        self.winners = np.concatenate([self.winners, np.full(capacity, -1, dtype=np.int64)])
+        self.active = np.concatenate([self.active, np.zeros(capacity, dtype=bool)])
+        self.names.extend([None] * capacity)
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def create_game(self, player_names: list) -> int:
+        if not 0 < len(player_names) <= self.max_players:
+            raise ValueError(f"A game needs 1 to {self.max_players} players")
+        with self.lock:
+            if not self.free:
+                self._grow()
+            game_id = self.free.pop()
+            self.positions[game_id] = 0
+            self.players[game_id] = len(player_names)
+            self.seat[game_id] = self.turns[game_id] = 0
+            self.winners[game_id] = -1
+            self.active[game_id] = True
+            self.names[game_id] = list(player_names)
+            return game_id
+
+    def remove_game(self, game_id: int):
+        """Frees the slot of a game, finished or not; its id may be handed out again"""
+        with self.lock:
+            self._names(game_id)
+            self.active[game_id] = False
+            self.players[game_id] = 0
+            self.names[game_id] = None
+            self.free.append(game_id)
+
+    def _names(self, game_id: int) -> list:
+        names = self.names[game_id]
+        if names is None:
+            raise KeyError(game_id)   # never created, or removed
+        return names
+
+    def winner(self, game_id: int):
+        """Name of the winner, or None while the game is running"""
+        names = self._names(game_id)
+        seat = self.winners[game_id]
+        return None if seat < 0 else names[seat]
+
+    def position(self, game_id: int, seat: int) -> int:
+        names = self._names(game_id)
+        if not 0 <= seat < len(names):
+            raise IndexError(f"game {game_id} has no seat {seat}")
+        return int(self.positions[game_id, seat])
+
+    def running(self) -> int:
+        return int(self.active.sum())
+
+    def advance(self) -> np.ndarray:
+        """Plays one turn in every running game; returns the ids of the games that just ended"""
+        with self.lock:
+            ids = np.flatnonzero(self.active)
+            if len(ids) == 0:
+                return ids
+            seats = self.seat[ids]
+            moved = self.next[self.positions[ids, seats], roll_indices(self.rng, self.probabilities, len(ids))]
+            self.positions[ids, seats] = moved
+            self.turns[ids] += 1
+            won = moved == self.size
+            finished = ids[won]
+            self.winners[finished] = seats[won]
+            self.active[finished] = False
+            self.seat[ids] = np.where(won, seats, (seats + 1) % self.players[ids])
+            if self.sink is not None:
+                self._log(ids, seats, moved, finished)
+            return finished
+
+    def _log(self, ids, seats, moved, finished):
+        names = self.names
+        lines = [f"[{game}] {names[game][seat]} moved to {position}"
+                 for game, seat, position in zip(ids.tolist(), seats.tolist(), moved.tolist())]
+        lines.extend(f"[{game}] {self.winner(game)} wins!" for game in finished.tolist())
+        self.sink.write_lines(lines)
+
+    async def serve(self, executor=None, idle=0.01, stop: asyncio.Event = None):
+        """
+        Advances all running games round after round until `stop` is set
+        (or, without one, until no game is running). Rounds run in `executor`
+        when given; otherwise inline, yielding to other tasks between rounds.
+        """
+        loop = asyncio.get_running_loop()
+        while not (stop.is_set() if stop is not None else not self.active.any()):
+            if not self.active.any():
+                await asyncio.sleep(idle)
+            elif executor is not None:
+                await loop.run_in_executor(executor, self.advance)
+            else:
+                self.advance()
+                await asyncio.sleep(0)
+        if self.sink is not None:
+            self.sink.flush()
+
+
+if __name__ == "__main__":
+    import sys
+
+    board = Board(100)
+    board.add_snake(99, 2)
+    board.add_snake(95, 13)
+    board.add_ladder(4, 90)
+    board.add_ladder(10, 40)
+    manager = GameManager(board, sink=BufferedSink(sys.stdout), rng=7)
+    games = [manager.create_game(["Alice", "Bob"]) for _ in range(3)]
+    asyncio.run(manager.serve())
+    print({game: manager.winner(game) for game in games})
@@ -0,0 +1,60 @@
+'''
+    Benchmark: turns/sec of GameManager as the number of concurrent games
+    grows, with move logs going to a BufferedSink over an in-memory stream
+    and with no sink at all, against one Game object per table stepped with
+    play_turn (its prints going to an in-memory buffer as well).
+
+    Every table is refilled as soon as it finishes, so the number of running
+    games stays constant during a measurement.
+
+    cd SnakeLadder && python GameServerBenchmark.py [rounds]
+'''
+from contextlib import redirect_stdout
+import io
+import sys
+import time
+
+from GameServer import BufferedSink, GameManager
+from SimulationBenchmark import make_board
+from SnakeLadder import Game, NormalDice, Player
+
+
+def game_objects_turns_per_second(board, games, rounds):
+    tables = [Game(board, [Player("A"), Player("B")], NormalDice()) for _ in range(games)]
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(rounds):
+            for index, game in enumerate(tables):
+                if game.play_turn():
+                    tables[index] = Game(board, [Player("A"), Player("B")], NormalDice())
+    return games * rounds / (time.perf_counter() - start)
+
+
+def manager_turns_per_second(board, games, rounds, sink):
+    manager = GameManager(board, sink=sink, capacity=games, rng=1)
+    for _ in range(games):
+        manager.create_game(["A", "B"])
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for game in manager.advance().tolist():
+            manager.remove_game(game)
+            manager.create_game(["A", "B"])
+    if sink is not None:
+        sink.flush()
+    return games * rounds / (time.perf_counter() - start)
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    board = make_board()
+    print(f"{'games':>8} {'Game objects':>14} {'manager+sink':>14} {'manager':>14}   turns/s")
+    for games in (10, 100, 1_000, 10_000, 100_000):
+        objects = game_objects_turns_per_second(board, games, max(1, 20_000 // games)) if games <= 10_000 else None
+        logged = manager_turns_per_second(board, games, rounds, BufferedSink(io.StringIO()))
+        silent = manager_turns_per_second(board, games, rounds, None)
+        objects = f"{objects:>14,.0f}" if objects else f"{'-':>14}"
+        print(f"{games:>8,} {objects} {logged:>14,.0f} {silent:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
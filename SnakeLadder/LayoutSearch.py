@@ -0,0 +1,161 @@
+'''
+    Search for snake/ladder layouts with a target game length.
+
+    A layout is a sorted tuple of (start, end) jumps: a snake when end < start,
+    a ladder otherwise, at most one per start cell. LayoutSearch runs a simple
+    evolutionary loop (keep the best, mutate them, add fresh random layouts)
+    and scores each candidate by how far the mean and standard deviation of
+    the game length are from the targets, both relative to the target.
+
+    Candidates are scored in a process pool, with either the exact
+    MarkovChain length distribution or simulate(); a layout never goes to the
+    pool twice, since every score is cached by layout. Scoring works on a
+    CompiledBoard built straight from the jumps, so boards of 10k cells cost
+    no per-cell Tile objects; build_board() turns the winner into a Board.
+'''
+from concurrent.futures import ProcessPoolExecutor
+import math
+import time
+
+import numpy as np
+
+from Markov import MarkovChain
+from Simulation import CompiledBoard, simulate
+from SnakeLadder import Board
+
+
+def build_board(size, layout) -> Board:
+    board = Board(size)
+    for start, end in layout:
+        if end < start:
+            board.add_snake(start, end)
+        else:
+            board.add_ladder(start, end)
+    return board
+
+
+def compile_layout(size, layout) -> CompiledBoard:
+    jumps = np.arange(size + 1, dtype=np.int32)
+    for start, end in layout:
+        jumps[start] = end
+    return CompiledBoard(size, jumps)
+
+
+def layout_stats(size, layout, players=2, method="markov", games=20_000, seed=0):
+    """(mean, standard deviation) of the game length in turns; inf if games may never end"""
+    compiled = compile_layout(size, layout)
+    if method == "markov":
+        distribution = MarkovChain(compiled).length_distribution(players)
+        if distribution.sum() < 1 - 1e-6:
+            return math.inf, math.inf
+        turns = np.arange(len(distribution))
+        mean = float((turns * distribution).sum())
+        return mean, math.sqrt(max(0.0, float((turns * turns * distribution).sum()) - mean * mean))
+    if method == "simulate":
+        result = simulate(compiled, players, games, rng=seed, max_turns=100 * size)
+        if result.unfinished():
+            return math.inf, math.inf
+        return float(result.lengths.mean()), float(result.lengths.std())
+    raise ValueError("Unknown scoring method")
+
+
+def _layout_stats(args):
+    return layout_stats(*args)
+
+
+class LayoutSearch:
+    def __init__(self, size, target_mean, target_std, snakes=8, ladders=8, players=2,
+                 method="markov", workers=None, seed=None):
+        """
+        :param workers: processes scoring candidates; 1 scores in this process
+        """
+        if snakes + ladders > size - 2:
+            raise ValueError("Board is too small for that many snakes and ladders")
+        self.size = size
+        self.target_mean = target_mean
+        self.target_std = target_std
+        self.snakes = snakes
+        self.ladders = ladders
+        self.players = players
+        self.method = method
+        self.workers = workers
+        self.rng = np.random.default_rng(seed)
+        self.cache = {}   # layout -> (mean, std)
+        self.evaluated = self.cache_hits = 0
+        self.scoring_time = 0.0
+
+    # --- Candidates ---
+
+    def _jump(self, ladder, taken):
+        # Start cells are 1..size-1; a ladder ends below the last cell
+        while True:
+            start = int(self.rng.integers(1, self.size - 1)) if ladder else int(self.rng.integers(2, self.size))
+            if start not in taken:
+                break
+        end = int(self.rng.integers(start + 1, self.size)) if ladder else int(self.rng.integers(1, start))
+        return start, end
+
+    def random_layout(self) -> tuple:
+        jumps, taken = [], set()
+        for ladder in [False] * self.snakes + [True] * self.ladders:
+            jump = self._jump(ladder, taken)
+            taken.add(jump[0])
+            jumps.append(jump)
+        return tuple(sorted(jumps))
+
+    def mutate(self, layout) -> tuple:
+        """Replaces one jump with a random jump of the same kind"""
+        jumps = list(layout)
+        index = int(self.rng.integers(len(jumps)))
+        start, end = jumps.pop(index)
+        jumps.append(self._jump(end > start, {jump[0] for jump in jumps}))
+        return tuple(sorted(jumps))
+
+    # --- Scoring ---
+
+    def score(self, stats) -> float:
+        mean, std = stats
+        return ((mean - self.target_mean) / self.target_mean) ** 2 + ((std - self.target_std) / self.target_std) ** 2
+
+    def evaluate(self, layouts, pool=None) -> list:
+        """Scores of `layouts`, scoring only the ones not seen before"""
+        start = time.perf_counter()
+        new = list(dict.fromkeys(layout for layout in layouts if layout not in self.cache))
+        self.cache_hits += len(layouts) - len(new)
+        args = [(self.size, layout, self.players, self.method) for layout in new]
+        results = pool.map(_layout_stats, args, chunksize=max(1, len(args) // 16)) if pool else map(_layout_stats, args)
+        for layout, stats in zip(new, results):
+            self.cache[layout] = stats
+        self.evaluated += len(new)
+        self.scoring_time += time.perf_counter() - start
+        return [self.score(self.cache[layout]) for layout in layouts]
+
+    def candidates_per_second(self) -> float:
+        return self.evaluated / self.scoring_time if self.scoring_time else 0.0
+
+    def run(self, generations=20, population=32, keep=8):
+        """(best layout, its score) after `generations` rounds of selection and mutation"""
+        layouts = [self.random_layout() for _ in range(population)]
+        pool = ProcessPoolExecutor(self.workers) if self.workers != 1 else None
+        try:
+            for _ in range(generations):
+                scores = self.evaluate(layouts, pool)
+                ranked = [layout for _, layout in sorted(zip(scores, layouts))]
+                parents = ranked[:keep]
+                fresh = [self.random_layout() for _ in range(population // 8)]
+                children = [self.mutate(parents[int(self.rng.integers(len(parents)))])
+                            for _ in range(population - len(parents) - len(fresh))]
+                layouts = parents + children + fresh
+            scores = self.evaluate(layouts, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        best = min(range(len(layouts)), key=scores.__getitem__)
+        return layouts[best], scores[best]
+
+
+if __name__ == "__main__":
+    search = LayoutSearch(100, target_mean=60, target_std=30, seed=1)
+    layout, score = search.run(generations=10)
+    print(f"best {layout}\nscore {score:.5f}, mean/std {search.cache[layout]}, "
+          f"{search.evaluated} scored at {search.candidates_per_second():.0f}/s, {search.cache_hits} cache hits")
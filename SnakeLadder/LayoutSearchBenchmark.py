@@ -0,0 +1,30 @@
+'''
+    Benchmark: candidates scored per second by LayoutSearch on boards of
+    100, 1k and 10k cells (one snake or ladder per 10 cells, at most 400),
+    scoring in this process and in a process pool, with each scoring method.
+    Targets are scaled with the board so the search has something to do.
+
+    cd SnakeLadder && python LayoutSearchBenchmark.py [workers]
+'''
+import os
+import sys
+
+from LayoutSearch import LayoutSearch
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    print(f"{'cells':>6} {'method':>9} {'workers':>8} {'scored':>7} {'cache hits':>11} {'candidates/s':>13}")
+    for size, generations, population in ((100, 10, 32), (1_000, 4, 16), (10_000, 2, 8)):
+        jumps = min(400, size // 10)
+        for method in ("markov", "simulate"):
+            for pool_size in dict.fromkeys((1, workers)):
+                search = LayoutSearch(size, target_mean=size * 0.6, target_std=size * 0.3, snakes=jumps // 2,
+                                      ladders=jumps // 2, method=method, workers=pool_size, seed=1)
+                search.run(generations, population, keep=population // 4)
+                print(f"{size:>6,} {method:>9} {pool_size:>8} {search.evaluated:>7} {search.cache_hits:>11} "
+                      f"{search.candidates_per_second():>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
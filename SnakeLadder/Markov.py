@@ -0,0 +1,176 @@
+'''
+    Exact analysis of a SnakeLadder board as an absorbing Markov chain.
+
+    One player's position is a chain over cells 0..size: from every cell each
+    dice face leads to one cell (snakes, ladders and overshoots applied, the
+    same rules as Game.play_turn), and the last cell is absorbing. Players
+    move independently, so everything about a multi-player game follows from
+    the single-player distribution f(n) = P(first reach the last cell on move n):
+    seat k wins on its n-th move when it finishes then, the seats before it
+    have not finished in n moves and the seats after it not in n - 1.
+
+    expected_turns() solves (I - Q) t = 1 over the transient cells reachable
+    from the start; past DENSE_LIMIT cells it sums the survival function
+    instead. finish_distribution() pushes the position distribution forward
+    one move at a time (a convolution with the dice, then the jumps) until less
+    than `tol` of the mass can still finish: O(size * faces) per move and
+    no size^2 matrix.
+'''
+import numpy as np
+
+from SnakeLadder import Board, Dice, NormalDice
+from Simulation import CompiledBoard, _faces, next_positions
+
+
+class MarkovChain:
+    DENSE_LIMIT = 2000   # transient cells up to which expected_turns() uses a dense solve
+
+    def __init__(self, board, dice: Dice = None):
+        """
+        :param board: Board or CompiledBoard
+        """
+        compiled = board if isinstance(board, CompiledBoard) else CompiledBoard.from_board(board)
+        self.size = compiled.size
+        self.faces, self.probabilities = _faces(dice or NormalDice())
+        self.next = next_positions(compiled, self.faces)
+        # Faces with zero probability are not edges of the chain
+        self.next_lists = [[cell for cell, p in zip(row, self.probabilities) if p > 0]
+                           for row in self.next.tolist()]
+        self.can_finish = self._can_finish()
+        # One move: convolve the distribution with the dice, keep overshooting
+        # mass in place, then move whatever landed on a snake or ladder
+        positions = np.arange(self.size + 1)
+        self.kernel = np.zeros(min(self.faces.max(), self.size) + 1)
+        inside = self.faces <= self.size
+        np.add.at(self.kernel, self.faces[inside], self.probabilities[inside])
+        self.stay = ((positions[:, None] + self.faces[None, :] > self.size) * self.probabilities).sum(axis=1)
+        self.sources = np.flatnonzero(compiled.jumps != positions)
+        self.targets = compiled.jumps[self.sources]
+        self._finish = {}
+
+    def _can_finish(self):
+        """Boolean array: cells from which the last cell is reachable at all"""
+        previous = [[] for _ in range(self.size + 1)]
+        for cell, targets in enumerate(self.next_lists):
+            for target in targets:
+                previous[target].append(cell)
+        reached = np.zeros(self.size + 1, dtype=bool)
+        reached[self.size] = True
+        stack = [self.size]
+        while stack:
+            for cell in previous[stack.pop()]:
+                if not reached[cell]:
+                    reached[cell] = True
+                    stack.append(cell)
+        return reached
+
+    def _reachable(self, start):
+        """Sorted cells a player starting on `start` can ever stand on"""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for cell in self.next_lists[stack.pop()]:
+                if cell not in seen:
+                    seen.add(cell)
+                    stack.append(cell)
+        return np.array(sorted(seen))
+
+    def transition_matrix(self) -> np.ndarray:
+        """Dense (size + 1) x (size + 1) matrix P[i, j] = P(move from cell i to cell j)"""
+        cells = self.size + 1
+        matrix = np.zeros((cells, cells))
+        rows = np.repeat(np.arange(cells), len(self.faces))
+        np.add.at(matrix, (rows, self.next.ravel()), np.tile(self.probabilities, cells))
+        return matrix
+
+    def expected_turns(self, start=0) -> float:
+        """Expected number of moves one player needs from `start`; inf if it may never finish"""
+        if start == self.size:
+            return 0.0
+        reachable = self._reachable(start)
+        if not self.can_finish[reachable].all():
+            return float("inf")
+        transient = reachable[reachable != self.size]
+        if len(transient) > self.DENSE_LIMIT:
+            survival = 1.0 - np.cumsum(self._finish_for(start))
+            return float(survival.sum())   # E[N] = sum over n >= 0 of P(N > n)
+        # Q restricted to the transient cells, indexed by their position in `transient`
+        index = np.full(self.size + 1, -1)
+        index[transient] = np.arange(len(transient))
+        q = np.zeros((len(transient), len(transient)))
+        targets = index[self.next[transient]]
+        rows = np.repeat(np.arange(len(transient)), len(self.faces))
+        weights = np.tile(self.probabilities, len(transient))
+        inside = targets.ravel() >= 0
+        np.add.at(q, (rows[inside], targets.ravel()[inside]), weights[inside])
+        turns = np.linalg.solve(np.eye(len(transient)) - q, np.ones(len(transient)))
+        return float(turns[index[start]])
+
+    def finish_distribution(self, start=0, tol=1e-12, max_moves=10_000_000) -> np.ndarray:
+        """
+        f[n] = P(one player first reaches the last cell on move n), for
+        n = 0, 1, ... until less than `tol` of the probability can still
+        finish. Sums to P(ever finishing), which is below 1 on boards where
+        the player can get stuck.
+        """
+        cells = self.size + 1
+        distribution = np.zeros(cells)
+        distribution[start] = 1.0
+        finished = [distribution[self.size]]
+        distribution[self.size] = 0.0
+        can_finish = self.can_finish.astype(np.float64)
+        while distribution @ can_finish > tol and len(finished) <= max_moves:
+            distribution = self._step(distribution)
+            finished.append(distribution[self.size])
+            distribution[self.size] = 0.0
+        return np.array(finished)
+
+    def _step(self, distribution):
+        """Position distribution after one more move"""
+        moved = np.convolve(distribution, self.kernel)[:self.size + 1]
+        moved += distribution * self.stay
+        jumped = moved[self.sources]
+        moved[self.sources] = 0.0
+        np.add.at(moved, self.targets, jumped)
+        return moved
+
+    def _finish_for(self, start):
+        if start not in self._finish:
+            self._finish[start] = self.finish_distribution(start)
+        return self._finish[start]
+
+    def _seat_terms(self, players, start=0):
+        """terms[n - 1, k] = P(seat k wins on its n-th move)"""
+        finish = self._finish_for(start)
+        survival = 1.0 - np.cumsum(finish)   # P(not finished after n moves)
+        f, after, before = finish[1:, None], survival[1:, None], survival[:-1, None]
+        seats = np.arange(players)[None, :]
+        return f * after ** seats * before ** (players - 1 - seats)
+
+    def win_probabilities(self, players: int, start=0) -> np.ndarray:
+        return self._seat_terms(players, start).sum(axis=0)
+
+    def length_distribution(self, players: int, start=0) -> np.ndarray:
+        """
+        P(game ends on turn t) for t = 0, 1, ..., where every player's move
+        is a turn, as in SimulationResult.length_distribution
+        """
+        return np.concatenate([[0.0], self._seat_terms(players, start).ravel()])
+
+    def mean_length(self, players: int, start=0) -> float:
+        """Expected number of turns of a game, over the games that finish"""
+        distribution = self.length_distribution(players, start)
+        if distribution.sum() == 0:
+            return float("inf")
+        return float((np.arange(len(distribution)) * distribution).sum() / distribution.sum())
+
+
+if __name__ == "__main__":
+    board = Board(100)
+    board.add_snake(99, 2)
+    board.add_snake(95, 13)
+    board.add_ladder(4, 90)
+    board.add_ladder(10, 40)
+    chain = MarkovChain(board)
+    print(f"one player: {chain.expected_turns():.4f} moves; two players: {chain.mean_length(2):.4f} turns, "
+          f"win probability per seat {chain.win_probabilities(2).round(4)}")
@@ -0,0 +1,51 @@
+'''
+    Benchmark: exact MarkovChain analysis against the vectorised simulate()
+    on the classic board and on random boards of 1k and 10k cells (one snake
+    or ladder per 10 cells). Prints the time each takes and the two-player
+    mean game length and seat-0 win rate from both.
+
+    cd SnakeLadder && python MarkovBenchmark.py [games]
+'''
+import sys
+import time
+
+import numpy as np
+
+from Markov import MarkovChain
+from Simulation import CompiledBoard, simulate
+from SimulationBenchmark import make_board
+from SnakeLadder import Board
+
+
+def random_board(size, seed=0):
+    rng = np.random.default_rng(seed)
+    board = Board(size)
+    for i, cell in enumerate(rng.choice(np.arange(2, size - 1), size // 10, replace=False).tolist()):
+        if i % 2:
+            board.add_snake(cell, int(rng.integers(1, cell)))
+        else:
+            board.add_ladder(cell, int(rng.integers(cell + 1, size)))
+    return board
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    boards = [("classic 100", make_board()), ("random 1k", random_board(1_000)), ("random 10k", random_board(10_000))]
+    for name, board in boards:
+        compiled = CompiledBoard.from_board(board)
+        start = time.perf_counter()
+        chain = MarkovChain(compiled)
+        mean, wins = chain.mean_length(2), chain.win_probabilities(2)
+        exact_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = simulate(compiled, players=2, games=games, rng=1)
+        simulate_time = time.perf_counter() - start
+
+        print(f"{name:<12} markov {exact_time * 1000:>8.1f} ms  mean {mean:8.2f}  seat 0 {wins[0]:.4f}")
+        print(f"{'':<12} sim    {simulate_time * 1000:>8.1f} ms  mean {result.mean_length():8.2f}  "
+              f"seat 0 {result.win_rates()[0]:.4f}  ({games:,} games)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+'''
+    Reproducible dice for SnakeLadder.
+
+    A SeededDice is identified by (seed, stream). Its rolls come from a NumPy
+    PCG64 generator seeded with SeedSequence(seed, spawn_key=(stream,)), the
+    same child SeedSequence(seed).spawn() would hand out as number `stream`, so
+    every stream of a seed is statistically independent of the others. Give
+    each worker or each game its own stream and any game can be replayed
+    exactly from its (seed, stream) pair.
+
+    roll() hands out values from a pre-generated block of `block` rolls and
+    only goes back to the generator when the block runs out. Rolls are drawn
+    as int64, for which NumPy produces the same sequence however the draws
+    are split into blocks, so the block size never changes a replay.
+'''
+import numpy as np
+
+from SnakeLadder import Dice
+
+
+def stream_generator(seed: int, stream: int = 0) -> np.random.Generator:
+    """Generator for stream `stream` of `seed`, also usable with simulate() and GameManager"""
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(stream,))))
+
+
+class SeededDice(Dice):
+    BLOCK = 4096
+
+    def __init__(self, seed: int, stream: int = 0, faces: int = 6, block: int = BLOCK):
+        self.seed = seed
+        self.stream = stream
+        self.faces = faces
+        self.block = block
+        self.rng = stream_generator(seed, stream)
+        self.rolls = []
+        self.index = 0
+        self.rolled = 0   # rolls handed out so far
+
+    @classmethod
+    def streams(cls, seed: int, count: int, **kwargs) -> list:
+        """Dice for streams 0..count-1 of `seed`, one per worker or game"""
+        return [cls(seed, stream, **kwargs) for stream in range(count)]
+
+    def roll(self):
+        if self.index == len(self.rolls):
+            self.rolls = self.rng.integers(1, self.faces + 1, self.block, dtype=np.int64).tolist()
+            self.index = 0
+        value = self.rolls[self.index]
+        self.index += 1
+        self.rolled += 1
+        return value
+
+    def replay(self) -> "SeededDice":
+        """Fresh dice that roll exactly the sequence this one has rolled from the start"""
+        return SeededDice(self.seed, self.stream, self.faces, self.block)
+
+    def distribution(self):
+        return {face: 1 / self.faces for face in range(1, self.faces + 1)}
+
+
+if __name__ == "__main__":
+    first, second = SeededDice.streams(seed=42, count=2)
+    rolls = [first.roll() for _ in range(10)]
+    replayed = first.replay()
+    print(rolls, [second.roll() for _ in range(10)], [replayed.roll() for _ in range(10)] == rolls)
@@ -0,0 +1,143 @@
+'''
+    Headless, vectorised SnakeLadder simulation for balancing board layouts.
+
+    compile_board() turns a Board into a flat int jump array (cell -> where a
+    player standing on it ends up), calling each Tile.move exactly once.
+    simulate() then plays many games at once: player positions live in a
+    (games, players) NumPy array and every round moves the current seat of
+    all unfinished games with a single array operation. Game rules are the
+    same as Game.play_turn: an overshooting roll leaves the player in place,
+    and the first player to land exactly on the last cell wins.
+'''
+import numpy as np
+
+from SnakeLadder import Board, Dice, NormalDice
+
+
+class CompiledBoard:
+    def __init__(self, size: int, jumps: np.ndarray):
+        self.size = size
+        self.jumps = jumps
+        self.jumps.flags.writeable = False   # shared freely between games and workers
+
+    @classmethod
+    def from_board(cls, board: Board):
+        return cls(board.size, compile_board(board))
+
+
+def compile_board(board: Board) -> np.ndarray:
+    return np.array([tile.move(position) for position, tile in enumerate(board.tiles)], dtype=np.int32)
+
+
+class SimulationResult:
+    def __init__(self, lengths: np.ndarray, winners: np.ndarray, players: int):
+        self.lengths = lengths    # turns played per game (every player's move counts as a turn)
+        self.winners = winners    # winning seat per game, -1 if it hit max_turns
+        self.players = players
+
+    @property
+    def games(self):
+        return len(self.winners)
+
+    def win_rates(self) -> np.ndarray:
+        return np.bincount(self.winners[self.winners >= 0], minlength=self.players) / self.games
+
+    def length_distribution(self) -> np.ndarray:
+        """P(game ends on turn t) for t = 0, 1, ..., over finished games"""
+        finished = self.lengths[self.winners >= 0]
+        return np.bincount(finished) / max(1, len(finished))
+
+    def mean_length(self) -> float:
+        return float(self.lengths[self.winners >= 0].mean())
+
+    def unfinished(self) -> int:
+        return int((self.winners < 0).sum())
+
+
+def _faces(dice: Dice):
+    distribution = dice.distribution()
+    faces = np.array(list(distribution), dtype=np.int32)
+    probabilities = np.array(list(distribution.values()), dtype=np.float64)
+    return faces, probabilities / probabilities.sum()
+
+
+def next_positions(compiled: CompiledBoard, faces: np.ndarray) -> np.ndarray:
+    """(size + 1, len(faces)) array: where a player on each cell ends up after each face"""
+    positions = np.arange(compiled.size + 1, dtype=np.int32)[:, None]
+    moved = positions + faces[None, :]
+    landed = compiled.jumps[np.minimum(moved, compiled.size)]
+    return np.where(moved <= compiled.size, landed, positions).astype(np.int32)
+
+
+def transition_table(compiled: CompiledBoard, faces: np.ndarray) -> np.ndarray:
+    """
+    Flat table over states (position * len(faces)): the next state is
+    table[state + face index]. One extra position past the last cell loops
+    onto itself, for parking games that are already over.
+    """
+    width = len(faces)
+    parked = np.full((1, width), compiled.size + 1, dtype=np.int32)
+    return (np.vstack([next_positions(compiled, faces), parked]) * width).astype(np.int32).ravel()
+
+
+def roll_indices(rng, probabilities, count):
+    """Face indices for `count` rolls of a die with these face probabilities"""
+    if len(probabilities) == 1:
+        return np.zeros(count, dtype=np.int8)
+    if np.all(probabilities == probabilities[0]) and len(probabilities) <= 127:
+        return rng.integers(0, len(probabilities), count, dtype=np.int8)
+    indices = np.searchsorted(np.cumsum(probabilities), rng.random(count), side="right")
+    # The float cumsum can end just below 1.0; a draw above it would index past the last face
+    return np.minimum(indices, len(probabilities) - 1).astype(np.int32)
+
+
+def simulate(board, players: int, games: int, dice: Dice = None, rng=None, max_turns=100_000) -> SimulationResult:
+    """
+    :param board: Board or CompiledBoard
+    :param rng: numpy Generator, or a seed for one
+    """
+    compiled = board if isinstance(board, CompiledBoard) else CompiledBoard.from_board(board)
+    rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    faces, probabilities = _faces(dice or NormalDice())
+    table = transition_table(compiled, faces)
+    width, size = len(faces), compiled.size
+
+    lengths = np.full(games, max_turns, dtype=np.int64)
+    winners = np.full(games, -1, dtype=np.int64)
+    goal, parked = size * width, (size + 1) * width
+    # States of unfinished games, one contiguous row per seat; finished games
+    # sit in the parked state until enough of them pile up to compact
+    states = np.zeros((players, games), dtype=np.int32)
+    ids = np.arange(games)
+    parked_count = 0
+
+    for turn in range(max_turns):
+        if parked_count == len(ids):
+            break
+        seat = turn % players
+        row = states[seat]
+        row[:] = table.take(row + roll_indices(rng, probabilities, len(row)))
+        won = row == goal
+        if won.any():
+            columns = np.flatnonzero(won)
+            done = ids[columns]
+            lengths[done] = turn + 1
+            winners[done] = seat
+            states[:, columns] = parked
+            parked_count += len(columns)
+            if parked_count * 4 >= len(ids):
+                keep = states[0] != parked
+                states, ids = states[:, keep], ids[keep]
+                parked_count = 0
+
+    return SimulationResult(lengths, winners, players)
+
+
+if __name__ == "__main__":
+    board = Board(100)
+    board.add_snake(99, 2)
+    board.add_snake(95, 13)
+    board.add_ladder(4, 90)
+    board.add_ladder(10, 40)
+    result = simulate(board, players=2, games=100_000, rng=7)
+    print(f"mean turns {result.mean_length():.2f}, win rate per seat {result.win_rates()}")
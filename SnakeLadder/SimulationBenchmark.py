@@ -0,0 +1,47 @@
+'''
+    Benchmark: games/sec of Game.start (one game at a time, printing every
+    move; stdout is redirected to an in-memory buffer so the terminal is not
+    what gets measured) against the vectorised simulate().
+
+    cd SnakeLadder && python SimulationBenchmark.py [games]
+'''
+from contextlib import redirect_stdout
+import io
+import sys
+import time
+
+from SnakeLadder import Board, Game, NormalDice, Player
+from Simulation import simulate
+
+
+def make_board():
+    board = Board(100)
+    board.add_snake(99, 2)
+    board.add_snake(95, 13)
+    board.add_ladder(4, 90)
+    board.add_ladder(10, 40)
+    return board
+
+
+def loop_games_per_second(board, games):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for _ in range(games):
+            Game(board, [Player("A"), Player("B")], NormalDice()).start()
+    return games / (time.perf_counter() - start)
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    board = make_board()
+    loop_rate = loop_games_per_second(board, max(1, games // 200))
+    start = time.perf_counter()
+    result = simulate(board, players=2, games=games, rng=1)
+    vector_rate = games / (time.perf_counter() - start)
+    print(f"Game.start : {loop_rate:>12,.0f} games/s")
+    print(f"simulate() : {vector_rate:>12,.0f} games/s  ({vector_rate / loop_rate:.0f}x)")
+    print(f"mean turns {result.mean_length():.2f}, win rate per seat {result.win_rates().round(4)}")
+
+
+if __name__ == "__main__":
+    main()
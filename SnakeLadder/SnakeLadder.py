@@ -16,10 +16,18 @@ class Dice(ABC):
     def roll(self):
         pass
 
+    # {face: probability}, for engines that work on the whole distribution
+    @abstractmethod
+    def distribution(self):
+        pass
+
 class NormalDice(Dice):
     def roll(self):
         return randint(1,6)
 
+    def distribution(self):
+        return {face: 1 / 6 for face in range(1, 7)}
+
 class BiasedDice(Dice):
     def __init__(self, value):
         self.value = value
@@ -27,6 +35,9 @@ class BiasedDice(Dice):
     def roll(self):
         return self.value
 
+    def distribution(self):
+        return {self.value: 1.0}
+
 class Tile(ABC):
     @abstractmethod
     def move(self, player_position):
@@ -89,15 +100,16 @@ class Game:
                 break
 
 
-players = [Player("Alice"), Player("Bob")]
+if __name__ == "__main__":
+    players = [Player("Alice"), Player("Bob")]
 
-board = Board(100)
-dice = NormalDice()
+    board = Board(100)
+    dice = NormalDice()
 
-board.add_snake(99, 2)
-board.add_snake(95, 13)
-board.add_ladder(4, 90)
-board.add_ladder(10, 40)
+    board.add_snake(99, 2)
+    board.add_snake(95, 13)
+    board.add_ladder(4, 90)
+    board.add_ladder(10, 40)
 
-game = Game(board, players, dice)
-game.start()
\ No newline at end of file
+    game = Game(board, players, dice)
+    game.start()
\ No newline at end of file
@@ -1,9 +1,22 @@
 # command to see coverage - coverage report -m
+import asyncio
+import io
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 from collections import deque
 from SnakeLadder import *
 
+try:
+    import numpy as np
+    from Simulation import CompiledBoard, compile_board, roll_indices, simulate
+    from Markov import MarkovChain
+    from GameServer import BufferedSink, GameManager
+    from SeededDice import SeededDice, stream_generator
+    from LayoutSearch import LayoutSearch, build_board, compile_layout, layout_stats
+except ImportError:  # the vectorised engines need NumPy
+    np = None
+
 # Assuming all classes are in a module named `snake_ladder_game`
 # from snake_ladder_game import Player, NormalDice, BiasedDice, Board, Game, SnakeTile, LadderTile
 
@@ -24,6 +37,15 @@ class TestSnakeLadderGame(unittest.TestCase):
             roll = dice.roll()
             self.assertTrue(1 <= roll <= 6)
 
+    def test_dice_must_give_their_distribution(self):
+        class RollOnly(Dice):
+            def roll(self):
+                return 1
+
+        with self.assertRaises(TypeError):
+            RollOnly()
+        self.assertAlmostEqual(sum(NormalDice().distribution().values()), 1.0)
+
     def test_snake_tile_moves_back(self):
         tile = SnakeTile(3)
         self.assertEqual(tile.move(99), 3)
@@ -62,5 +84,256 @@ class TestSnakeLadderGame(unittest.TestCase):
             self.assertEqual(p.position, 10)
             mock_print.assert_any_call("Hero wins!")
 
+
+def classic_board():
+    board = Board(100)
+    board.add_snake(99, 2)
+    board.add_snake(95, 13)
+    board.add_ladder(4, 90)
+    board.add_ladder(10, 40)
+    return board
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestSimulation(unittest.TestCase):
+
+    def test_compile_board(self):
+        board = classic_board()
+        jumps = compile_board(board)
+        self.assertEqual(len(jumps), 101)
+        self.assertEqual((jumps[99], jumps[4], jumps[50]), (2, 90, 50))
+        with self.assertRaises(ValueError):
+            CompiledBoard.from_board(board).jumps[0] = 5
+
+    def test_roll_indices_stay_on_the_faces(self):
+        class TopDraw:  # always the largest double below 1.0
+            def random(self, count):
+                return np.full(count, 1 - 2 ** -53)
+        probabilities = np.array([0.7, 0.1, 0.1, 0.1])   # cumsum ends at 0.9999999999999999
+        self.assertEqual(roll_indices(TopDraw(), probabilities, 3).tolist(), [3, 3, 3])
+
+    def test_matches_game_with_biased_dice(self):
+        board = Board(28)
+        board.add_ladder(12, 24)
+        players = [Player("A"), Player("B"), Player("C")]
+        game = Game(board, players, BiasedDice(4))
+        turns = 0
+        with patch('builtins.print'):
+            while True:
+                turns += 1
+                if game.play_turn():
+                    break
+        result = simulate(board, players=3, games=5, dice=BiasedDice(4))
+        self.assertEqual(result.lengths.tolist(), [turns] * 5)
+        self.assertEqual(result.win_rates().tolist(), [1.0, 0.0, 0.0])
+
+    def test_games_that_cannot_finish_hit_max_turns(self):
+        result = simulate(Board(10), players=2, games=4, dice=BiasedDice(4), max_turns=50)
+        self.assertEqual(result.unfinished(), 4)
+        self.assertEqual(result.win_rates().tolist(), [0.0, 0.0])
+
+    def test_statistics_match_game_loop(self):
+        board = classic_board()
+        lengths = []
+        with patch('builtins.print'):
+            for _ in range(500):
+                game = Game(board, [Player("A"), Player("B")], NormalDice())
+                turns = 0
+                while True:
+                    turns += 1
+                    if game.play_turn():
+                        break
+                lengths.append(turns)
+        result = simulate(board, players=2, games=50_000, rng=3)
+        loop_mean = sum(lengths) / len(lengths)
+        self.assertAlmostEqual(result.mean_length(), loop_mean, delta=0.15 * loop_mean)
+        self.assertAlmostEqual(result.length_distribution().sum(), 1.0)
+        self.assertAlmostEqual(result.win_rates().sum(), 1.0)
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestMarkovChain(unittest.TestCase):
+
+    def test_transition_matrix_is_stochastic(self):
+        matrix = MarkovChain(classic_board()).transition_matrix()
+        np.testing.assert_allclose(matrix.sum(axis=1), 1.0)
+        self.assertAlmostEqual(matrix[3, 90], 1 / 6)   # a 1 from cell 3 climbs the ladder at 4
+        self.assertAlmostEqual(matrix[100, 100], 1.0)
+
+    def test_single_cell_board_waits_for_a_one(self):
+        chain = MarkovChain(Board(1))
+        self.assertAlmostEqual(chain.expected_turns(), 6.0)
+        self.assertAlmostEqual(chain.finish_distribution()[3], (5 / 6) ** 2 / 6)
+
+    def test_biased_dice_is_deterministic(self):
+        board = Board(28)
+        board.add_ladder(12, 24)
+        chain = MarkovChain(board, BiasedDice(4))
+        self.assertEqual(chain.expected_turns(), 4.0)
+        np.testing.assert_allclose(chain.win_probabilities(3), [1.0, 0.0, 0.0])
+        self.assertAlmostEqual(chain.mean_length(3), 10.0)
+
+    def test_board_that_cannot_finish(self):
+        chain = MarkovChain(Board(10), BiasedDice(4))
+        self.assertEqual(chain.expected_turns(), float("inf"))
+        self.assertEqual(chain.win_probabilities(2).tolist(), [0.0, 0.0])
+
+    def test_dense_solve_matches_survival_sum(self):
+        chain = MarkovChain(classic_board())
+        dense = chain.expected_turns()
+        chain.DENSE_LIMIT = 0
+        self.assertAlmostEqual(chain.expected_turns(), dense, places=8)
+
+    def test_matches_simulation(self):
+        board = classic_board()
+        chain = MarkovChain(board)
+        result = simulate(board, players=2, games=100_000, rng=11)
+        self.assertAlmostEqual(chain.mean_length(2), result.mean_length(), delta=0.01 * result.mean_length())
+        np.testing.assert_allclose(chain.win_probabilities(2), result.win_rates(), atol=0.01)
+        self.assertAlmostEqual(chain.length_distribution(2).sum(), 1.0)
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestGameManager(unittest.TestCase):
+
+    def ladder_board(self):
+        board = Board(28)
+        board.add_ladder(12, 24)
+        return board
+
+    def test_logs_match_game(self):
+        game = Game(self.ladder_board(), [Player("A"), Player("B"), Player("C")], BiasedDice(4))
+        with patch('builtins.print') as mock_print:
+            game.start()
+        stream = io.StringIO()
+        manager = GameManager(self.ladder_board(), BiasedDice(4), sink=BufferedSink(stream, buffer_lines=5))
+        game_id = manager.create_game(["A", "B", "C"])
+        while manager.running():
+            manager.advance()
+        manager.sink.flush()
+        expected = [f"[{game_id}] {call.args[0]}" for call in mock_print.call_args_list]
+        self.assertEqual(stream.getvalue().splitlines(), expected)
+        self.assertEqual(manager.winner(game_id), "A")
+        self.assertEqual(manager.turns[game_id], 10)
+        self.assertEqual(manager.position(game_id, 1), 24)
+
+    def test_slots_are_reused_and_grow(self):
+        manager = GameManager(self.ladder_board(), capacity=2)
+        games = [manager.create_game(["A", "B"]) for _ in range(3)]
+        self.assertEqual(games, [0, 1, 2])
+        manager.remove_game(1)
+        self.assertEqual(manager.create_game(["C"]), 1)
+        self.assertEqual(manager.running(), 3)
+        with self.assertRaises(ValueError):
+            manager.create_game(["A", "B", "C", "D", "E"])
+        with self.assertRaises(KeyError):
+            manager.remove_game(3)
+        with self.assertRaises(ValueError):
+            GameManager(self.ladder_board(), capacity=0)
+
+    def test_position_of_an_empty_seat(self):
+        manager = GameManager(self.ladder_board())
+        game_id = manager.create_game(["A", "B"])
+        self.assertEqual(manager.position(game_id, 1), 0)
+        for seat in (2, 3, -1):   # within max_players, but nobody sits there
+            with self.assertRaises(IndexError):
+                manager.position(game_id, seat)
+
+    def test_removed_game_has_no_winner_or_positions(self):
+        manager = GameManager(self.ladder_board())
+        game_id = manager.create_game(["A"])
+        while manager.running():
+            manager.advance()
+        manager.remove_game(game_id)
+        with self.assertRaises(KeyError):
+            manager.winner(game_id)
+        with self.assertRaises(KeyError):
+            manager.position(game_id, 0)
+
+    def test_serve_finishes_every_game(self):
+        for executor in (None, ThreadPoolExecutor(1)):
+            manager = GameManager(classic_board(), sink=BufferedSink(io.StringIO()), rng=5)
+            games = [manager.create_game(["A", "B"]) for _ in range(2000)]
+            asyncio.run(manager.serve(executor))
+            self.assertEqual(manager.running(), 0)
+            self.assertTrue(all(manager.winner(game) in ("A", "B") for game in games))
+            self.assertEqual(manager.sink.lines, [])
+            if executor is not None:
+                executor.shutdown()
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestLayoutSearch(unittest.TestCase):
+
+    def test_layout_compiles_like_board(self):
+        layout = ((4, 90), (10, 40), (95, 13), (99, 2))
+        self.assertEqual(compile_layout(100, layout).jumps.tolist(), compile_board(classic_board()).tolist())
+        self.assertIsInstance(build_board(100, layout).tiles[95], SnakeTile)
+
+    def test_stats_agree_between_methods(self):
+        layout = ((4, 90), (10, 40), (95, 13), (99, 2))
+        exact = layout_stats(100, layout)
+        simulated = layout_stats(100, layout, method="simulate", games=50_000)
+        self.assertAlmostEqual(exact[0], 77.87, places=2)
+        self.assertAlmostEqual(simulated[0], exact[0], delta=0.02 * exact[0])
+        self.assertAlmostEqual(simulated[1], exact[1], delta=0.03 * exact[1])
+
+    def test_layouts_are_valid(self):
+        search = LayoutSearch(30, 20, 10, snakes=6, ladders=6, seed=2)
+        for layout in [search.random_layout()] + [search.mutate(search.random_layout()) for _ in range(50)]:
+            starts = [start for start, _ in layout]
+            self.assertEqual(len(set(starts)), 12)
+            self.assertEqual(sum(end < start for start, end in layout), 6)
+            self.assertTrue(all(0 < cell < 30 for jump in layout for cell in jump))
+
+    def test_search_caches_and_approaches_target(self):
+        search = LayoutSearch(50, target_mean=30, target_std=15, snakes=4, ladders=4, workers=1, seed=3)
+        first = search.score(layout_stats(50, search.random_layout()))
+        layout, score = search.run(generations=6, population=16, keep=4)
+        self.assertLess(score, 0.05)
+        self.assertLessEqual(score, first)
+        self.assertGreater(search.cache_hits, 0)
+        self.assertEqual(search.evaluated, len(search.cache))
+        evaluated = search.evaluated
+        search.evaluate([layout])
+        self.assertEqual(search.evaluated, evaluated)
+
+    def test_process_pool(self):
+        search = LayoutSearch(50, target_mean=30, target_std=15, snakes=4, ladders=4, workers=2, seed=3)
+        layout, score = search.run(generations=2, population=8, keep=2)
+        self.assertEqual(search.cache[layout], layout_stats(50, layout))
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestSeededDice(unittest.TestCase):
+
+    def rolls(self, dice, count=10_000):
+        return [dice.roll() for _ in range(count)]
+
+    def test_streams_replay_and_differ(self):
+        first, second = SeededDice.streams(7, 2)
+        rolls = self.rolls(first)
+        self.assertEqual(self.rolls(SeededDice(7, 0)), rolls)
+        self.assertEqual(self.rolls(first.replay()), rolls)
+        self.assertNotEqual(self.rolls(second), rolls)
+        self.assertEqual(set(rolls), {1, 2, 3, 4, 5, 6})
+        self.assertEqual(first.rolled, 10_000)
+
+    def test_block_size_does_not_change_rolls(self):
+        self.assertEqual(self.rolls(SeededDice(7, 3, block=3)), self.rolls(SeededDice(7, 3)))
+
+    def test_stream_is_seed_sequence_spawn(self):
+        child = np.random.SeedSequence(7).spawn(4)[3]
+        self.assertEqual(stream_generator(7, 3).integers(0, 100, 50).tolist(),
+                         np.random.default_rng(child).integers(0, 100, 50).tolist())
+
+    def test_game_replays_from_seed_and_stream(self):
+        transcripts = []
+        for _ in range(2):
+            with patch('builtins.print') as mock_print:
+                Game(classic_board(), [Player("A"), Player("B")], SeededDice(11, stream=5)).start()
+            transcripts.append(mock_print.call_args_list)
+        self.assertEqual(transcripts[0], transcripts[1])
+
 if __name__ == '__main__':
     unittest.main()